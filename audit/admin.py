@@ -1,4 +1,5 @@
 from django.contrib import admin
+from hostel_bonafide.pagination import CachedCountPaginator
 from .models import AuditLog
 
 
@@ -8,6 +9,9 @@ class AuditLogAdmin(admin.ModelAdmin):
     list_filter = ('action', 'timestamp')
     search_fields = ('user__username', 'description', 'ip_address')
     readonly_fields = ('user', 'action', 'description', 'ip_address', 'user_agent', 'timestamp')
+    # Large table: reuse cached counts instead of COUNT(*) on every changelist page
+    paginator = CachedCountPaginator
+    show_full_result_count = False
     
     def has_add_permission(self, request):
         return False
@@ -0,0 +1,100 @@
+"""
+Benchmark page-number vs cursor pagination of audit logs.
+Runs against a throwaway test database filled with synthetic rows,
+so it is safe to run next to real data.
+"""
+
+import statistics
+import time
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from rest_framework.pagination import Cursor, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from audit.models import AuditLog
+from hostel_bonafide.pagination import AuditLogCursorPagination
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Compare OFFSET and cursor pagination on a synthetic audit log table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1_000_000, help='Synthetic audit rows to generate')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per measurement')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.populate(rows)
+            self.run(rows, options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def populate(self, rows):
+        self.stdout.write(f'Generating {rows} audit rows...')
+        user = User.objects.create(username='benchmark', role='dean')
+        start = timezone.now() - timedelta(seconds=rows)
+
+        # Spread timestamps out like real traffic instead of one auto_now_add value
+        timestamp_field = AuditLog._meta.get_field('timestamp')
+        timestamp_field.auto_now_add = False
+        try:
+            batch_size = 10_000
+            for first in range(0, rows, batch_size):
+                AuditLog.objects.bulk_create([
+                    AuditLog(user=user, action='LOGIN', description=f'Synthetic entry {n}',
+                             timestamp=start + timedelta(seconds=n))
+                    for n in range(first, min(first + batch_size, rows))
+                ])
+        finally:
+            timestamp_field.auto_now_add = True
+
+    def timed(self, repeat, func):
+        samples = []
+        for _ in range(repeat):
+            began = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - began) * 1000)
+        return statistics.median(samples)
+
+    def run(self, rows, repeat):
+        factory = APIRequestFactory()
+        queryset = AuditLog.objects.all()
+        page_size = 20
+        last_page = max(rows // page_size, 1)
+
+        self.stdout.write(f'\n{"depth":>10} {"page-number (ms)":>18} {"cursor (ms)":>13}')
+        for page in sorted({1, last_page // 100 or 1, last_page // 2 or 1, last_page}):
+            def page_number():
+                paginator = PageNumberPagination()
+                paginator.page_size = page_size
+                request = Request(factory.get('/api/audit/logs/', {'page': page}))
+                list(paginator.paginate_queryset(queryset, request))
+
+            # The cursor a client would hold after following `next` links this far
+            boundary = queryset.order_by('-timestamp', '-id')[(page - 1) * page_size:][:1].first()
+            cursor_paginator = AuditLogCursorPagination()
+            cursor_paginator.base_url = 'http://testserver/api/audit/logs/'
+            cursor_url = (
+                cursor_paginator.encode_cursor(Cursor(offset=0, reverse=False, position=str(boundary.timestamp)))
+                if page > 1 else cursor_paginator.base_url
+            )
+
+            def cursor():
+                paginator = AuditLogCursorPagination()
+                request = Request(factory.get(cursor_url))
+                list(paginator.paginate_queryset(queryset, request))
+
+            self.stdout.write(
+                f'{(page - 1) * page_size:>10} {self.timed(repeat, page_number):>18.2f} '
+                f'{self.timed(repeat, cursor):>13.2f}'
+            )
@@ -0,0 +1,18 @@
+"""
+Delete expired Idempotency-Key records.
+
+Expired records are already ignored when a key is reused; this only keeps
+the table small. Meant to run daily.
+"""
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from audit.models import IdempotencyRecord
+
+
+class Command(BaseCommand):
+    help = 'Delete idempotency records past IDEMPOTENCY_KEY_TTL_HOURS'
+
+    def handle(self, *args, **options):
+        deleted, _ = IdempotencyRecord.objects.filter(expires_at__lte=timezone.now()).delete()
+        self.stdout.write(self.style.SUCCESS(f'✓ Removed {deleted} idempotency records'))
@@ -0,0 +1,23 @@
+"""
+Delete delta-sync tombstones older than the retention period.
+
+Clients holding an older watermark are told to do a full sync instead.
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from audit.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = 'Delete tombstones older than SYNC_TOMBSTONE_RETENTION_DAYS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'✓ Removed {deleted} tombstones'))
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='auditlog',
+            index=models.Index(fields=['timestamp', 'id'], name='audit_logs_timesta_b1eb6c_idx'),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0002_auditlog_audit_logs_timesta_b1eb6c_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('model', models.CharField(max_length=100)),
+                ('object_id', models.PositiveBigIntegerField()),
+                ('student_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('hostel_id', models.PositiveBigIntegerField(blank=True, null=True)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'tombstones',
+                'ordering': ['deleted_at', 'id'],
+                'indexes': [models.Index(fields=['model', 'deleted_at'], name='tombstones_model_7a0914_idx')],
+            },
+        ),
+    ]
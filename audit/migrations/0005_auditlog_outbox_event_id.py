@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('audit', '0004_idempotencyrecord'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='auditlog',
+            name='outbox_event_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True, unique=True),
+        ),
+    ]
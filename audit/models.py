@@ -28,6 +28,8 @@ class AuditLog(models.Model):
     ip_address = models.GenericIPAddressField(null=True, blank=True)
     user_agent = models.TextField(blank=True)
     timestamp = models.DateTimeField(auto_now_add=True)
+    # Outbox event that wrote this entry (bonafide.handlers), so redelivery doesn't add it twice
+    outbox_event_id = models.PositiveBigIntegerField(null=True, blank=True, unique=True)
     
     class Meta:
         db_table = 'audit_logs'
@@ -35,7 +37,55 @@ class AuditLog(models.Model):
         indexes = [
             models.Index(fields=['user', '-timestamp']),
             models.Index(fields=['action', '-timestamp']),
+            models.Index(fields=['timestamp', 'id']),
         ]
     
     def __str__(self):
         return f"{self.user.username} - {self.get_action_display()} - {self.timestamp}"
+
+
+class Tombstone(models.Model):
+    """Record of a deleted row, so delta-sync clients can drop it from their caches."""
+    
+    model = models.CharField(max_length=100)  # app_label.model_name
+    object_id = models.PositiveBigIntegerField()
+    # Scope of the deleted row, kept as plain ids because the rows are gone
+    student_id = models.PositiveBigIntegerField(null=True, blank=True)
+    hostel_id = models.PositiveBigIntegerField(null=True, blank=True)
+    deleted_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'tombstones'
+        ordering = ['deleted_at', 'id']
+        indexes = [
+            models.Index(fields=['model', 'deleted_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.model} #{self.object_id} deleted {self.deleted_at}"
+
+
+class IdempotencyRecord(models.Model):
+    """Response to a POST sent with an Idempotency-Key, replayed for retries with the same key."""
+    
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    key = models.CharField(max_length=255)
+    # sha256 of the method, path and body the key was first used for (see hostel_bonafide.idempotency)
+    fingerprint = models.CharField(max_length=64)
+    # Both empty while the first request is still running
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response = models.BinaryField(null=True, blank=True)  # zlib-compressed JSON body
+    created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField()
+    
+    class Meta:
+        db_table = 'idempotency_records'
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'key'], name='unique_idempotency_key'),
+        ]
+        indexes = [
+            models.Index(fields=['expires_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id}:{self.key} ({self.status_code or 'in progress'})"
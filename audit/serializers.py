@@ -1,8 +1,9 @@
 from rest_framework import serializers
 from .models import AuditLog
+from hostel_bonafide.serializers import SparseFieldsMixin
 
 
-class AuditLogSerializer(serializers.ModelSerializer):
+class AuditLogSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for AuditLog model."""
     username = serializers.CharField(source='user.username', read_only=True)
     user_role = serializers.CharField(source='user.role', read_only=True)
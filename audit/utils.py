@@ -1,7 +1,20 @@
 """Utility functions for audit logging."""
 
+import atexit
+import logging
+import threading
+import time
+from django.conf import settings
+from django.db import close_old_connections
 from .models import AuditLog
 
+logger = logging.getLogger(__name__)
+
+_pending_logs = []
+_pending_lock = threading.Lock()
+_last_flush = time.monotonic()
+_flush_timer = None
+
 
 def get_client_ip(request):
     """Get client IP address from request."""
@@ -29,3 +42,66 @@ def log_activity(user, action, description, request=None):
         ip_address=ip_address,
         user_agent=user_agent
     )
+
+
+def queue_activity(user_id, action, description, request=None):
+    """Buffer an audit entry; buffered entries are written together in one batch.
+
+    The batch is written once AUDIT_BATCH_SIZE entries are waiting, or at
+    the latest AUDIT_BATCH_INTERVAL seconds after the first of them was
+    queued (by a timer thread), so an entry is never held longer than that
+    even if no further activity arrives.
+    """
+    global _flush_timer
+
+    entry = AuditLog(
+        user_id=user_id,
+        action=action,
+        description=description,
+        ip_address=get_client_ip(request) if request else None,
+        user_agent=request.META.get('HTTP_USER_AGENT', '') if request else ''
+    )
+
+    with _pending_lock:
+        _pending_logs.append(entry)
+        due = (
+            len(_pending_logs) >= settings.AUDIT_BATCH_SIZE
+            or time.monotonic() - _last_flush >= settings.AUDIT_BATCH_INTERVAL
+        )
+        if not due and _flush_timer is None:
+            _flush_timer = threading.Timer(settings.AUDIT_BATCH_INTERVAL, _flush_on_timer)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+    if due:
+        flush_activity_queue()
+
+
+def _flush_on_timer():
+    global _flush_timer
+    with _pending_lock:
+        _flush_timer = None
+    close_old_connections()
+    try:
+        flush_activity_queue()
+    except Exception:
+        logger.exception('Flushing queued audit entries failed')
+    finally:
+        close_old_connections()
+
+
+def flush_activity_queue():
+    """Write all buffered audit entries in a single query."""
+    global _last_flush
+
+    with _pending_lock:
+        batch = _pending_logs[:]
+        _pending_logs.clear()
+        _last_flush = time.monotonic()
+
+    if batch:
+        AuditLog.objects.bulk_create(batch)
+    return len(batch)
+
+
+atexit.register(flush_activity_queue)
@@ -1,13 +1,17 @@
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
+from django.db.models import Q
 from .models import AuditLog
 from .serializers import AuditLogSerializer
+from hostel_bonafide.prefetch import AutoPrefetchMixin
+from hostel_bonafide.pagination import AuditLogCursorPagination
 
 
-class AuditLogListView(generics.ListAPIView):
+class AuditLogListView(AutoPrefetchMixin, generics.ListAPIView):
     """List audit logs (Dean and Warden only)."""
     serializer_class = AuditLogSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = AuditLogCursorPagination
     
     def get_queryset(self):
         user = self.request.user
@@ -20,8 +24,8 @@ class AuditLogListView(generics.ListAPIView):
             try:
                 warden = user.warden_profile
                 # Get logs from students in warden's hostel and warden's own logs
-                student_users = [s.user.id for s in warden.hostel.residents.all()]
-                return AuditLog.objects.filter(user__id__in=student_users + [user.id])
+                student_users = warden.hostel.residents.values('user_id')
+                return AuditLog.objects.filter(Q(user__in=student_users) | Q(user=user))
             except:
                 return AuditLog.objects.filter(user=user)
         else:
@@ -29,10 +33,11 @@ class AuditLogListView(generics.ListAPIView):
             return AuditLog.objects.filter(user=user)
 
 
-class MyAuditLogListView(generics.ListAPIView):
+class MyAuditLogListView(AutoPrefetchMixin, generics.ListAPIView):
     """List audit logs for the current user."""
     serializer_class = AuditLogSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = AuditLogCursorPagination
     
     def get_queryset(self):
         return AuditLog.objects.filter(user=self.request.user)
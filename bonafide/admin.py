@@ -1,4 +1,5 @@
 from django.contrib import admin
+from hostel_bonafide.pagination import CachedCountPaginator
 from .models import BonafideRequest
 
 
@@ -11,6 +12,9 @@ class BonafideRequestAdmin(admin.ModelAdmin):
     list_filter = ('status', 'reason', 'created_at')
     search_fields = ('request_id', 'student__register_number', 'student__name', 'certificate_number')
     readonly_fields = ('request_id', 'verification_code', 'created_at', 'updated_at')
+    # Large table: reuse cached counts instead of COUNT(*) on every changelist page
+    paginator = CachedCountPaginator
+    show_full_result_count = False
     
     fieldsets = (
         ('Request Information', {
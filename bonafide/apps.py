@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BonafideConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'bonafide'
+
+    def ready(self):
+        from . import handlers, signals  # noqa: F401
@@ -0,0 +1,86 @@
+"""Optimisation of image attachments (orientation, size, thumbnails).
+
+Runs off the request path as an outbox handler (see bonafide.handlers).
+Images are decoded and resized outside any transaction; only the final
+save takes the row lock.
+"""
+
+import io
+import os
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import transaction
+from django.utils import timezone
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+def _encode_jpeg(image):
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=settings.BONAFIDE_ATTACHMENT_JPEG_QUALITY, optimize=True)
+    return buffer.getvalue()
+
+
+def optimise_attachment(bonafide_request):
+    """Replace an image attachment with a review-sized JPEG and add a thumbnail.
+
+    Non-image attachments (e.g. PDFs) and images too large to decode
+    safely are only marked as processed. The original upload is kept in
+    ``attachment_original`` when BONAFIDE_KEEP_ORIGINAL_ATTACHMENTS is set,
+    and deleted otherwise.
+    """
+    if not bonafide_request.attachment or bonafide_request.attachment_processed_at:
+        return False
+
+    original_name = bonafide_request.attachment.name
+    try:
+        with bonafide_request.attachment.open('rb') as source:
+            original_size = bonafide_request.attachment.size
+            image = Image.open(source)
+            image.load()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError):
+        # Not an image, or too many pixels to decode safely: keep it as uploaded
+        bonafide_request.attachment_processed_at = timezone.now()
+        bonafide_request.save(update_fields=['attachment_processed_at', 'updated_at'])
+        return False
+
+    image = ImageOps.exif_transpose(image).convert('RGB')
+    base_name = os.path.splitext(os.path.basename(original_name))[0]
+
+    review = image.copy()
+    review_size = settings.BONAFIDE_ATTACHMENT_REVIEW_SIZE
+    review.thumbnail((review_size, review_size))
+    review_bytes = _encode_jpeg(review)
+
+    thumbnail = image.copy()
+    thumbnail_size = settings.BONAFIDE_ATTACHMENT_THUMBNAIL_SIZE
+    thumbnail.thumbnail((thumbnail_size, thumbnail_size))
+    bonafide_request.attachment_thumbnail.save(
+        f"{base_name}_thumb.jpg", ContentFile(_encode_jpeg(thumbnail)), save=False
+    )
+
+    replaced = len(review_bytes) < original_size
+    if replaced:
+        bonafide_request.attachment.save(f"{base_name}.jpg", ContentFile(review_bytes), save=False)
+        if settings.BONAFIDE_KEEP_ORIGINAL_ATTACHMENTS:
+            bonafide_request.attachment_original.name = original_name
+
+    with transaction.atomic():
+        current = type(bonafide_request).objects.select_for_update().filter(pk=bonafide_request.pk).values_list(
+            'attachment', 'attachment_processed_at'
+        ).first()
+        stale = current is None or current != (original_name, None)
+        if not stale:
+            bonafide_request.attachment_processed_at = timezone.now()
+            bonafide_request.save(update_fields=[
+                'attachment', 'attachment_original', 'attachment_thumbnail', 'attachment_processed_at', 'updated_at'
+            ])
+    if stale:
+        # Deleted, replaced or already processed by another delivery
+        bonafide_request.attachment_thumbnail.delete(save=False)
+        if replaced:
+            bonafide_request.attachment.delete(save=False)
+        return False
+
+    if replaced and not settings.BONAFIDE_KEEP_ORIGINAL_ATTACHMENTS:
+        bonafide_request.attachment.storage.delete(original_name)
+    return True
@@ -0,0 +1,128 @@
+"""Per-hostel request counters (RequestCounter), updated alongside each status change.
+
+Every request contributes to a few counter rows: its current status, and
+one monthly row per status it has entered (created, warden decision, dean
+decision). Changes are applied as the difference between a request's
+contributions before and after, with ``count = count + n`` updates in the
+caller's transaction, so concurrent reviews never overwrite each other.
+"""
+
+from collections import Counter
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import BonafideRequest, RequestCounter
+
+CURRENT = ''
+DEAN_DECISIONS = ('dean_approved', 'dean_rejected')
+
+
+def period_of(moment):
+    return timezone.localtime(moment).strftime('%Y-%m')
+
+
+def contributions(status, created_at, warden_review_date=None, dean_review_date=None):
+    """Counter rows, as {(status, period): n}, one request adds to."""
+    counts = Counter({(status, CURRENT): 1})
+    if created_at:
+        counts['pending', period_of(created_at)] += 1
+    if warden_review_date:
+        warden_status = 'warden_rejected' if status == 'warden_rejected' else 'warden_approved'
+        counts[warden_status, period_of(warden_review_date)] += 1
+    if dean_review_date and status in DEAN_DECISIONS:
+        counts[status, period_of(dean_review_date)] += 1
+    return counts
+
+
+def request_contributions(bonafide_request):
+    if bonafide_request.pk is None:
+        return Counter()
+    return contributions(
+        bonafide_request.status, bonafide_request.created_at,
+        bonafide_request.warden_review_date, bonafide_request.dean_review_date,
+    )
+
+
+def apply_counts(hostel_id, deltas):
+    """Add `deltas` ({(status, period): n}) to one hostel's counters."""
+    if hostel_id is None:
+        return
+    # A fixed order keeps concurrent transactions from deadlocking on the rows
+    for (status, period), delta in sorted(deltas.items()):
+        if not delta:
+            continue
+        counters = RequestCounter.objects.filter(hostel_id=hostel_id, status=status, period=period)
+        if counters.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                RequestCounter.objects.create(hostel_id=hostel_id, status=status, period=period, count=delta)
+        except IntegrityError:
+            # Another transaction created the row first
+            counters.update(count=F('count') + delta)
+
+
+def count_change(bonafide_request, before):
+    """Apply a saved request's change; `before` is its request_contributions() beforehand."""
+    after = request_contributions(bonafide_request)
+    apply_counts(
+        bonafide_request.student.hostel_id,
+        {key: after[key] - before[key] for key in after.keys() | before.keys()}
+    )
+
+
+def _student_contributions(student_id):
+    counts = Counter()
+    requests = BonafideRequest.objects.filter(student_id=student_id).values_list(
+        'status', 'created_at', 'warden_review_date', 'dean_review_date'
+    )
+    for row in requests:
+        counts.update(contributions(*row))
+    return counts
+
+
+def move_student(student_id, old_hostel_id, new_hostel_id):
+    """Move a student's requests between hostels' counters."""
+    counts = _student_contributions(student_id)
+    with transaction.atomic():
+        apply_counts(old_hostel_id, {key: -n for key, n in counts.items()})
+        apply_counts(new_hostel_id, counts)
+
+
+def rebuild_counters():
+    """Recompute every counter from bonafide_requests; returns the number of rows."""
+    with transaction.atomic():
+        # Transitions wait on the locked rows, then apply on top of the new counts
+        list(RequestCounter.objects.select_for_update().values_list('pk', flat=True))
+        totals = Counter()
+        requests = BonafideRequest.objects.filter(student__hostel__isnull=False).values_list(
+            'student__hostel_id', 'status', 'created_at', 'warden_review_date', 'dean_review_date'
+        )
+        for hostel_id, *row in requests.iterator(chunk_size=2000):
+            for (status, period), n in contributions(*row).items():
+                totals[hostel_id, status, period] += n
+
+        RequestCounter.objects.all().delete()
+        RequestCounter.objects.bulk_create(
+            RequestCounter(hostel_id=hostel_id, status=status, period=period, count=n)
+            for (hostel_id, status, period), n in totals.items() if n
+        )
+    return len(totals)
+
+
+def hostel_counters(hostel_ids=None, period=None):
+    """{hostel_id: {'current': {status: n}, 'this_period': {status: n}}} from the counters."""
+    period = period or period_of(timezone.now())
+    counters = RequestCounter.objects.filter(period__in=(CURRENT, period))
+    if hostel_ids is not None:
+        counters = counters.filter(hostel_id__in=hostel_ids)
+
+    statuses = [choice for choice, _ in BonafideRequest.STATUS_CHOICES]
+    result = {}
+    for hostel_id, status, row_period, count in counters.values_list('hostel_id', 'status', 'period', 'count'):
+        entry = result.setdefault(hostel_id, {
+            'current': dict.fromkeys(statuses, 0),
+            'this_period': dict.fromkeys(statuses, 0),
+        })
+        entry['current' if row_period == CURRENT else 'this_period'][status] = count
+    return result
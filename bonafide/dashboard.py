@@ -0,0 +1,139 @@
+"""Role-aware landing page data, cached per user."""
+
+from datetime import timedelta
+from uuid import uuid4
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+from accounts.serializers import DeanProfileSerializer, UserSerializer
+from hostels.models import Warden
+from hostels.serializers import WardenSerializer
+from students.models import AcademicYear
+from students.serializers import StudentSerializer
+from .models import BonafideRequest, BonafideSettings
+from .serializers import BonafideSettingsSerializer
+
+VERSION_KEY = 'dashboard:version:{}'
+# Versions live in the shared cache so a bump reaches every worker process;
+# the dashboards themselves can stay in the local cache, keyed by version
+VERSION_CACHE = 'shared'
+REJECTED = ('warden_rejected', 'dean_rejected')
+
+
+def bump_dashboard_versions(*scopes):
+    """Invalidate cached dashboards that depend on any of `scopes`.
+
+    Scopes are 'global', 'dean' (every dean/admin) and 'user:<id>'. Each
+    bump stores a fresh random token rather than a counter, so a version
+    evicted from the cache can never come back as one already used for a
+    stale dashboard. Bumps wait for the surrounding transaction to commit,
+    otherwise a concurrent read could cache the pre-commit data under the
+    new version.
+    """
+    keys = [VERSION_KEY.format(scope) for scope in scopes]
+    transaction.on_commit(
+        lambda: caches[VERSION_CACHE].set_many({key: uuid4().hex for key in keys}, None)
+    )
+
+
+def bump_request_scopes(requests):
+    """Bump the dashboards of everyone who can see any of `requests`.
+
+    For bulk UPDATEs, which skip the model signals that normally do this.
+    """
+    user_ids, hostel_ids = set(), set()
+    for user_id, hostel_id in requests.order_by().values_list('student__user_id', 'student__hostel_id').distinct():
+        user_ids.add(user_id)
+        hostel_ids.add(hostel_id)
+    if not user_ids:
+        return
+    user_ids.update(Warden.objects.filter(hostel_id__in=hostel_ids).values_list('user_id', flat=True))
+    bump_dashboard_versions('dean', *(f'user:{user_id}' for user_id in user_ids))
+
+
+def _scopes(user):
+    # Built from the user row alone so a cache hit costs no queries
+    scopes = ['global', f'user:{user.pk}']
+    if not user.is_student() and not user.is_warden():
+        scopes.append('dean')
+    return scopes
+
+
+def _request_counts(user):
+    """Status counts for the user's requests, in a single aggregate query."""
+    recent = Q(created_at__gte=timezone.now() - timedelta(days=30))
+    if user.is_student():
+        queryset = BonafideRequest.objects.filter(student=user.student_profile)
+        counts = {
+            'total': Count('pk'),
+            'pending': Count('pk', filter=Q(status__in=('pending', 'warden_approved'))),
+            'approved': Count('pk', filter=Q(status='dean_approved')),
+            'rejected': Count('pk', filter=Q(status__in=REJECTED)),
+            'recent': Count('pk', filter=recent),
+        }
+    elif user.is_warden():
+        queryset = BonafideRequest.objects.filter(student__hostel_id=user.warden_profile.hostel_id)
+        counts = {
+            'total': Count('pk'),
+            'pending': Count('pk', filter=Q(status='pending')),
+            'forwarded': Count('pk', filter=Q(status='warden_approved')),
+            'approved': Count('pk', filter=Q(status='dean_approved')),
+            'rejected': Count('pk', filter=Q(status__in=REJECTED)),
+            'recent': Count('pk', filter=recent),
+        }
+    else:
+        queryset = BonafideRequest.objects.all()
+        counts = {
+            'total': Count('pk'),
+            'pending': Count('pk', filter=Q(status='warden_approved')),
+            'with_wardens': Count('pk', filter=Q(status='pending')),
+            'approved': Count('pk', filter=Q(status='dean_approved')),
+            'rejected': Count('pk', filter=Q(status__in=REJECTED)),
+            'recent': Count('pk', filter=recent),
+        }
+    return queryset.order_by().aggregate(**counts)
+
+
+def _profile(user):
+    if user.is_student():
+        return StudentSerializer(user.student_profile).data
+    if user.is_warden():
+        return WardenSerializer(user.warden_profile).data
+    profile = getattr(user, 'dean_profile', None) if user.is_dean() else None
+    return DeanProfileSerializer(profile).data if profile else None
+
+
+def build_dashboard(user):
+    academic_year = AcademicYear.get_current()
+    return {
+        'user': UserSerializer(user).data,
+        'profile': _profile(user),
+        'academic_year': {
+            'id': academic_year.id,
+            'current_year': academic_year.current_year,
+            'display': f"{academic_year.current_year}-{academic_year.current_year + 1}",
+        },
+        'settings': BonafideSettingsSerializer(BonafideSettings.get_settings()).data,
+        'requests': _request_counts(user),
+    }
+
+
+def get_dashboard(user):
+    """Cached build_dashboard(); entries are dropped by bumping a scope version."""
+    versions = caches[VERSION_CACHE]
+    keys = [VERSION_KEY.format(scope) for scope in _scopes(user)]
+    current = versions.get_many(keys)
+    for key in keys:
+        if key not in current:
+            # Never bumped, or evicted: start a new version nobody has used
+            token = uuid4().hex
+            versions.add(key, token, None)
+            current[key] = versions.get(key, token)
+    cache_key = 'dashboard:{}:{}'.format(user.pk, ':'.join(current[key] for key in keys))
+    data = cache.get(cache_key)
+    if data is None:
+        data = build_dashboard(user)
+        cache.set(cache_key, data, settings.DASHBOARD_CACHE_TTL)
+    return data
@@ -0,0 +1,44 @@
+"""Short-lived, HMAC-signed download links for issued certificates."""
+
+import time
+from django.conf import settings
+from django.core import signing
+
+SALT = 'bonafide.download_link'
+
+
+def get_link_ttl(requested=None):
+    """Clamp a requested link lifetime (seconds) to the configured maximum."""
+    default_ttl = settings.BONAFIDE_DOWNLOAD_LINK_TTL
+    max_ttl = settings.BONAFIDE_DOWNLOAD_LINK_MAX_TTL
+    try:
+        ttl = int(requested) if requested else default_ttl
+    except (TypeError, ValueError):
+        ttl = default_ttl
+    return max(1, min(ttl, max_ttl))
+
+
+def make_download_token(bonafide_request, user, ttl):
+    """Sign everything the download handler needs so it never hits the database."""
+    expires = int(time.time()) + ttl
+    payload = {
+        'r': str(bonafide_request.request_id),
+        'u': user.pk,
+        'f': bonafide_request.certificate_file.name,
+        'n': f"bonafide_{bonafide_request.certificate_number.replace('/', '_')}.pdf",
+        'c': bonafide_request.certificate_number,
+        'e': expires,
+    }
+    token = signing.dumps(payload, key=settings.BONAFIDE_SIGNATURE_KEY, salt=SALT, compress=True)
+    return token, expires
+
+
+def read_download_token(token):
+    """Return the signed payload, or None if the signature is bad or the link expired."""
+    try:
+        payload = signing.loads(token, key=settings.BONAFIDE_SIGNATURE_KEY, salt=SALT)
+    except signing.BadSignature:
+        return None
+    if payload.get('e', 0) < time.time():
+        return None
+    return payload
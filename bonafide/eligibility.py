@@ -0,0 +1,105 @@
+"""Per-student cooldown eligibility (StudentEligibility).
+
+A student may request a certificate again once the cooldown has passed
+since their last dean approval. The date that becomes possible is stored
+per student, so checking it at create time is a single primary-key
+lookup. The row is updated:
+
+* on each dean approval (record_approval, from DeanReviewRequestView),
+* for every student at once when the cooldown setting changes
+  (apply_cooldown, from bonafide.signals),
+* for one student when an approved request is deleted (refresh_student).
+
+rebuild_eligibility() recomputes every row from the requests; it is run
+by ``manage.py rebuild_student_eligibility``. Students are touched
+whenever their row changes, because StudentSerializer shows
+next_eligible_at and is cached per updated_at.
+"""
+
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import F, Max
+from django.utils import timezone
+from students.models import Student
+from .models import BonafideRequest, BonafideSettings, StudentEligibility
+
+
+def next_eligible(last_approved_at, cooldown_days):
+    return last_approved_at + timedelta(days=cooldown_days) if cooldown_days else None
+
+
+def touch_students(**filters):
+    Student.objects.filter(**filters).update(updated_at=timezone.now())
+
+
+def blocking_eligibility(student):
+    """The student's eligibility row if the cooldown still blocks a new request, else None."""
+    return StudentEligibility.objects.filter(student=student, next_eligible_at__gt=timezone.now()).first()
+
+
+def record_approval(bonafide_request):
+    """Start the cooldown from a dean approval; call inside the approving transaction."""
+    approved_at = bonafide_request.dean_review_date
+    cooldown_days = BonafideSettings.get_settings().get_cooldown_days()
+    eligibility, created = StudentEligibility.objects.select_for_update().get_or_create(
+        student_id=bonafide_request.student_id, defaults={'last_approved_at': approved_at}
+    )
+    if not created and eligibility.last_approved_at >= approved_at:
+        return eligibility
+    eligibility.last_approved_at = approved_at
+    eligibility.next_eligible_at = next_eligible(approved_at, cooldown_days)
+    eligibility.save()
+    touch_students(pk=bonafide_request.student_id)
+    return eligibility
+
+
+def apply_cooldown(cooldown_days):
+    """Recompute every student's next_eligible_at for a new cooldown; returns rows updated."""
+    with transaction.atomic():
+        if cooldown_days:
+            updated = StudentEligibility.objects.update(
+                next_eligible_at=F('last_approved_at') + timedelta(days=cooldown_days),
+                updated_at=timezone.now(),
+            )
+        else:
+            updated = StudentEligibility.objects.update(next_eligible_at=None, updated_at=timezone.now())
+        touch_students(pk__in=StudentEligibility.objects.values('student_id'))
+    return updated
+
+
+def refresh_student(student_id):
+    """Recompute one student's row from their approved requests."""
+    last_approved_at = BonafideRequest.objects.filter(
+        student_id=student_id, status='dean_approved', dean_review_date__isnull=False
+    ).aggregate(last=Max('dean_review_date'))['last']
+    if last_approved_at is None:
+        StudentEligibility.objects.filter(student_id=student_id).delete()
+    else:
+        cooldown_days = BonafideSettings.get_settings().get_cooldown_days()
+        StudentEligibility.objects.update_or_create(student_id=student_id, defaults={
+            'last_approved_at': last_approved_at,
+            'next_eligible_at': next_eligible(last_approved_at, cooldown_days),
+        })
+    touch_students(pk=student_id)
+
+
+def rebuild_eligibility(batch_size=1000):
+    """Recompute every row from the approved requests; returns the number of rows."""
+    cooldown_days = BonafideSettings.get_settings().get_cooldown_days()
+    latest = BonafideRequest.objects.filter(
+        status='dean_approved', dean_review_date__isnull=False
+    ).values('student_id').annotate(last=Max('dean_review_date')).order_by()
+    rows = [
+        StudentEligibility(
+            student_id=row['student_id'], last_approved_at=row['last'],
+            next_eligible_at=next_eligible(row['last'], cooldown_days),
+        )
+        for row in latest.iterator(chunk_size=2000)
+    ]
+    with transaction.atomic():
+        # Before and after, so students whose row goes away are touched too
+        touch_students(pk__in=StudentEligibility.objects.values('student_id'))
+        StudentEligibility.objects.all().delete()
+        StudentEligibility.objects.bulk_create(rows, batch_size=batch_size)
+        touch_students(pk__in=StudentEligibility.objects.values('student_id'))
+    return len(rows)
@@ -0,0 +1,166 @@
+"""Review queue events and the Server-Sent Events stream that delivers them."""
+
+import asyncio
+import json
+from collections import deque
+from datetime import timedelta
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.utils import timezone
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from .models import RequestEvent
+
+BATCH_SIZE = 100
+TICKET_SALT = 'bonafide.events_ticket'
+
+
+def record_event(bonafide_request, kind):
+    """Append an event for `bonafide_request`; call after the change is saved."""
+    student = bonafide_request.student
+    return RequestEvent.objects.create(
+        kind=kind,
+        request=bonafide_request,
+        student=student,
+        hostel_id=student.hostel_id,
+        status=bonafide_request.status,
+    )
+
+
+def make_stream_ticket(user):
+    """A signed ticket that opens the event stream as `user` for REQUEST_EVENTS_TICKET_TTL seconds.
+
+    EventSource can't send headers, so the ticket goes in the URL instead
+    of the JWT. It only works for the stream and expires quickly, so a
+    leaked URL (logs, history) doesn't expose the user's API access.
+    EventSource reconnects to the same URL when a stream ends, sending
+    Last-Event-ID; those reconnects are accepted for
+    REQUEST_EVENTS_RECONNECT_TTL seconds instead.
+    """
+    return signing.dumps({'u': user.pk}, key=settings.BONAFIDE_SIGNATURE_KEY, salt=TICKET_SALT)
+
+
+def authenticate_stream(request):
+    """User from the Authorization header, or from a ?ticket= from make_stream_ticket()."""
+    authentication = JWTAuthentication()
+    header = authentication.get_header(request)
+    if header:
+        raw_token = authentication.get_raw_token(header)
+        if not raw_token:
+            return None
+        try:
+            return authentication.get_user(authentication.get_validated_token(raw_token))
+        except (InvalidToken, AuthenticationFailed):
+            return None
+
+    ticket = request.GET.get('ticket')
+    if not ticket:
+        return None
+    if 'Last-Event-ID' in request.headers:
+        max_age = settings.REQUEST_EVENTS_RECONNECT_TTL
+    else:
+        max_age = settings.REQUEST_EVENTS_TICKET_TTL
+    try:
+        payload = signing.loads(ticket, key=settings.BONAFIDE_SIGNATURE_KEY, salt=TICKET_SALT, max_age=max_age)
+    except signing.BadSignature:
+        return None
+    return get_user_model().objects.filter(pk=payload.get('u'), is_active=True).first()
+
+
+def events_for(user):
+    """The slice of the feed a user may see: own requests, own hostel, or everything."""
+    if user.is_student():
+        return RequestEvent.objects.filter(student_id=user.student_profile.pk)
+    if user.is_warden():
+        return RequestEvent.objects.filter(hostel_id=user.warden_profile.hostel_id)
+    if user.is_dean() or user.is_superuser:
+        return RequestEvent.objects.all()
+    return RequestEvent.objects.none()
+
+
+def fetch_events(queryset, after, skip=()):
+    return list(
+        queryset.filter(id__gt=after).exclude(id__in=skip).order_by('id').values(
+            'id', 'kind', 'status', 'created_at', 'request__request_id'
+        )[:BATCH_SIZE]
+    )
+
+
+def lag_floor(queryset, last_id):
+    """Newest event id up to `last_id` created before the commit-lag window, or 0."""
+    cutoff = timezone.now() - timedelta(seconds=settings.REQUEST_EVENTS_COMMIT_LAG)
+    return queryset.filter(id__lte=last_id, created_at__lt=cutoff).order_by('-id').values_list(
+        'id', flat=True
+    ).first() or 0
+
+
+def event_ids(queryset, after, last_id):
+    return set(queryset.filter(id__gt=after, id__lte=last_id).values_list('id', flat=True))
+
+
+def latest_event_id(queryset):
+    return queryset.order_by('-id').values_list('id', flat=True).first() or 0
+
+
+def format_event(event):
+    data = {
+        'request_id': str(event['request__request_id']),
+        'status': event['status'],
+        'created_at': event['created_at'].isoformat(),
+    }
+    return f"id: {event['id']}\nevent: {event['kind']}\ndata: {json.dumps(data)}\n\n"
+
+
+async def stream_events(queryset, last_id, resume=False):
+    """Yield SSE frames for events after `last_id` until the connection's time is up.
+
+    Ids are allocated before commit, so an event can become visible after
+    one with a higher id. Each poll therefore re-reads ``id > floor``,
+    where the floor trails the newest id seen by REQUEST_EVENTS_COMMIT_LAG
+    seconds, and skips ids it already sent. A resumed stream (`resume`)
+    replays that window too, so clients should ignore ids they have seen;
+    a new stream only sends events that commit after it opened.
+
+    Clients reconnect automatically when the stream ends and resume from
+    Last-Event-ID, so capping the duration only bounds how long one
+    connection is held.
+    """
+    poll_interval = settings.REQUEST_EVENTS_POLL_INTERVAL
+    lag = settings.REQUEST_EVENTS_COMMIT_LAG
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.REQUEST_EVENTS_MAX_DURATION
+    last_sent = loop.time()
+
+    floor = await sync_to_async(lag_floor)(queryset, last_id)
+    # Ids above the floor that the client already has
+    sent = set() if resume else await sync_to_async(event_ids)(queryset, floor, last_id)
+    # (time, newest id) per poll; the floor moves up once a checkpoint is `lag` old
+    checkpoints = deque()
+
+    # The id gives EventSource a Last-Event-ID to reconnect with even if
+    # no event arrives before the stream ends
+    yield f'retry: {int(poll_interval * 1000)}\nid: {last_id}\n\n'
+    while loop.time() < deadline:
+        events = await sync_to_async(fetch_events)(queryset, floor, sent)
+        for event in events:
+            sent.add(event['id'])
+            last_id = max(last_id, event['id'])
+            yield format_event(event)
+
+        now = loop.time()
+        checkpoints.append((now, last_id))
+        while checkpoints and now - checkpoints[0][0] >= lag:
+            floor = max(floor, checkpoints.popleft()[1])
+        sent = {event_id for event_id in sent if event_id > floor}
+        if events:
+            last_sent = now
+            continue
+
+        await asyncio.sleep(poll_interval)
+        if loop.time() - last_sent >= settings.REQUEST_EVENTS_KEEPALIVE:
+            # Comment frame keeps proxies from closing an idle connection
+            yield ': keepalive\n\n'
+            last_sent = loop.time()
@@ -0,0 +1,175 @@
+"""Streaming ZIP export of issued bonafide certificates.
+
+Certificates are already-compressed PDFs, so entries are STORED. That keeps
+the archive byte-for-byte deterministic for a given selection, which lets us
+announce the exact length up front and serve HTTP range requests by replaying
+the stream and skipping the prefix the client already has.
+"""
+
+import csv
+import hashlib
+import io
+import zipfile
+from django.utils import timezone
+from .models import BonafideRequest
+
+CHUNK_SIZE = 64 * 1024
+MANIFEST_NAME = 'manifest.csv'
+MANIFEST_HEADER = (
+    'certificate_number', 'register_number', 'student_name', 'department',
+    'hostel', 'reason', 'issued_date', 'file', 'size'
+)
+
+# Fixed record sizes from the ZIP specification (see zipfile.py)
+LOCAL_HEADER_SIZE = 30
+CENTRAL_HEADER_SIZE = 46
+END_RECORD_SIZE = 22
+ZIP64_END_RECORD_SIZE = 56 + 20
+ZIP64_EXTRA_SIZE = 20
+
+
+class _StreamBuffer(io.RawIOBase):
+    """Write-only sink that hands back whatever zipfile wrote since the last pop."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def pop(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def filter_issued_certificates(hostel=None, department=None, month=None):
+    """Issued certificates narrowed by hostel id, department id and/or 'YYYY-MM'."""
+    queryset = BonafideRequest.objects.filter(status='dean_approved').exclude(certificate_file='')
+    if hostel:
+        queryset = queryset.filter(student__hostel_id=hostel)
+    if department:
+        queryset = queryset.filter(student__department_id=department)
+    if month:
+        year, month_number = (int(part) for part in month.split('-'))
+        queryset = queryset.filter(
+            certificate_issued_date__year=year,
+            certificate_issued_date__month=month_number
+        )
+    return queryset
+
+
+class CertificateArchive:
+    """A ZIP of certificate PDFs plus a CSV manifest, generated on the fly."""
+
+    def __init__(self, queryset, storage=None):
+        self.storage = storage or BonafideRequest._meta.get_field('certificate_file').storage
+        self.entries = []
+        manifest = io.StringIO()
+        writer = csv.writer(manifest)
+        writer.writerow(MANIFEST_HEADER)
+
+        # Everything for the manifest and the archive comes from this one query
+        rows = queryset.order_by('certificate_issued_date', 'id').values_list(
+            'certificate_number', 'student__register_number', 'student__name',
+            'student__department__code', 'student__hostel__code', 'reason',
+            'certificate_issued_date', 'certificate_file'
+        )
+        for cert_number, register_number, name, dept, hostel, reason, issued, file_name in rows.iterator():
+            arcname = f"certificates/bonafide_{cert_number.replace('/', '_')}.pdf"
+            try:
+                size = self.storage.size(file_name)
+            except OSError:
+                size = None
+            writer.writerow((
+                cert_number, register_number, name, dept, hostel or '', reason,
+                timezone.localtime(issued).strftime('%Y-%m-%d') if issued else '',
+                arcname if size is not None else '', size if size is not None else 'missing'
+            ))
+            if size is not None:
+                self.entries.append((arcname, file_name, size, issued))
+
+        self.manifest = manifest.getvalue().encode('utf-8')
+        # The manifest is dated by the newest certificate, so the same set of
+        # certificates always produces the same bytes (needed for Range resumes)
+        self.manifest_date = max((issued for *_, issued in self.entries if issued), default=None)
+        self.size = self._archive_size()
+        self.etag = self._etag()
+
+    def _zip_info(self, arcname, size, issued):
+        # ZIP's earliest representable date when there's nothing to date it by
+        date_time = timezone.localtime(issued).timetuple()[:6] if issued else (1980, 1, 1, 0, 0, 0)
+        info = zipfile.ZipInfo(arcname, date_time=date_time)
+        info.compress_type = zipfile.ZIP_STORED
+        info.file_size = size
+        return info
+
+    def _members(self):
+        yield MANIFEST_NAME, None, len(self.manifest), self.manifest_date
+        yield from self.entries
+
+    def _archive_size(self):
+        """Exact length of the archive that iter_bytes() will produce."""
+        offset = 0
+        central_size = 0
+        count = 0
+        for arcname, _, size, _ in self._members():
+            name_length = len(arcname.encode('utf-8'))
+            zip64 = size * 1.05 > zipfile.ZIP64_LIMIT
+            header_offset = offset
+            offset += LOCAL_HEADER_SIZE + name_length + (ZIP64_EXTRA_SIZE if zip64 else 0)
+            offset += size + (24 if zip64 else 16)  # data + data descriptor
+
+            extra = 0
+            if size > zipfile.ZIP64_LIMIT:
+                extra += 2
+            if header_offset > zipfile.ZIP64_LIMIT:
+                extra += 1
+            central_size += CENTRAL_HEADER_SIZE + name_length + (4 + 8 * extra if extra else 0)
+            count += 1
+
+        total = offset + central_size + END_RECORD_SIZE
+        if (count > zipfile.ZIP_FILECOUNT_LIMIT or offset > zipfile.ZIP64_LIMIT
+                or central_size > zipfile.ZIP64_LIMIT):
+            total += ZIP64_END_RECORD_SIZE
+        return total
+
+    def _etag(self):
+        digest = hashlib.sha256(self.manifest)
+        digest.update(str(self.manifest_date).encode())
+        for arcname, file_name, size, _ in self.entries:
+            digest.update(f'{arcname}:{file_name}:{size}'.encode())
+        return f'"{digest.hexdigest()[:32]}"'
+
+    def _generate(self):
+        sink = _StreamBuffer()
+        with zipfile.ZipFile(sink, mode='w', compression=zipfile.ZIP_STORED) as archive:
+            for arcname, file_name, size, issued in self._members():
+                with archive.open(self._zip_info(arcname, size, issued), mode='w') as member:
+                    if file_name is None:
+                        member.write(self.manifest)
+                    else:
+                        with self.storage.open(file_name, 'rb') as source:
+                            for chunk in iter(lambda: source.read(CHUNK_SIZE), b''):
+                                member.write(chunk)
+                                yield sink.pop()
+                yield sink.pop()
+        yield sink.pop()
+
+    def iter_bytes(self, start=0, end=None):
+        """Yield archive bytes in [start, end], holding at most one chunk in memory."""
+        end = self.size - 1 if end is None else end
+        position = 0
+        for chunk in self._generate():
+            if not chunk:
+                continue
+            chunk_end = position + len(chunk)
+            if chunk_end > start and position <= end:
+                yield chunk[max(start - position, 0):end - position + 1]
+            position = chunk_end
+            if position > end:
+                break
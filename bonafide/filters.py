@@ -0,0 +1,100 @@
+"""Query-parameter filters for the bonafide request list endpoints.
+
+Every filter maps onto an index on ``bonafide_requests`` (see
+BonafideRequest.Meta.indexes) or a unique key, so narrowing a list never
+falls back to scanning the table; ``manage.py explain_request_filters``
+checks the query plans. Free-text matching on names is deliberately not
+offered since it could not use an index.
+"""
+
+from datetime import datetime, time, timedelta
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from students.models import Student
+from .models import BonafideRequest
+
+STATUSES = {choice for choice, _ in BonafideRequest.STATUS_CHOICES}
+REASONS = {choice for choice, _ in BonafideRequest.REASON_CHOICES}
+
+# Query parameter -> (lookup, kind)
+DATE_FILTERS = {
+    'created_after': ('created_at__gte', 'start'),
+    'created_before': ('created_at__lt', 'end'),
+    'reviewed_after': ('dean_review_date__gte', 'start'),
+    'reviewed_before': ('dean_review_date__lt', 'end'),
+}
+
+
+def _choices(params, name, allowed):
+    values = [value.strip() for value in params.get(name, '').split(',') if value.strip()]
+    invalid = [value for value in values if value not in allowed]
+    if invalid:
+        raise ValidationError({name: f'Unknown value(s): {", ".join(invalid)}'})
+    return values
+
+
+def _date(params, name, kind):
+    try:
+        day = datetime.strptime(params[name], '%Y-%m-%d').date()
+    except ValueError:
+        raise ValidationError({name: 'Use YYYY-MM-DD'})
+    moment = timezone.make_aware(datetime.combine(day, time.min))
+    # "before" is inclusive of the given day
+    return moment + timedelta(days=1) if kind == 'end' else moment
+
+
+def filter_requests(queryset, params, allow_hostel=False):
+    """Narrow a BonafideRequest queryset by the supported query parameters.
+
+    status, reason       comma-separated choices
+    register_number      a student's register number (exact)
+    certificate_number   exact certificate number
+    search               register number or certificate number (exact)
+    created_after/before, reviewed_after/before
+                         YYYY-MM-DD, both ends inclusive
+    hostel               hostel id, when `allow_hostel` (the dean's views)
+    """
+    statuses = _choices(params, 'status', STATUSES)
+    if statuses:
+        queryset = queryset.filter(status__in=statuses)
+    reasons = _choices(params, 'reason', REASONS)
+    if reasons:
+        queryset = queryset.filter(reason__in=reasons)
+
+    register_number = params.get('register_number', '').strip()
+    if register_number:
+        queryset = queryset.filter(
+            student__in=Student.objects.filter(register_number=register_number).values('pk')
+        )
+    certificate_number = params.get('certificate_number', '').strip()
+    if certificate_number:
+        queryset = queryset.filter(certificate_number=certificate_number)
+    search = params.get('search', '').strip()
+    if search:
+        queryset = queryset.filter(
+            Q(student__in=Student.objects.filter(register_number=search).values('pk'))
+            | Q(certificate_number=search)
+        )
+
+    for name, (lookup, kind) in DATE_FILTERS.items():
+        if params.get(name):
+            queryset = queryset.filter(**{lookup: _date(params, name, kind)})
+
+    hostel = params.get('hostel', '').strip()
+    if hostel and allow_hostel:
+        if not hostel.isdigit():
+            raise ValidationError({'hostel': 'Must be a hostel id'})
+        queryset = queryset.filter(
+            student__in=Student.objects.filter(hostel_id=hostel).values('pk')
+        )
+    return queryset
+
+
+class RequestFilterMixin:
+    """List view mixin applying filter_requests() on top of the role-scoped queryset."""
+    allow_hostel_filter = False
+
+    def filter_queryset(self, queryset):
+        queryset = filter_requests(queryset, self.request.query_params, self.allow_hostel_filter)
+        return super().filter_queryset(queryset)
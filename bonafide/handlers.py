@@ -0,0 +1,73 @@
+"""Outbox handlers: the side effects of bonafide workflow events (see bonafide.outbox).
+
+Handlers run outside any transaction, and the event is marked delivered
+once all of them return. A crash or a failing handler means the event is
+delivered again, so every handler is idempotent. The certificate and
+attachment handlers do their slow work first and then re-check and save
+under a short row lock, discarding their files if the work was already
+done. Audit entries and queued emails are keyed on the event, so a
+redelivery finds them instead of adding another.
+"""
+
+from django.core.files.base import ContentFile
+from django.db import transaction
+from audit.models import AuditLog
+from .attachments import optimise_attachment
+from .events import record_event
+from .models import BonafideRequest
+from .notifications import notify
+from .outbox import handler
+from .pdf_generator import BonafideCertificateGenerator
+
+
+@handler('request_created', 'warden_reviewed', 'dean_reviewed')
+def write_audit_log(event):
+    audit = event.payload.get('audit')
+    if audit:
+        AuditLog.objects.get_or_create(outbox_event_id=event.pk, defaults={
+            'user_id': audit['user_id'], 'action': audit['action'], 'description': audit['description'],
+        })
+
+
+@handler('request_created')
+def process_attachment(event):
+    if event.request:
+        optimise_attachment(event.request)
+
+
+@handler('request_created')
+def notify_submitted(event):
+    notify(event, 'submitted')
+
+
+@handler('warden_reviewed')
+def notify_warden_decision(event):
+    notify(event, 'warden_decision')
+
+
+@handler('dean_reviewed')
+def notify_dean_decision(event):
+    notify(event, 'dean_decision')
+
+
+@handler('dean_reviewed')
+def render_certificate(event):
+    bonafide_request = event.request
+    if (bonafide_request is None or bonafide_request.status != 'dean_approved'
+            or bonafide_request.certificate_file):
+        return
+
+    # Rendered before taking any lock; this is the slow part
+    pdf_buffer = BonafideCertificateGenerator(bonafide_request).generate_pdf()
+    pdf_filename = f"bonafide_{bonafide_request.certificate_number.replace('/', '_')}.pdf"
+    bonafide_request.certificate_file.save(pdf_filename, ContentFile(pdf_buffer.read()), save=False)
+
+    with transaction.atomic():
+        current = BonafideRequest.objects.select_for_update().filter(pk=bonafide_request.pk).first()
+        if current is None or current.certificate_file:
+            # Deleted, or another delivery got there first
+            bonafide_request.certificate_file.delete(save=False)
+            return
+        bonafide_request.save(update_fields=['certificate_file', 'updated_at'])
+        record_event(bonafide_request, 'certificate_ready')
+        notify(event, 'certificate_ready')
@@ -0,0 +1,82 @@
+"""
+Benchmark JSON rendering of bonafide request lists.
+Runs against a throwaway test database filled with synthetic rows,
+so it is safe to run next to real data.
+"""
+
+import statistics
+import time
+from datetime import date
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from bonafide.models import BonafideRequest
+from bonafide.serializers import BonafideRequestSerializer
+from hostel_bonafide import renderers
+from hostel_bonafide.prefetch import optimize_queryset
+from students.models import Department, Student
+import io
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Measure the share of list response time spent encoding JSON, stdlib vs FastJSONRenderer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100, help='Requests per list page')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per measurement')
+
+    def handle(self, *args, **options):
+        setup_test_environment()
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            self.populate(options['rows'])
+            self.run(options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+    def populate(self, rows):
+        department = Department.objects.create(code='BEN', name='Benchmark Department')
+        for n in range(rows):
+            user = User.objects.create(username=f'benchmark{n}', role='student')
+            student = Student.objects.create(
+                user=user, register_number=f'BEN{n:05d}', name=f'Benchmark Student {n}',
+                date_of_birth=date(2004, 1, 1), gender='M', department=department, degree='B.E.',
+                current_year=2, admission_year=2023, graduation_year=2027, email=f'benchmark{n}@example.com'
+            )
+            BonafideRequest.objects.create(student=student, reason='other', reason_description='Benchmark')
+
+    def timed(self, repeat, func):
+        samples = []
+        for _ in range(repeat):
+            began = time.perf_counter()
+            func()
+            samples.append((time.perf_counter() - began) * 1000)
+        return statistics.median(samples)
+
+    def run(self, repeat):
+        serializer = BonafideRequestSerializer(many=True)
+        queryset = optimize_queryset(BonafideRequest.objects.all(), serializer)
+        data = BonafideRequestSerializer(queryset, many=True).data
+        body = JSONRenderer().render(data)
+
+        query_ms = self.timed(repeat, lambda: list(queryset.all()))
+        serialize_ms = self.timed(repeat, lambda: BonafideRequestSerializer(list(queryset.all()), many=True).data)
+        backend = 'orjson' if renderers.orjson else 'json (orjson not installed)'
+
+        self.stdout.write(f'{len(data)} requests, {len(body)} bytes, fast path: {backend}\n')
+        self.stdout.write(f'{"":>24} {"render (ms)":>12} {"parse (ms)":>11} {"render share":>13}')
+        for label, renderer, parser in (
+            ('JSONRenderer', JSONRenderer(), JSONParser()),
+            ('FastJSONRenderer', renderers.FastJSONRenderer(), renderers.FastJSONParser()),
+        ):
+            render_ms = self.timed(repeat, lambda: renderer.render(data))
+            parse_ms = self.timed(repeat, lambda: parser.parse(io.BytesIO(body)))
+            # Share of query + serializer + render spent producing the JSON bytes
+            share = render_ms / (query_ms + serialize_ms + render_ms)
+            self.stdout.write(f'{label:>24} {render_ms:>12.2f} {parse_ms:>11.2f} {share:>12.1%}')
@@ -0,0 +1,26 @@
+"""
+Remove chunked attachment uploads that were abandoned or already attached.
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from bonafide.models import AttachmentUpload
+from bonafide.uploads import discard_partial
+
+
+class Command(BaseCommand):
+    help = 'Delete stale chunked uploads and their partial files'
+
+    def handle(self, *args, **kwargs):
+        cutoff = timezone.now() - timedelta(hours=settings.BONAFIDE_UPLOAD_EXPIRY_HOURS)
+        stale = AttachmentUpload.objects.filter(updated_at__lt=cutoff)
+
+        count = 0
+        for upload in stale.iterator():
+            discard_partial(upload)
+            count += 1
+        stale.delete()
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Removed {count} stale uploads'))
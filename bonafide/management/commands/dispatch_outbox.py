@@ -0,0 +1,60 @@
+"""
+Deliver outbox events (audit entries, certificate PDFs, attachment
+processing) to their handlers.
+
+Without --loop the outbox is drained once; with --loop the command keeps
+polling and is meant to run as its own process. Several can run at once.
+"""
+
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from bonafide.models import OutboxEvent
+from bonafide.outbox import dispatch, drain, outbox_stats
+
+
+class Command(BaseCommand):
+    help = 'Dispatch pending bonafide outbox events'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new events')
+        parser.add_argument('--batch-size', type=int, default=settings.OUTBOX_BATCH_SIZE)
+        parser.add_argument('--stats', action='store_true', help='Print backlog and lag, then exit')
+
+    def handle(self, *args, **options):
+        if options['stats']:
+            for key, value in outbox_stats().items():
+                self.stdout.write(f'{key}: {value}')
+            return
+
+        if not options['loop']:
+            delivered, failed = drain(options['batch_size'])
+            self.report(delivered, failed)
+            return
+
+        self.stdout.write(self.style.SUCCESS('✓ Dispatching outbox events (Ctrl+C to stop)'))
+        last_pruned = 0
+        try:
+            while True:
+                delivered, failed = dispatch(options['batch_size'])
+                if delivered or failed:
+                    self.report(delivered, failed)
+                    continue
+                if time.monotonic() - last_pruned > 3600:
+                    self.prune()
+                    last_pruned = time.monotonic()
+                time.sleep(settings.OUTBOX_POLL_INTERVAL)
+        except KeyboardInterrupt:
+            pass
+
+    def report(self, delivered, failed):
+        lag = outbox_stats()['lag_seconds']
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Delivered {delivered} events, {failed} failed (lag {lag}s)'
+        ))
+
+    def prune(self):
+        cutoff = timezone.now() - timedelta(days=settings.OUTBOX_RETENTION_DAYS)
+        OutboxEvent.objects.filter(processed_at__lt=cutoff).delete()
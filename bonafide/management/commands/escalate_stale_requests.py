@@ -0,0 +1,44 @@
+"""
+Escalate requests that have waited too long with the warden or the dean.
+
+Meant to run periodically: hourly from cron, or as its own process with
+--loop (the procfile's `clock`). Requests past
+BONAFIDE_SLA_WARDEN_HOURS / BONAFIDE_SLA_DEAN_HOURS are marked escalated
+and summarised in one email to the dean (sent by send_notifications).
+Each pass also records the stage durations of requests reviewed since the
+previous one. The number of queries does not grow with the number of open
+requests.
+"""
+
+import time
+from django.core.management.base import BaseCommand
+from bonafide.sla import run_sla_pass
+
+
+class Command(BaseCommand):
+    help = 'Escalate stale bonafide requests to the dean and record SLA durations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep running a pass every --interval seconds')
+        parser.add_argument('--interval', type=int, default=3600, help='Seconds between passes with --loop')
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            self.run_pass()
+            return
+
+        self.stdout.write(self.style.SUCCESS('✓ Escalating stale requests (Ctrl+C to stop)'))
+        try:
+            while True:
+                self.run_pass()
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+    def run_pass(self):
+        escalated, recorded = run_sla_pass()
+        details = ', '.join(f'{count} {status}' for status, count in escalated.items())
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Escalated {sum(escalated.values())} requests' + (f' ({details})' if details else '')
+            + f', recorded {recorded} stage durations'
+        ))
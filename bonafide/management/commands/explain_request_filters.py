@@ -0,0 +1,80 @@
+"""
+Check that every request list filter is served by an index.
+
+Runs EXPLAIN for each filter supported by bonafide.filters, over the dean's
+and a warden's querysets, and fails if the plan scans bonafide_requests or
+students in full. Nothing is written to the database.
+"""
+
+import re
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from bonafide.filters import filter_requests
+from bonafide.models import BonafideRequest
+
+TABLES = ('bonafide_requests', 'students')
+
+CASES = {
+    'status': {'status': 'pending'},
+    'status (several)': {'status': 'pending,warden_approved'},
+    'reason': {'reason': 'passport'},
+    'register_number': {'register_number': 'R001'},
+    'certificate_number': {'certificate_number': 'BC/2025/0001'},
+    'search': {'search': 'R001'},
+    'created range': {'created_after': '2025-01-01', 'created_before': '2025-01-31'},
+    'reviewed range': {'reviewed_after': '2025-01-01', 'reviewed_before': '2025-01-31'},
+    'hostel': {'hostel': '1'},
+    'status + hostel': {'status': 'dean_approved', 'hostel': '1'},
+}
+
+
+def full_scans(plan):
+    """Lines of an EXPLAIN output that read one of TABLES without an index."""
+    scans = []
+    for line in plan.splitlines():
+        text = line.strip()
+        if connection.vendor == 'postgresql':
+            if any(f'Seq Scan on {table}' in text for table in TABLES):
+                scans.append(text)
+        elif connection.vendor == 'sqlite':
+            # SQLite reports full table or index walks as "SCAN <table> ..."
+            if any(re.search(rf'\bSCAN {table}\b', text) for table in TABLES):
+                scans.append(text)
+    return scans
+
+
+def check_plans():
+    """Yield (scope, case name, full scan lines) for every filter; run inside a transaction."""
+    scopes = {
+        'dean': BonafideRequest.objects.all(),
+        'warden': BonafideRequest.objects.filter(student__hostel_id=1),
+    }
+    if connection.vendor == 'postgresql':
+        # Tiny tables are cheaper to scan; ask whether an index *can* serve the query
+        with connection.cursor() as cursor:
+            cursor.execute('SET LOCAL enable_seqscan = off')
+    for scope, base in scopes.items():
+        for name, params in CASES.items():
+            queryset = filter_requests(base, params, allow_hostel=scope == 'dean')
+            yield scope, name, full_scans(queryset.order_by('-created_at', '-id').explain())
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN each bonafide request filter and fail on full table scans'
+
+    def handle(self, *args, **options):
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            raise CommandError(f'Query plans are not checked on {connection.vendor}')
+
+        failures = 0
+        with transaction.atomic():
+            for scope, name, scans in check_plans():
+                if scans:
+                    failures += 1
+                    self.stdout.write(self.style.ERROR(f'✗ {scope} / {name}: {"; ".join(scans)}'))
+                else:
+                    self.stdout.write(f'  {scope} / {name}: indexed')
+
+        if failures:
+            raise CommandError(f'{failures} filter(s) scan a whole table')
+        self.stdout.write(self.style.SUCCESS('✓ Every request filter uses an index'))
@@ -0,0 +1,43 @@
+"""
+Export issued bonafide certificates to a ZIP archive with a CSV manifest.
+The archive is streamed straight to the output file.
+"""
+
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from bonafide.exports import CertificateArchive, filter_issued_certificates
+
+
+class Command(BaseCommand):
+    help = 'Export issued certificates (optionally by hostel, department or month) as a ZIP'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hostel', type=int, help='Hostel id')
+        parser.add_argument('--department', type=int, help='Department id')
+        parser.add_argument('--month', help='Issue month in YYYY-MM format')
+        parser.add_argument('-o', '--output', required=True, help="Output file path, or '-' for stdout")
+
+    def handle(self, *args, **options):
+        try:
+            queryset = filter_issued_certificates(
+                hostel=options['hostel'],
+                department=options['department'],
+                month=options['month']
+            )
+        except ValueError:
+            raise CommandError('--month must be in YYYY-MM format')
+
+        archive = CertificateArchive(queryset)
+
+        if options['output'] == '-':
+            for chunk in archive.iter_bytes():
+                sys.stdout.buffer.write(chunk)
+            return
+
+        with open(options['output'], 'wb') as output:
+            for chunk in archive.iter_bytes():
+                output.write(chunk)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Exported {len(archive.entries)} certificates ({archive.size} bytes) to {options["output"]}'
+        ))
@@ -0,0 +1,33 @@
+"""
+Optimise request attachments that have not been processed yet
+(e.g. uploaded before the background stage existed, or after a restart).
+"""
+
+from django.core.management.base import BaseCommand
+from bonafide.attachments import optimise_attachment
+from bonafide.models import BonafideRequest
+
+
+class Command(BaseCommand):
+    help = 'Downscale image attachments and generate review thumbnails'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=None, help='Process at most this many requests')
+
+    def handle(self, *args, **options):
+        pending = BonafideRequest.objects.filter(
+            attachment_processed_at__isnull=True
+        ).exclude(attachment='').exclude(attachment__isnull=True).order_by('id')
+        if options['limit']:
+            pending = pending[:options['limit']]
+
+        optimised = 0
+        processed = 0
+        for bonafide_request in pending.iterator():
+            if optimise_attachment(bonafide_request):
+                optimised += 1
+            processed += 1
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Processed {processed} attachments ({optimised} images optimised)'
+        ))
@@ -0,0 +1,21 @@
+"""
+Delete review queue events older than the retention period.
+"""
+
+from datetime import timedelta
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from bonafide.models import RequestEvent
+
+
+class Command(BaseCommand):
+    help = 'Delete request events older than REQUEST_EVENTS_RETENTION_DAYS'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.REQUEST_EVENTS_RETENTION_DAYS)
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options['days'])
+        deleted, _ = RequestEvent.objects.filter(created_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f'✓ Removed {deleted} request events'))
@@ -0,0 +1,17 @@
+"""
+Recompute the per-hostel request counters from the bonafide requests table.
+
+Counters are kept current as requests change; run this after bulk edits
+made outside the API (admin, shell, SQL) or to repair any drift.
+"""
+
+from django.core.management.base import BaseCommand
+from bonafide.counters import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Rebuild request counters from bonafide requests'
+
+    def handle(self, *args, **options):
+        rows = rebuild_counters()
+        self.stdout.write(self.style.SUCCESS(f'✓ Rebuilt {rows} request counters'))
@@ -0,0 +1,18 @@
+"""
+Recompute every student's cooldown eligibility from the approved requests.
+
+Eligibility is kept current as requests are approved and the cooldown is
+changed (and filled in by the migration that adds it); run this after
+editing or restoring requests outside the API.
+"""
+
+from django.core.management.base import BaseCommand
+from bonafide.eligibility import rebuild_eligibility
+
+
+class Command(BaseCommand):
+    help = 'Rebuild StudentEligibility from dean approvals'
+
+    def handle(self, *args, **options):
+        count = rebuild_eligibility()
+        self.stdout.write(self.style.SUCCESS(f'✓ Rebuilt eligibility for {count} students'))
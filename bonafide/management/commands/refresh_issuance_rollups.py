@@ -0,0 +1,22 @@
+"""
+Fold newly issued or changed certificates into the monthly issuance rollups.
+
+Meant to run periodically (e.g. every few minutes from cron); only months
+with changes since the previous run are recomputed. --full rebuilds all.
+"""
+
+from django.core.management.base import BaseCommand
+from bonafide.rollups import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = 'Refresh issuance rollups incrementally'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Recompute every month')
+
+    def handle(self, *args, **options):
+        months = refresh_rollups(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Refreshed {len(months)} months' + (f' ({", ".join(months)})' if months else '')
+        ))
@@ -0,0 +1,49 @@
+"""
+Send queued bonafide status emails.
+
+Each batch goes out over one SMTP connection, and a recipient with several
+notifications gets a single digest. Without --loop the due notifications
+are sent once; with --loop the command keeps polling and is meant to run
+as its own process (the procfile's `worker`).
+"""
+
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from bonafide.notifications import send_pending
+
+
+class Command(BaseCommand):
+    help = 'Send pending bonafide email notifications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true', help='Keep polling for new notifications')
+        parser.add_argument('--batch-size', type=int, default=settings.BONAFIDE_EMAIL_BATCH_SIZE,
+                            help='Recipients per SMTP connection')
+        parser.add_argument('--interval', type=int, default=10, help='Seconds between polls with --loop')
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            sent = failed = 0
+            while True:
+                batch_sent, batch_failed = send_pending(options['batch_size'])
+                sent += batch_sent
+                failed += batch_failed
+                if not batch_sent and not batch_failed:
+                    break
+            self.report(sent, failed)
+            return
+
+        self.stdout.write(self.style.SUCCESS('✓ Sending notifications (Ctrl+C to stop)'))
+        try:
+            while True:
+                sent, failed = send_pending(options['batch_size'])
+                if sent or failed:
+                    self.report(sent, failed)
+                    continue
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+    def report(self, sent, failed):
+        self.stdout.write(self.style.SUCCESS(f'✓ Sent {sent} emails, {failed} notifications failed'))
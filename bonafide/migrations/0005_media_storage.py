@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:21
+
+import bonafide.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bonafide', '0004_alter_bonafidesettings_cooldown_period'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='bonafiderequest',
+            name='attachment',
+            field=models.FileField(blank=True, null=True, storage=bonafide.storage.get_media_storage, upload_to='bonafide_attachments/'),
+        ),
+        migrations.AlterField(
+            model_name='bonafiderequest',
+            name='certificate_file',
+            field=models.FileField(blank=True, null=True, storage=bonafide.storage.get_media_storage, upload_to='bonafide_certificates/'),
+        ),
+    ]
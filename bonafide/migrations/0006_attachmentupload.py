@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:23
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bonafide', '0005_media_storage'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttachmentUpload',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('upload_id', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('filename', models.CharField(max_length=255)),
+                ('content_type', models.CharField(blank=True, max_length=100)),
+                ('total_size', models.PositiveBigIntegerField()),
+                ('received_size', models.PositiveBigIntegerField(default=0)),
+                ('sha256', models.CharField(blank=True, max_length=64)),
+                ('status', models.CharField(choices=[('uploading', 'Uploading'), ('complete', 'Complete'), ('attached', 'Attached to Request')], default='uploading', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attachment_uploads', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'bonafide_attachment_uploads',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:24
+
+import bonafide.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bonafide', '0006_attachmentupload'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bonafiderequest',
+            name='attachment_original',
+            field=models.FileField(blank=True, null=True, storage=bonafide.storage.get_media_storage, upload_to='bonafide_attachments/originals/'),
+        ),
+        migrations.AddField(
+            model_name='bonafiderequest',
+            name='attachment_processed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bonafiderequest',
+            name='attachment_thumbnail',
+            field=models.FileField(blank=True, null=True, storage=bonafide.storage.get_media_storage, upload_to='bonafide_attachments/thumbnails/'),
+        ),
+    ]
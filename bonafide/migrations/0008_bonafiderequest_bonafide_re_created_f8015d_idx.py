@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bonafide', '0007_attachment_thumbnails'),
+        ('hostels', '0004_warden_designation_alter_warden_name'),
+        ('students', '0003_alter_department_code_academicyear'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bonafiderequest',
+            index=models.Index(fields=['created_at', 'id'], name='bonafide_re_created_f8015d_idx'),
+        ),
+    ]
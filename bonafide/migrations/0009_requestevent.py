@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:50
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bonafide', '0008_bonafiderequest_bonafide_re_created_f8015d_idx'),
+        ('hostels', '0004_warden_designation_alter_warden_name'),
+        ('students', '0003_alter_department_code_academicyear'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('created', 'Request Created'), ('warden_approved', 'Approved by Warden'), ('warden_rejected', 'Rejected by Warden'), ('dean_approved', 'Approved by Dean'), ('dean_rejected', 'Rejected by Dean'), ('certificate_ready', 'Certificate Ready')], max_length=20)),
+                ('status', models.CharField(max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('hostel', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='request_events', to='hostels.hostel')),
+                ('request', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='events', to='bonafide.bonafiderequest')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='request_events', to='students.student')),
+            ],
+            options={
+                'db_table': 'bonafide_request_events',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['hostel', 'id'], name='bonafide_re_hostel__05a8fd_idx'), models.Index(fields=['student', 'id'], name='bonafide_re_student_0cc148_idx')],
+            },
+        ),
+    ]
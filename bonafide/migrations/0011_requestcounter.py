@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-19 07:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bonafide', '0010_bonafiderequest_bonafide_re_updated_015354_idx'),
+        ('hostels', '0004_warden_designation_alter_warden_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('pending', 'Pending with Warden'), ('warden_approved', 'Approved by Warden'), ('warden_rejected', 'Rejected by Warden'), ('dean_approved', 'Approved by Dean'), ('dean_rejected', 'Rejected by Dean')], max_length=20)),
+                ('period', models.CharField(blank=True, max_length=7)),
+                ('count', models.IntegerField(default=0)),
+                ('hostel', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='request_counters', to='hostels.hostel')),
+            ],
+            options={
+                'db_table': 'bonafide_request_counters',
+                'constraints': [models.UniqueConstraint(fields=('hostel', 'status', 'period'), name='unique_request_counter')],
+            },
+        ),
+    ]
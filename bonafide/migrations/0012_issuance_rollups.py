@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bonafide', '0011_requestcounter'),
+        ('hostels', '0004_warden_designation_alter_warden_name'),
+        ('students', '0004_student_students_updated_bb8b54_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('watermark', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'job_checkpoints',
+            },
+        ),
+        migrations.CreateModel(
+            name='IssuanceRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.CharField(max_length=7)),
+                ('reason', models.CharField(choices=[('bank_loan', 'Bank Loan'), ('scholarship', 'Scholarship'), ('passport', 'Passport Application'), ('visa', 'Visa Application'), ('identity_proof', 'Identity Proof'), ('other', 'Other')], max_length=50)),
+                ('issued', models.IntegerField(default=0)),
+                ('warden_seconds', models.BigIntegerField(default=0)),
+                ('dean_seconds', models.BigIntegerField(default=0)),
+                ('total_seconds', models.BigIntegerField(default=0)),
+                ('histogram', models.JSONField(default=dict)),
+                ('department', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='issuance_rollups', to='students.department')),
+                ('hostel', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='issuance_rollups', to='hostels.hostel')),
+            ],
+            options={
+                'db_table': 'bonafide_issuance_rollups',
+                'ordering': ['month', 'reason'],
+                'indexes': [models.Index(fields=['month'], name='bonafide_is_month_fee6d9_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:01
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bonafide', '0012_issuance_rollups'),
+        ('hostels', '0004_warden_designation_alter_warden_name'),
+        ('students', '0004_student_students_updated_bb8b54_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bonafiderequest',
+            index=models.Index(fields=['status', 'created_at'], name='bonafide_re_status_7c9cac_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bonafiderequest',
+            index=models.Index(fields=['reason', 'created_at'], name='bonafide_re_reason_d24079_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bonafiderequest',
+            index=models.Index(fields=['dean_review_date'], name='bonafide_re_dean_re_ec2936_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bonafiderequest',
+            index=models.Index(fields=['student', 'status', 'dean_review_date'], name='bonafide_re_student_ee4312_idx'),
+        ),
+    ]
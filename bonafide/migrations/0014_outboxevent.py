@@ -0,0 +1,38 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bonafide', '0013_request_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboxEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('request_created', 'Request Created'), ('warden_reviewed', 'Reviewed by Warden'), ('dean_reviewed', 'Reviewed by Dean')], max_length=30)),
+                ('aggregate_id', models.PositiveBigIntegerField()),
+                ('payload', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('available_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('lock_token', models.UUIDField(blank=True, null=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('failed_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('request', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='outbox_events', to='bonafide.bonafiderequest')),
+            ],
+            options={
+                'db_table': 'bonafide_outbox',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['aggregate_id', 'id'], name='bonafide_ou_aggrega_a212f6_idx'), models.Index(condition=models.Q(('failed_at__isnull', True), ('processed_at__isnull', True)), fields=['id'], name='bonafide_outbox_pending_idx'), models.Index(fields=['lock_token'], name='bonafide_ou_lock_to_5a122a_idx'), models.Index(fields=['processed_at'], name='bonafide_ou_process_f026f6_idx')],
+            },
+        ),
+    ]
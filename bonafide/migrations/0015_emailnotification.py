@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:11
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bonafide', '0014_outboxevent'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailNotification',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('submitted', 'Request Submitted'), ('warden_decision', 'Warden Decision'), ('dean_decision', 'Dean Decision'), ('certificate_ready', 'Certificate Ready')], max_length=20)),
+                ('recipient', models.EmailField(max_length=254)),
+                ('dedupe_key', models.CharField(max_length=300, unique=True)),
+                ('subject', models.CharField(max_length=200)),
+                ('message', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('next_attempt_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('attempts', models.PositiveIntegerField(default=0)),
+                ('locked_until', models.DateTimeField(blank=True, null=True)),
+                ('lock_token', models.UUIDField(blank=True, null=True)),
+                ('sent_at', models.DateTimeField(blank=True, null=True)),
+                ('failed_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('request', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='email_notifications', to='bonafide.bonafiderequest')),
+            ],
+            options={
+                'db_table': 'bonafide_email_notifications',
+                'ordering': ['id'],
+                'indexes': [models.Index(condition=models.Q(('failed_at__isnull', True), ('sent_at__isnull', True)), fields=['next_attempt_at'], name='bonafide_email_pending_idx'), models.Index(fields=['recipient', 'id'], name='bonafide_em_recipie_7b2083_idx'), models.Index(fields=['lock_token'], name='bonafide_em_lock_to_7050df_idx')],
+            },
+        ),
+    ]
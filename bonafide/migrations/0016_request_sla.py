@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bonafide', '0015_emailnotification'),
+        ('hostels', '0004_warden_designation_alter_warden_name'),
+        ('students', '0004_student_students_updated_bb8b54_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='bonafiderequest',
+            name='dean_duration',
+            field=models.DurationField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bonafiderequest',
+            name='escalated_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='bonafiderequest',
+            name='warden_duration',
+            field=models.DurationField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='emailnotification',
+            name='kind',
+            field=models.CharField(choices=[('submitted', 'Request Submitted'), ('warden_decision', 'Warden Decision'), ('dean_decision', 'Dean Decision'), ('certificate_ready', 'Certificate Ready'), ('escalation', 'Escalation')], max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='bonafiderequest',
+            index=models.Index(fields=['status', 'warden_review_date'], name='bonafide_re_status_00b64f_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bonafiderequest',
+            index=models.Index(fields=['warden_review_date'], name='bonafide_re_warden__d72f0e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='bonafiderequest',
+            index=models.Index(fields=['escalated_at'], name='bonafide_re_escalat_29faa9_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-19 08:18
+
+import django.db.models.deletion
+from datetime import timedelta
+from django.db import migrations, models
+
+# BonafideSettings.get_cooldown_days(), which historical models don't have
+COOLDOWN_DAYS = {'disabled': 0, '1_month': 30, '3_months': 90, '6_months': 180, '1_year': 365}
+
+
+def fill_eligibility(apps, schema_editor):
+    BonafideRequest = apps.get_model('bonafide', 'BonafideRequest')
+    BonafideSettings = apps.get_model('bonafide', 'BonafideSettings')
+    StudentEligibility = apps.get_model('bonafide', 'StudentEligibility')
+    cooldown = BonafideSettings.objects.filter(pk=1).values_list('cooldown_period', flat=True).first()
+    days = COOLDOWN_DAYS.get(cooldown or '3_months', 90)
+    latest = BonafideRequest.objects.filter(
+        status='dean_approved', dean_review_date__isnull=False
+    ).values('student_id').annotate(last=models.Max('dean_review_date')).order_by()
+    StudentEligibility.objects.bulk_create([
+        StudentEligibility(
+            student_id=row['student_id'], last_approved_at=row['last'],
+            next_eligible_at=row['last'] + timedelta(days=days) if days else None,
+        )
+        for row in latest
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bonafide', '0016_request_sla'),
+        ('students', '0004_student_students_updated_bb8b54_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentEligibility',
+            fields=[
+                ('student', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='eligibility', serialize=False, to='students.student')),
+                ('last_approved_at', models.DateTimeField()),
+                ('next_eligible_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Student eligibility',
+                'db_table': 'bonafide_student_eligibility',
+            },
+        ),
+        migrations.RunPython(fill_eligibility, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-19 09:13
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('bonafide', '0017_studenteligibility'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='bonafiderequest',
+            name='bonafide_re_escalat_29faa9_idx',
+        ),
+    ]
@@ -1,7 +1,11 @@
 from django.db import models
 from django.conf import settings
-from students.models import Student
-from hostels.models import Warden
+from django.utils import timezone
+import os
+from students.models import Department, Student
+from hostels.models import Hostel, Warden
+from .storage import get_media_storage
+from hostel_bonafide.request_cache import cached_lookup
 import uuid
 
 
@@ -42,8 +46,7 @@ class BonafideSettings(models.Model):
     @classmethod
     def get_settings(cls):
         """Get or create settings instance."""
-        settings, created = cls.objects.get_or_create(pk=1)
-        return settings
+        return cached_lookup('bonafide_settings', lambda: cls.objects.get_or_create(pk=1)[0])
     
     def get_cooldown_days(self):
         """Convert cooldown period to days."""
@@ -85,7 +88,14 @@ class BonafideRequest(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     
     # Supporting documents (optional)
-    attachment = models.FileField(upload_to='bonafide_attachments/', null=True, blank=True)
+    attachment = models.FileField(upload_to='bonafide_attachments/', storage=get_media_storage, null=True, blank=True)
+    attachment_thumbnail = models.FileField(
+        upload_to='bonafide_attachments/thumbnails/', storage=get_media_storage, null=True, blank=True
+    )
+    attachment_original = models.FileField(
+        upload_to='bonafide_attachments/originals/', storage=get_media_storage, null=True, blank=True
+    )
+    attachment_processed_at = models.DateTimeField(null=True, blank=True)
     
     # Warden review
     reviewed_by_warden = models.ForeignKey(
@@ -112,15 +122,36 @@ class BonafideRequest(models.Model):
     # Certificate details
     certificate_number = models.CharField(max_length=50, unique=True, null=True, blank=True)
     certificate_issued_date = models.DateTimeField(null=True, blank=True)
-    certificate_file = models.FileField(upload_to='bonafide_certificates/', null=True, blank=True)
+    certificate_file = models.FileField(
+        upload_to='bonafide_certificates/', storage=get_media_storage, null=True, blank=True
+    )
     verification_code = models.CharField(max_length=100, unique=True, null=True, blank=True)
     
+    # SLA tracking (bonafide.sla): when the request was last escalated, and
+    # how long it spent with the warden and with the dean once it moved on
+    escalated_at = models.DateTimeField(null=True, blank=True)
+    warden_duration = models.DurationField(null=True, blank=True)
+    dean_duration = models.DurationField(null=True, blank=True)
+    
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         db_table = 'bonafide_requests'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['updated_at', 'id']),
+            # Filters on the request lists (see bonafide.filters)
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['reason', 'created_at']),
+            models.Index(fields=['dean_review_date']),
+            # A student's requests by status; also the cooldown check
+            models.Index(fields=['student', 'status', 'dean_review_date']),
+            # Stale request lookups and SLA reports (see bonafide.sla)
+            models.Index(fields=['status', 'warden_review_date']),
+            models.Index(fields=['warden_review_date']),
+        ]
     
     def __str__(self):
         return f"{self.student.register_number} - {self.get_reason_display()} ({self.get_status_display()})"
@@ -149,3 +180,253 @@ class BonafideRequest(models.Model):
         
         data = f"{self.request_id}{self.student.register_number}{settings.BONAFIDE_SIGNATURE_KEY}"
         return hashlib.sha256(data.encode()).hexdigest()[:32]
+
+
+class StudentEligibility(models.Model):
+    """When a student may next request a certificate, kept current by bonafide.eligibility.
+    
+    A student without a row has never had a request approved and is eligible.
+    """
+    
+    student = models.OneToOneField(
+        Student, on_delete=models.CASCADE, primary_key=True, related_name='eligibility'
+    )
+    last_approved_at = models.DateTimeField()
+    # Blank while the cooldown is disabled
+    next_eligible_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'bonafide_student_eligibility'
+        verbose_name_plural = 'Student eligibility'
+    
+    def __str__(self):
+        return f"{self.student_id} eligible from {self.next_eligible_at or 'now'}"
+
+
+class RequestCounter(models.Model):
+    """Number of requests per hostel and status, kept current by bonafide.counters.
+    
+    With a blank period the count is how many requests are in that status
+    now; with a 'YYYY-MM' period it is how many entered the status that
+    month ('pending' meaning created, 'dean_approved' meaning issued).
+    Requests are counted under their student's current hostel.
+    """
+    
+    hostel = models.ForeignKey(Hostel, on_delete=models.CASCADE, related_name='request_counters')
+    status = models.CharField(max_length=20, choices=BonafideRequest.STATUS_CHOICES)
+    period = models.CharField(max_length=7, blank=True)
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        db_table = 'bonafide_request_counters'
+        constraints = [
+            models.UniqueConstraint(fields=['hostel', 'status', 'period'], name='unique_request_counter'),
+        ]
+    
+    def __str__(self):
+        return f"{self.hostel_id} {self.status} {self.period or 'current'}: {self.count}"
+
+
+class IssuanceRollup(models.Model):
+    """Certificates issued per month, reason, department and hostel (see bonafide.rollups).
+    
+    Turnaround is stored as total seconds plus a histogram per stage so
+    means and percentiles can be computed without the request rows.
+    """
+    
+    month = models.CharField(max_length=7)  # YYYY-MM of certificate_issued_date
+    reason = models.CharField(max_length=50, choices=BonafideRequest.REASON_CHOICES)
+    department = models.ForeignKey(Department, on_delete=models.SET_NULL, null=True, blank=True, related_name='issuance_rollups')
+    hostel = models.ForeignKey(Hostel, on_delete=models.SET_NULL, null=True, blank=True, related_name='issuance_rollups')
+    issued = models.IntegerField(default=0)
+    # Seconds summed per stage: created -> warden review -> dean review
+    warden_seconds = models.BigIntegerField(default=0)
+    dean_seconds = models.BigIntegerField(default=0)
+    total_seconds = models.BigIntegerField(default=0)
+    histogram = models.JSONField(default=dict)  # {stage: [count per TURNAROUND_BUCKETS bucket]}
+    
+    class Meta:
+        db_table = 'bonafide_issuance_rollups'
+        ordering = ['month', 'reason']
+        indexes = [
+            models.Index(fields=['month']),
+        ]
+    
+    def __str__(self):
+        return f"{self.month} {self.reason}: {self.issued}"
+
+
+class JobCheckpoint(models.Model):
+    """How far an incremental background job has read."""
+    
+    name = models.CharField(max_length=50, unique=True)
+    watermark = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'job_checkpoints'
+    
+    def __str__(self):
+        return f"{self.name} @ {self.watermark}"
+
+
+class OutboxEvent(models.Model):
+    """Workflow event written in the same transaction as the change it describes.
+    
+    Side effects (audit entries, certificate PDFs, attachment processing)
+    are carried out by handlers in bonafide.outbox, after commit.
+    """
+    
+    KIND_CHOICES = (
+        ('request_created', 'Request Created'),
+        ('warden_reviewed', 'Reviewed by Warden'),
+        ('dean_reviewed', 'Reviewed by Dean'),
+    )
+    
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    request = models.ForeignKey(
+        BonafideRequest, on_delete=models.SET_NULL, null=True, blank=True, related_name='outbox_events'
+    )
+    # Request pk, kept after a delete; events for one request are delivered in id order
+    aggregate_id = models.PositiveBigIntegerField()
+    payload = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    # Delivery state
+    available_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    lock_token = models.UUIDField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    failed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    
+    class Meta:
+        db_table = 'bonafide_outbox'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['aggregate_id', 'id']),
+            models.Index(
+                fields=['id'], name='bonafide_outbox_pending_idx',
+                condition=models.Q(processed_at__isnull=True, failed_at__isnull=True),
+            ),
+            models.Index(fields=['lock_token']),
+            models.Index(fields=['processed_at']),
+        ]
+    
+    def __str__(self):
+        return f"#{self.id} {self.kind} ({self.aggregate_id})"
+
+
+class EmailNotification(models.Model):
+    """Queued email about a request, sent in batches by bonafide.notifications."""
+    
+    KIND_CHOICES = (
+        ('submitted', 'Request Submitted'),
+        ('warden_decision', 'Warden Decision'),
+        ('dean_decision', 'Dean Decision'),
+        ('certificate_ready', 'Certificate Ready'),
+        ('escalation', 'Escalation'),
+    )
+    
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    recipient = models.EmailField()
+    request = models.ForeignKey(
+        BonafideRequest, on_delete=models.SET_NULL, null=True, blank=True, related_name='email_notifications'
+    )
+    # One notification per (outbox event, recipient), however often the event is delivered
+    dedupe_key = models.CharField(max_length=300, unique=True)
+    subject = models.CharField(max_length=200)
+    message = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    # Delivery state
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    attempts = models.PositiveIntegerField(default=0)
+    locked_until = models.DateTimeField(null=True, blank=True)
+    lock_token = models.UUIDField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    failed_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    
+    class Meta:
+        db_table = 'bonafide_email_notifications'
+        ordering = ['id']
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at'], name='bonafide_email_pending_idx',
+                condition=models.Q(sent_at__isnull=True, failed_at__isnull=True),
+            ),
+            models.Index(fields=['recipient', 'id']),
+            models.Index(fields=['lock_token']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} to {self.recipient}"
+
+
+class AttachmentUpload(models.Model):
+    """Resumable, chunked upload of a request attachment."""
+    
+    STATUS_CHOICES = (
+        ('uploading', 'Uploading'),
+        ('complete', 'Complete'),
+        ('attached', 'Attached to Request'),
+    )
+    
+    upload_id = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='attachment_uploads')
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100, blank=True)
+    total_size = models.PositiveBigIntegerField()
+    received_size = models.PositiveBigIntegerField(default=0)
+    sha256 = models.CharField(max_length=64, blank=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='uploading')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'bonafide_attachment_uploads'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"{self.filename} ({self.received_size}/{self.total_size} bytes, {self.get_status_display()})"
+    
+    @property
+    def temp_path(self):
+        """Path of the partial file chunks are appended to."""
+        return os.path.join(settings.BONAFIDE_UPLOAD_TEMP_DIR, f"{self.upload_id}.part")
+
+
+class RequestEvent(models.Model):
+    """Append-only feed of review queue changes, streamed to clients over SSE."""
+    
+    KIND_CHOICES = (
+        ('created', 'Request Created'),
+        ('warden_approved', 'Approved by Warden'),
+        ('warden_rejected', 'Rejected by Warden'),
+        ('dean_approved', 'Approved by Dean'),
+        ('dean_rejected', 'Rejected by Dean'),
+        ('certificate_ready', 'Certificate Ready'),
+    )
+    
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    request = models.ForeignKey(BonafideRequest, on_delete=models.CASCADE, related_name='events')
+    # Copied from the student at the time of the event so streams filter without joins
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='request_events')
+    hostel = models.ForeignKey(Hostel, on_delete=models.SET_NULL, null=True, blank=True, related_name='request_events')
+    status = models.CharField(max_length=20)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        db_table = 'bonafide_request_events'
+        ordering = ['id']
+        indexes = [
+            models.Index(fields=['hostel', 'id']),
+            models.Index(fields=['student', 'id']),
+        ]
+    
+    def __str__(self):
+        return f"#{self.id} {self.get_kind_display()} ({self.request_id})"
+
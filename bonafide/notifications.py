@@ -0,0 +1,157 @@
+"""Status emails for bonafide requests.
+
+Outbox handlers (bonafide.handlers) queue EmailNotification rows after
+the change commits, so the review views never wait on mail. The
+send_notifications command sends them. Each batch uses one SMTP
+connection. Messages for the same recipient that arrive within
+BONAFIDE_EMAIL_COALESCE_SECONDS go out as a single digest. A failed send
+is retried with backoff.
+"""
+
+import logging
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Q
+from django.utils import timezone
+from hostels.models import Warden
+from .models import EmailNotification
+
+logger = logging.getLogger(__name__)
+
+DECISIONS = {
+    'warden_approved': 'was approved by your warden and forwarded to the Dean',
+    'warden_rejected': 'was rejected by your warden',
+    'dean_approved': 'was approved by the Dean; your certificate is being prepared',
+    'dean_rejected': 'was rejected by the Dean',
+}
+
+
+def queue_notification(kind, recipient, bonafide_request, key, subject, message):
+    if not recipient or not settings.BONAFIDE_EMAIL_NOTIFICATIONS:
+        return None
+    notification, _ = EmailNotification.objects.get_or_create(dedupe_key=f'{key}:{kind}:{recipient}', defaults={
+        'kind': kind,
+        'recipient': recipient,
+        'request': bonafide_request,
+        'subject': subject,
+        'message': message,
+    })
+    return notification
+
+
+def notify(event, kind):
+    """Queue the emails for outbox `event`; `kind` is an EmailNotification kind."""
+    bonafide_request = event.request
+    if bonafide_request is None:
+        return
+    student = bonafide_request.student
+    label = f"Your bonafide request for {bonafide_request.get_reason_display()} ({bonafide_request.request_id})"
+
+    if kind == 'submitted':
+        queue_notification(
+            kind, student.email, bonafide_request, event.pk, 'Bonafide request submitted',
+            f'{label} was submitted and is waiting for your warden.'
+        )
+        for email in Warden.objects.filter(hostel_id=student.hostel_id).values_list('email', flat=True):
+            queue_notification(
+                kind, email, bonafide_request, event.pk, 'New bonafide request',
+                f'{student.name} ({student.register_number}) requested a bonafide certificate '
+                f'for {bonafide_request.get_reason_display()}.'
+            )
+    elif kind in ('warden_decision', 'dean_decision'):
+        status = event.payload.get('status', bonafide_request.status)
+        remarks = (bonafide_request.warden_remarks if kind == 'warden_decision'
+                   else bonafide_request.dean_remarks)
+        message = f'{label} {DECISIONS[status]}.'
+        if remarks and status.endswith('rejected'):
+            message += f' Remarks: {remarks}'
+        queue_notification(kind, student.email, bonafide_request, event.pk, 'Bonafide request update', message)
+    elif kind == 'certificate_ready':
+        queue_notification(
+            kind, student.email, bonafide_request, event.pk, 'Bonafide certificate ready',
+            f'Your bonafide certificate {bonafide_request.certificate_number} is ready to download.'
+        )
+
+
+def pending_notifications():
+    return EmailNotification.objects.filter(sent_at__isnull=True, failed_at__isnull=True)
+
+
+def claim(batch_size):
+    """Lease due notifications, whole recipients at a time, and group them by recipient."""
+    now = timezone.now()
+    unleased = Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+    due = pending_notifications().filter(
+        unleased, next_attempt_at__lte=now,
+        created_at__lte=now - timedelta(seconds=settings.BONAFIDE_EMAIL_COALESCE_SECONDS),
+    )
+    recipients = set(due.order_by('id').values_list('recipient', flat=True)[:batch_size])
+    if not recipients:
+        return {}
+
+    token = uuid.uuid4()
+    due.filter(recipient__in=recipients).update(locked_until=now + timedelta(minutes=10), lock_token=token)
+    grouped = defaultdict(list)
+    for notification in EmailNotification.objects.filter(lock_token=token).order_by('id'):
+        grouped[notification.recipient].append(notification)
+    return grouped
+
+
+def build_message(recipient, notifications):
+    if len(notifications) == 1:
+        subject, body = notifications[0].subject, notifications[0].message
+    else:
+        subject = f'{len(notifications)} updates on bonafide requests'
+        body = '\n\n'.join(f'- {notification.message}' for notification in notifications)
+    body += f'\n\n{settings.UNIVERSITY_NAME}, {settings.UNIVERSITY_LOCATION}'
+    return EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [recipient])
+
+
+def retry_later(notifications, error):
+    now = timezone.now()
+    for notification in notifications:
+        attempts = notification.attempts + 1
+        EmailNotification.objects.filter(pk=notification.pk).update(
+            attempts=attempts,
+            last_error=error,
+            locked_until=None,
+            lock_token=None,
+            next_attempt_at=now + timedelta(minutes=min(2 ** attempts, 360)),
+            failed_at=now if attempts >= settings.BONAFIDE_EMAIL_MAX_ATTEMPTS else None,
+        )
+
+
+def send_pending(batch_size=None):
+    """Send one batch over a single SMTP connection; returns (emails sent, notifications failed)."""
+    grouped = claim(batch_size or settings.BONAFIDE_EMAIL_BATCH_SIZE)
+    if not grouped:
+        return 0, 0
+
+    connection = get_connection(fail_silently=False)
+    try:
+        connection.open()
+    except Exception as exc:
+        logger.exception('Could not connect to the mail server')
+        retry_later([n for batch in grouped.values() for n in batch], f'{type(exc).__name__}: {exc}')
+        return 0, sum(len(batch) for batch in grouped.values())
+
+    sent = failed = 0
+    try:
+        for recipient, notifications in grouped.items():
+            try:
+                connection.send_messages([build_message(recipient, notifications)])
+            except Exception as exc:
+                logger.exception('Sending notification email to %s failed', recipient)
+                retry_later(notifications, f'{type(exc).__name__}: {exc}')
+                failed += len(notifications)
+            else:
+                EmailNotification.objects.filter(pk__in=[n.pk for n in notifications]).update(
+                    sent_at=timezone.now(), locked_until=None, lock_token=None
+                )
+                sent += 1
+    finally:
+        connection.close()
+    return sent, failed
@@ -0,0 +1,164 @@
+"""Transactional outbox for bonafide workflow events.
+
+Views call publish() inside the transaction that changes a request, so an
+event exists exactly when the change committed. dispatch() drains the
+outbox in batches and hands each event to the handlers registered for its
+kind (see bonafide.handlers):
+
+* Delivery is at-least-once. An event is marked processed only after all
+  of its handlers succeed, so handlers must be idempotent.
+* Events for the same request are delivered in order. An event is only
+  claimed once every earlier event for its request has been processed.
+* Several dispatchers may run at once. Claimed events are leased for
+  OUTBOX_LEASE_SECONDS, renewed as each event's delivery starts, and a
+  lease that runs out makes the event claimable again. An event whose
+  lease was taken over by another dispatcher is skipped.
+* Handlers are not wrapped in a transaction. Each keeps its own writes
+  short, so slow work (rendering, resizing) never holds the write lock.
+* A failed event is retried with exponential backoff. After
+  OUTBOX_MAX_ATTEMPTS it is parked with failed_at set.
+"""
+
+import logging
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from .models import OutboxEvent
+
+logger = logging.getLogger(__name__)
+
+HANDLERS = defaultdict(list)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='outbox')
+
+
+def handler(*kinds):
+    """Register the decorated function to receive events of `kinds`."""
+    def register(function):
+        for kind in kinds:
+            HANDLERS[kind].append(function)
+        return function
+    return register
+
+
+def publish(kind, bonafide_request, **payload):
+    """Record an event for `bonafide_request` in the current transaction."""
+    event = OutboxEvent.objects.create(
+        kind=kind, request=bonafide_request, aggregate_id=bonafide_request.pk, payload=payload
+    )
+    if settings.OUTBOX_AUTODISPATCH:
+        transaction.on_commit(lambda: _executor.submit(_drain_in_background))
+    return event
+
+
+def pending_events():
+    return OutboxEvent.objects.filter(processed_at__isnull=True, failed_at__isnull=True)
+
+
+def claim(batch_size):
+    """Lease up to `batch_size` deliverable events and return them in id order."""
+    now = timezone.now()
+    unleased = Q(locked_until__isnull=True) | Q(locked_until__lt=now)
+    earlier = pending_events().filter(aggregate_id=OuterRef('aggregate_id'), id__lt=OuterRef('id'))
+    candidates = list(
+        pending_events().filter(unleased, available_at__lte=now)
+        .exclude(Exists(earlier)).order_by('id').values_list('id', flat=True)[:batch_size]
+    )
+    if not candidates:
+        return []
+
+    token = uuid.uuid4()
+    # Re-checks the lease so concurrent dispatchers never both take an event
+    pending_events().filter(unleased, id__in=candidates).update(
+        locked_until=now + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS), lock_token=token
+    )
+    return list(OutboxEvent.objects.filter(lock_token=token).select_related('request').order_by('id'))
+
+
+def deliver(event):
+    for function in HANDLERS.get(event.kind, ()):
+        function(event)
+
+
+def renew_lease(mine):
+    """Extend the lease on one claimed event; False if another dispatcher has taken it."""
+    return bool(mine.filter(processed_at__isnull=True).update(
+        locked_until=timezone.now() + timedelta(seconds=settings.OUTBOX_LEASE_SECONDS)
+    ))
+
+
+def dispatch(batch_size=None):
+    """Deliver one batch; returns (delivered, failed)."""
+    delivered = failed = 0
+    blocked = set()
+    for event in claim(batch_size or settings.OUTBOX_BATCH_SIZE):
+        mine = OutboxEvent.objects.filter(pk=event.pk, lock_token=event.lock_token)
+        if event.aggregate_id in blocked:
+            # An earlier event for this request failed; keep the order
+            mine.update(locked_until=None, lock_token=None)
+            continue
+        if not renew_lease(mine):
+            # The batch outlasted this event's lease and it was claimed again
+            continue
+        try:
+            deliver(event)
+        except Exception as exc:
+            logger.exception('Outbox event %s (%s) failed', event.pk, event.kind)
+            failed += 1
+            blocked.add(event.aggregate_id)
+            attempts = event.attempts + 1
+            now = timezone.now()
+            mine.update(
+                attempts=attempts,
+                last_error=f'{type(exc).__name__}: {exc}',
+                locked_until=None,
+                lock_token=None,
+                available_at=now + timedelta(seconds=min(2 ** attempts, 3600)),
+                failed_at=now if attempts >= settings.OUTBOX_MAX_ATTEMPTS else None,
+            )
+        else:
+            delivered += 1
+            mine.update(processed_at=timezone.now(), locked_until=None, lock_token=None)
+    return delivered, failed
+
+
+def drain(batch_size=None):
+    """Dispatch batches until nothing deliverable is left; returns (delivered, failed)."""
+    delivered = failed = 0
+    while True:
+        batch_delivered, batch_failed = dispatch(batch_size)
+        delivered += batch_delivered
+        failed += batch_failed
+        if not batch_delivered and not batch_failed:
+            return delivered, failed
+
+
+def _drain_in_background():
+    close_old_connections()
+    try:
+        drain()
+    except Exception:
+        logger.exception('Outbox dispatch failed')
+    finally:
+        close_old_connections()
+
+
+def outbox_stats():
+    """Backlog size and lag, for monitoring the dispatcher."""
+    now = timezone.now()
+    pending = pending_events()
+    oldest = pending.order_by('id').values_list('created_at', flat=True).first()
+    return {
+        'pending': pending.count(),
+        'lag_seconds': round((now - oldest).total_seconds(), 1) if oldest else 0,
+        'retrying': pending.filter(attempts__gt=0).count(),
+        'failed': OutboxEvent.objects.filter(failed_at__isnull=False).count(),
+        'processed_last_hour': OutboxEvent.objects.filter(
+            processed_at__gte=now - timedelta(hours=1)
+        ).count(),
+    }
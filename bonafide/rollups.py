@@ -0,0 +1,185 @@
+"""Monthly issuance rollups (IssuanceRollup) for reporting without scanning requests.
+
+refresh_rollups() is incremental: it finds issued requests whose
+``updated_at`` moved past the last checkpoint and recomputes only the
+months they fall in. Recomputing a whole month is idempotent, so a row
+seen twice is never double counted. Deleting a certificate recomputes its
+month from a signal. Department and hostel are the student's at the time
+the month was last computed.
+"""
+
+from datetime import datetime, timedelta
+from django.db import transaction
+from django.utils import timezone
+from .counters import period_of
+from .models import BonafideRequest, IssuanceRollup, JobCheckpoint
+
+CHECKPOINT = 'issuance_rollups'
+STAGES = ('warden', 'dean', 'total')
+# Upper bounds, in hours, of the turnaround histogram buckets; the last bucket is open-ended
+TURNAROUND_BUCKETS = (1, 4, 8, 24, 48, 72, 120, 168, 336, 720)
+# Seconds the watermark trails the clock, for transactions still committing
+WATERMARK_LAG = 5
+
+ROW_FIELDS = (
+    'reason', 'student__department_id', 'student__hostel_id',
+    'created_at', 'warden_review_date', 'dean_review_date', 'certificate_issued_date',
+)
+
+
+def issued_requests():
+    return BonafideRequest.objects.filter(status='dean_approved', certificate_issued_date__isnull=False)
+
+
+def month_bounds(month):
+    year, month_number = (int(part) for part in month.split('-'))
+    start = timezone.make_aware(datetime(year, month_number, 1))
+    end = timezone.make_aware(datetime(year + month_number // 12, month_number % 12 + 1, 1))
+    return start, end
+
+
+def bucket_index(seconds):
+    hours = seconds / 3600
+    for index, bound in enumerate(TURNAROUND_BUCKETS):
+        if hours <= bound:
+            return index
+    return len(TURNAROUND_BUCKETS)
+
+
+def stage_seconds(created_at, warden_review_date, dean_review_date, issued_at):
+    """{stage: seconds} for the stages a request has both ends of."""
+    finished = dean_review_date or issued_at
+    seconds = {'total': max((finished - created_at).total_seconds(), 0)}
+    if warden_review_date:
+        seconds['warden'] = max((warden_review_date - created_at).total_seconds(), 0)
+        seconds['dean'] = max((finished - warden_review_date).total_seconds(), 0)
+    return seconds
+
+
+def empty_histogram():
+    return {stage: [0] * (len(TURNAROUND_BUCKETS) + 1) for stage in STAGES}
+
+
+def add_to_rollup(rollup, durations):
+    rollup.issued += 1
+    for stage, seconds in durations.items():
+        setattr(rollup, f'{stage}_seconds', getattr(rollup, f'{stage}_seconds') + int(seconds))
+        rollup.histogram[stage][bucket_index(seconds)] += 1
+
+
+def fold(rows):
+    """Build unsaved rollups from (ROW_FIELDS) tuples."""
+    rollups = {}
+    for reason, department_id, hostel_id, created_at, warden_at, dean_at, issued_at in rows:
+        key = (period_of(issued_at), reason, department_id, hostel_id)
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollup = rollups[key] = IssuanceRollup(
+                month=key[0], reason=reason, department_id=department_id, hostel_id=hostel_id,
+                histogram=empty_histogram(),
+            )
+        add_to_rollup(rollup, stage_seconds(created_at, warden_at, dean_at, issued_at))
+    return rollups.values()
+
+
+def lock_checkpoint():
+    checkpoint, _ = JobCheckpoint.objects.get_or_create(name=CHECKPOINT)
+    # Serialises refreshes with the delete signal below
+    return JobCheckpoint.objects.select_for_update().get(pk=checkpoint.pk)
+
+
+def recompute_month(month):
+    """Rebuild one month's rollups from the requests; call with the checkpoint locked."""
+    start, end = month_bounds(month)
+    rows = issued_requests().filter(
+        certificate_issued_date__gte=start, certificate_issued_date__lt=end
+    ).values_list(*ROW_FIELDS)
+    IssuanceRollup.objects.filter(month=month).delete()
+    IssuanceRollup.objects.bulk_create(fold(rows))
+
+
+def refresh_rollups(full=False):
+    """Fold changes since the last run into the rollups; returns the months recomputed."""
+    upper = timezone.now() - timedelta(seconds=WATERMARK_LAG)
+    with transaction.atomic():
+        checkpoint = lock_checkpoint()
+        if full or checkpoint.watermark is None:
+            IssuanceRollup.objects.all().delete()
+            rollups = list(fold(issued_requests().values_list(*ROW_FIELDS).iterator(chunk_size=2000)))
+            IssuanceRollup.objects.bulk_create(rollups)
+            months = {rollup.month for rollup in rollups}
+        else:
+            changed = issued_requests().filter(
+                updated_at__gt=checkpoint.watermark, updated_at__lte=upper
+            ).values_list('certificate_issued_date', flat=True)
+            months = {period_of(issued_at) for issued_at in changed}
+            for month in sorted(months):
+                recompute_month(month)
+        checkpoint.watermark = upper
+        checkpoint.save()
+    return sorted(months)
+
+
+def remove_from_rollups(bonafide_request):
+    """Recompute the month of a deleted certificate; call after the row is gone."""
+    if bonafide_request.status != 'dean_approved' or not bonafide_request.certificate_issued_date:
+        return
+    with transaction.atomic():
+        checkpoint = lock_checkpoint()
+        if checkpoint.watermark is None:
+            return  # nothing folded in yet; the first refresh builds every month
+        recompute_month(period_of(bonafide_request.certificate_issued_date))
+
+
+def percentile(histogram, fraction):
+    """Estimate a percentile, in hours, by interpolating within histogram buckets."""
+    total = sum(histogram)
+    if not total:
+        return None
+    target = fraction * total
+    seen = 0
+    for index, count in enumerate(histogram):
+        if count and seen + count >= target:
+            lower = TURNAROUND_BUCKETS[index - 1] if index else 0
+            if index == len(TURNAROUND_BUCKETS):
+                return float(lower)
+            return round(lower + (TURNAROUND_BUCKETS[index] - lower) * (target - seen) / count, 1)
+        seen += count
+    return float(TURNAROUND_BUCKETS[-1])
+
+
+def summarize(rollups, group_by):
+    """Merge rollup rows (dicts) into one entry per combination of `group_by`.
+
+    `group_by` maps output names to keys of the rollup dicts.
+    """
+    groups = {}
+    for rollup in rollups:
+        key = tuple(rollup[field] for field in group_by.values())
+        group = groups.get(key)
+        if group is None:
+            group = groups[key] = {
+                'key': key, 'issued': 0, 'histogram': empty_histogram(),
+                'seconds': dict.fromkeys(STAGES, 0),
+            }
+        group['issued'] += rollup['issued']
+        for stage in STAGES:
+            group['seconds'][stage] += rollup[f'{stage}_seconds']
+            histogram = rollup['histogram'].get(stage, ())
+            for index, count in enumerate(histogram):
+                group['histogram'][stage][index] += count
+
+    results = []
+    for key in sorted(groups, key=lambda key: tuple('' if part is None else str(part) for part in key)):
+        group = groups[key]
+        turnaround = {}
+        for stage in STAGES:
+            samples = sum(group['histogram'][stage])
+            turnaround[stage] = {
+                'mean_hours': round(group['seconds'][stage] / samples / 3600, 1) if samples else None,
+                'p50_hours': percentile(group['histogram'][stage], 0.5),
+                'p90_hours': percentile(group['histogram'][stage], 0.9),
+                'p95_hours': percentile(group['histogram'][stage], 0.95),
+            }
+        results.append({**dict(zip(group_by, key)), 'issued': group['issued'], 'turnaround': turnaround})
+    return results
@@ -1,10 +1,15 @@
 from rest_framework import serializers
-from .models import BonafideRequest, BonafideSettings
+from django.conf import settings as django_settings
+from .models import BonafideRequest, BonafideSettings, AttachmentUpload
+from .uploads import attach_upload
+from .eligibility import blocking_eligibility
+from hostel_bonafide.serializers import FragmentListSerializer, SparseFieldsMixin
 from students.serializers import StudentSerializer
-from datetime import datetime, timedelta
+from django.utils import timezone
+import math
 
 
-class BonafideRequestSerializer(serializers.ModelSerializer):
+class BonafideRequestSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Bonafide Request."""
     student_details = StudentSerializer(source='student', read_only=True)
     warden_name = serializers.CharField(source='reviewed_by_warden.name', read_only=True)
@@ -16,10 +21,16 @@ class BonafideRequestSerializer(serializers.ModelSerializer):
         model = BonafideRequest
         fields = '__all__'
         read_only_fields = (
-            'request_id', 'student', 'status', 'reviewed_by_warden', 'warden_review_date',
+            'request_id', 'student', 'status', 'attachment_thumbnail', 'attachment_original',
+            'attachment_processed_at', 'reviewed_by_warden', 'warden_review_date',
             'reviewed_by_dean', 'dean_review_date', 'certificate_number',
-            'certificate_issued_date', 'certificate_file', 'verification_code'
+            'certificate_issued_date', 'certificate_file', 'verification_code',
+            'escalated_at', 'warden_duration', 'dean_duration'
         )
+        # What each method field reads, for AutoPrefetchMixin
+        method_sources = {'dean_name': ('reviewed_by_dean',)}
+        # Fetches the page's cached student_details in one go
+        list_serializer_class = FragmentListSerializer
     
     def get_dean_name(self, obj):
         if obj.reviewed_by_dean:
@@ -29,13 +40,39 @@ class BonafideRequestSerializer(serializers.ModelSerializer):
 
 class CreateBonafideRequestSerializer(serializers.ModelSerializer):
     """Serializer for creating bonafide request."""
+    upload_id = serializers.UUIDField(write_only=True, required=False)
     
     class Meta:
         model = BonafideRequest
-        fields = ('reason', 'reason_description', 'attachment')
+        fields = ('reason', 'reason_description', 'attachment', 'upload_id')
+    
+    def validate_upload_id(self, value):
+        request = self.context.get('request')
+        try:
+            upload = AttachmentUpload.objects.get(upload_id=value, user=request.user)
+        except AttachmentUpload.DoesNotExist:
+            raise serializers.ValidationError("Upload not found.")
+        if upload.status != 'complete':
+            raise serializers.ValidationError("Upload is not complete or has already been used.")
+        return upload
+    
+    def create(self, validated_data):
+        upload = validated_data.pop('upload_id', None)
+        if upload:
+            # Call inside a transaction: a concurrent create may have attached it since validation
+            upload = AttachmentUpload.objects.select_for_update().filter(pk=upload.pk, status='complete').first()
+            if upload is None:
+                raise serializers.ValidationError({'upload_id': ["Upload is not complete or has already been used."]})
+        bonafide_request = super().create(validated_data)
+        if upload:
+            attach_upload(upload, bonafide_request)
+        return bonafide_request
     
     def validate(self, data):
         """Check if student can submit new request based on cooldown period."""
+        if data.get('upload_id') and data.get('attachment'):
+            raise serializers.ValidationError("Send either an attachment or an upload_id, not both.")
+        
         request = self.context.get('request')
         if not request or not request.user:
             raise serializers.ValidationError("Authentication required. Please log in again.")
@@ -48,38 +85,47 @@ class CreateBonafideRequestSerializer(serializers.ModelSerializer):
                 "Student profile not found. Please contact the administrator to set up your student profile."
             )
         
-        # Get cooldown settings
-        settings = BonafideSettings.get_settings()
-        cooldown_days = settings.get_cooldown_days()
-        
-        # Skip cooldown check if disabled
-        if cooldown_days == 0:
-            return data
-        
-        # Check for recent approved requests
-        cutoff_date = datetime.now() - timedelta(days=cooldown_days)
-        recent_approved = BonafideRequest.objects.filter(
-            student=student,
-            status='dean_approved',
-            dean_review_date__gte=cutoff_date
-        ).order_by('-dean_review_date').first()
-        
-        if recent_approved:
-            days_since_approval = (datetime.now() - recent_approved.dean_review_date.replace(tzinfo=None)).days
-            days_remaining = cooldown_days - days_since_approval
-            can_reapply_date = recent_approved.dean_review_date + timedelta(days=cooldown_days)
+        # One primary-key lookup; the row is kept current by bonafide.eligibility
+        eligibility = blocking_eligibility(student)
+        if eligibility:
+            remaining = eligibility.next_eligible_at - timezone.now()
+            cooldown_display = BonafideSettings.get_settings().get_cooldown_period_display()
             
             raise serializers.ValidationError({
                 'cooldown': True,
-                'message': f'You can reapply after {settings.get_cooldown_period_display()} from your last approval',
-                'days_remaining': days_remaining,
-                'can_reapply_date': can_reapply_date.strftime('%Y-%m-%d'),
-                'last_approved_date': recent_approved.dean_review_date.strftime('%Y-%m-%d')
+                'message': f'You can reapply after {cooldown_display} from your last approval',
+                'days_remaining': math.ceil(remaining.total_seconds() / 86400),
+                'can_reapply_date': timezone.localtime(eligibility.next_eligible_at).strftime('%Y-%m-%d'),
+                'last_approved_date': timezone.localtime(eligibility.last_approved_at).strftime('%Y-%m-%d')
             })
         
         return data
 
 
+class AttachmentUploadSerializer(serializers.ModelSerializer):
+    """Serializer for starting and inspecting a chunked attachment upload."""
+    size = serializers.IntegerField(source='total_size', min_value=1)
+    offset = serializers.IntegerField(source='received_size', read_only=True)
+    chunk_size = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = AttachmentUpload
+        fields = ('upload_id', 'filename', 'content_type', 'size', 'offset', 'chunk_size', 'sha256', 'status', 'created_at')
+        read_only_fields = ('upload_id', 'sha256', 'status', 'created_at')
+    
+    def get_chunk_size(self, obj):
+        return django_settings.BONAFIDE_UPLOAD_CHUNK_SIZE
+    
+    def validate_size(self, value):
+        max_size = django_settings.BONAFIDE_UPLOAD_MAX_SIZE
+        if value > max_size:
+            raise serializers.ValidationError(f"Attachments may be at most {max_size // (1024 * 1024)} MB.")
+        return value
+    
+    def validate_filename(self, value):
+        return value.replace('\\', '/').rsplit('/', 1)[-1]
+
+
 class WardenReviewSerializer(serializers.Serializer):
     """Serializer for warden review."""
     action = serializers.ChoiceField(choices=['approve', 'reject'], required=True)
@@ -98,7 +144,7 @@ class DeanReviewSerializer(serializers.Serializer):
     remarks = serializers.CharField(required=False, allow_blank=True)
 
 
-class BonafideSettingsSerializer(serializers.ModelSerializer):
+class BonafideSettingsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for bonafide settings."""
     cooldown_display = serializers.CharField(source='get_cooldown_period_display', read_only=True)
     
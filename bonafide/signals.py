@@ -0,0 +1,101 @@
+"""Invalidate cached dashboards (see bonafide.dashboard) on relevant writes,
+leave tombstones for deleted requests and for requests whose student left a
+hostel (see hostel_bonafide.sync) and keep request counters (see
+bonafide.counters) right when requests are deleted or students change
+hostel. Status transitions update counters in the views.
+Deleted certificates are also taken out of the issuance rollups, and
+student eligibility (see bonafide.eligibility) follows cooldown changes."""
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from accounts.models import DeanProfile
+from audit.models import Tombstone
+from hostels.models import Hostel, Warden
+from students.models import AcademicYear, Department, Student
+from .counters import apply_counts, move_student, request_contributions
+from .dashboard import bump_dashboard_versions
+from .eligibility import apply_cooldown, refresh_student
+from .rollups import remove_from_rollups
+from .models import BonafideRequest, BonafideSettings
+
+
+@receiver([post_save, post_delete], sender=BonafideRequest)
+def request_changed(sender, instance, **kwargs):
+    student = instance.student
+    warden_users = Warden.objects.filter(hostel_id=student.hostel_id).values_list('user_id', flat=True)
+    bump_dashboard_versions(
+        'dean', f'user:{student.user_id}',
+        *(f'user:{user_id}' for user_id in warden_users)
+    )
+
+
+@receiver(post_delete, sender=BonafideRequest)
+def request_deleted(sender, instance, **kwargs):
+    Tombstone.objects.create(
+        model=BonafideRequest._meta.label_lower,
+        object_id=instance.pk,
+        student_id=instance.student_id,
+        hostel_id=instance.student.hostel_id,
+    )
+    apply_counts(
+        instance.student.hostel_id,
+        {key: -n for key, n in request_contributions(instance).items()}
+    )
+    remove_from_rollups(instance)
+    if instance.status == 'dean_approved':
+        refresh_student(instance.student_id)
+
+
+@receiver(pre_save, sender=BonafideSettings)
+def remember_cooldown(sender, instance, **kwargs):
+    instance._previous_cooldown = (
+        BonafideSettings.objects.filter(pk=instance.pk).values_list('cooldown_period', flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=BonafideSettings)
+def cooldown_changed(sender, instance, **kwargs):
+    if getattr(instance, '_previous_cooldown', None) != instance.cooldown_period:
+        apply_cooldown(instance.get_cooldown_days())
+
+
+@receiver(post_save, sender=Student)
+def student_hostel_changed(sender, instance, created, **kwargs):
+    # _previous_hostel_id is set by students.signals.remember_student_hostel
+    previous = getattr(instance, '_previous_hostel_id', None)
+    if not created and previous != instance.hostel_id:
+        move_student(instance.pk, previous, instance.hostel_id)
+        requests = BonafideRequest.objects.filter(student=instance)
+        if previous is not None:
+            Tombstone.objects.bulk_create(
+                Tombstone(model=BonafideRequest._meta.label_lower, object_id=pk,
+                          student_id=instance.pk, hostel_id=previous)
+                for pk in requests.values_list('pk', flat=True)
+            )
+        # Bring the requests into the new hostel's delta sync
+        requests.update(updated_at=timezone.now())
+
+
+@receiver([post_save, post_delete], sender=BonafideSettings)
+@receiver([post_save, post_delete], sender=AcademicYear)
+@receiver([post_save, post_delete], sender=Department)
+@receiver([post_save, post_delete], sender=Hostel)
+def shared_data_changed(sender, **kwargs):
+    # Settings and academic year are on every dashboard; department and
+    # hostel names appear in profiles. All of these change rarely.
+    bump_dashboard_versions('global')
+
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def user_changed(sender, instance, **kwargs):
+    bump_dashboard_versions(f'user:{instance.pk}')
+
+
+@receiver([post_save, post_delete], sender=Student)
+@receiver([post_save, post_delete], sender=Warden)
+@receiver([post_save, post_delete], sender=DeanProfile)
+def profile_changed(sender, instance, **kwargs):
+    bump_dashboard_versions(f'user:{instance.user_id}')
@@ -0,0 +1,174 @@
+"""SLA tracking for requests waiting on a review.
+
+A request is waiting on the warden while it is ``pending``, counted from
+``created_at``. It is waiting on the dean while it is ``warden_approved``,
+counted from ``warden_review_date``. run_sla_pass() is run periodically by
+``manage.py escalate_stale_requests``. Each pass does two things:
+
+* It escalates every request that has waited longer than its stage's
+  threshold. The request's ``escalated_at`` is stamped and the dean is sent
+  one digest email. A request escalated with the warden can be escalated
+  again with the dean, because an escalation counts only if it is later
+  than the request's entry into its current state.
+* It records ``warden_duration`` and ``dean_duration`` on requests that
+  left a stage since the previous pass. SLA reports then aggregate stored
+  durations instead of recomputing them.
+
+Both steps are UPDATEs over indexed ranges, so a pass runs a fixed number
+of queries however many requests are open. UPDATEs skip the model
+signals, so the cached dashboards of everyone who sees the changed
+requests are bumped explicitly; request fragments and delta sync follow
+the bumped ``updated_at``.
+"""
+
+import operator
+from datetime import timedelta
+from functools import reduce
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Case, Count, DurationField, ExpressionWrapper, F, Min, Q, When
+from django.utils import timezone
+from accounts.models import User
+from .dashboard import bump_request_scopes
+from .models import BonafideRequest, JobCheckpoint
+from .notifications import queue_notification
+
+CHECKPOINT = 'request_sla'
+# Seconds the watermark trails the clock, for transactions still committing
+WATERMARK_LAG = 5
+# Requests listed by name in an escalation email; the rest are summarised
+DIGEST_ROWS = 25
+
+# Waiting status -> (field holding when it entered that status, threshold setting, who it waits on)
+STAGES = {
+    'pending': ('created_at', 'BONAFIDE_SLA_WARDEN_HOURS', 'warden'),
+    'warden_approved': ('warden_review_date', 'BONAFIDE_SLA_DEAN_HOURS', 'dean'),
+}
+
+# Stored duration -> (field set when the stage ended, field set when it began, its waiting status)
+DURATIONS = {
+    'warden_duration': ('warden_review_date', 'created_at', 'pending'),
+    'dean_duration': ('dean_review_date', 'warden_review_date', 'warden_approved'),
+}
+
+
+def threshold(status):
+    return timedelta(hours=getattr(settings, STAGES[status][1]))
+
+
+def waiting(status, now):
+    """Requests in `status` that have waited longer than its threshold."""
+    entered = STAGES[status][0]
+    return BonafideRequest.objects.filter(status=status, **{f'{entered}__lt': now - threshold(status)})
+
+
+def escalated_in_state(status):
+    # Escalated since entering the current status
+    return Q(escalated_at__gte=F(STAGES[status][0]))
+
+
+def escalate(now):
+    """Stamp newly stale requests and queue the dean's digest; returns {status: count}."""
+    escalated = {}
+    lines = []
+    for status, (entered, setting, waits_on) in STAGES.items():
+        hours = getattr(settings, setting)
+        count = waiting(status, now).exclude(escalated_in_state(status)).update(
+            escalated_at=now, updated_at=now
+        )
+        if not count:
+            continue
+        escalated[status] = count
+
+        batch = BonafideRequest.objects.filter(status=status, escalated_at=now)
+        bump_request_scopes(batch)
+        hostels = batch.values('student__hostel__name').annotate(count=Count('id')).order_by('-count')
+        lines.append(
+            f'{count} request(s) waiting on the {waits_on} for over {hours} hours: '
+            + ', '.join(f"{row['student__hostel__name']} ({row['count']})" for row in hostels)
+        )
+        oldest = batch.order_by(entered).values(
+            'request_id', 'student__register_number', 'student__name', entered
+        )[:DIGEST_ROWS]
+        for row in oldest:
+            days = (now - row[entered]).days
+            lines.append(
+                f"  - {row['student__register_number']} {row['student__name']}: "
+                f"{days} day(s), request {row['request_id']}"
+            )
+        if count > DIGEST_ROWS:
+            lines.append(f'  ... and {count - DIGEST_ROWS} more')
+
+    if lines:
+        deans = User.objects.filter(role='dean', is_active=True, email__isnull=False)
+        for email in deans.values_list('email', flat=True):
+            queue_notification(
+                'escalation', email, None, f'escalation:{now.isoformat()}',
+                f'{sum(escalated.values())} bonafide request(s) escalated', '\n'.join(lines)
+            )
+    return escalated
+
+
+def record_durations(upper):
+    """Store stage durations on requests changed since the checkpoint; returns rows updated."""
+    checkpoint, _ = JobCheckpoint.objects.get_or_create(name=CHECKPOINT)
+    checkpoint = JobCheckpoint.objects.select_for_update().get(pk=checkpoint.pk)
+    changed = BonafideRequest.objects.filter(updated_at__lte=upper)
+    if checkpoint.watermark is not None:
+        changed = changed.filter(updated_at__gt=checkpoint.watermark)
+
+    # One UPDATE for both durations: bumping updated_at takes a row out of `changed`
+    missing = {
+        field: Q(**{f'{field}__isnull': True, f'{left}__isnull': False, f'{entered}__isnull': False})
+        for field, (left, entered, _) in DURATIONS.items()
+    }
+    durations = {
+        field: Case(
+            When(missing[field], then=ExpressionWrapper(F(left) - F(entered), output_field=DurationField())),
+            default=F(field),
+        )
+        for field, (left, entered, _) in DURATIONS.items()
+    }
+    incomplete = changed.filter(reduce(operator.or_, missing.values()))
+    bump_request_scopes(incomplete)
+    updated = incomplete.update(**durations, updated_at=timezone.now())
+    checkpoint.watermark = upper
+    checkpoint.save()
+    return updated
+
+
+def run_sla_pass():
+    """Escalate stale requests and record durations; returns (escalated by status, durations recorded)."""
+    now = timezone.now()
+    with transaction.atomic():
+        escalated = escalate(now)
+        recorded = record_durations(now - timedelta(seconds=WATERMARK_LAG))
+    return escalated, recorded
+
+
+def sla_summary(since):
+    """Open requests per waiting stage, and stage durations of reviews since `since`."""
+    now = timezone.now()
+    summary = {'open': {}, 'completed': {}}
+    for status, (entered, _, waits_on) in STAGES.items():
+        stats = BonafideRequest.objects.filter(status=status).aggregate(
+            open=Count('id'),
+            breached=Count('id', filter=Q(**{f'{entered}__lt': now - threshold(status)})),
+            escalated=Count('id', filter=escalated_in_state(status)),
+            oldest=Min(entered),
+        )
+        oldest = stats.pop('oldest')
+        stats['oldest_hours'] = round((now - oldest).total_seconds() / 3600, 1) if oldest else None
+        stats['threshold_hours'] = threshold(status).total_seconds() / 3600
+        summary['open'][waits_on] = stats
+
+    for field, (left, _, status) in DURATIONS.items():
+        stats = BonafideRequest.objects.filter(**{f'{left}__gte': since, f'{field}__isnull': False}).aggregate(
+            reviewed=Count('id'),
+            breached=Count('id', filter=Q(**{f'{field}__gt': threshold(status)})),
+            mean=Avg(field),
+        )
+        mean = stats.pop('mean')
+        stats['mean_hours'] = round(mean.total_seconds() / 3600, 1) if mean else None
+        summary['completed'][STAGES[status][2]] = stats
+    return summary
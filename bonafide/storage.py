@@ -0,0 +1,170 @@
+"""Content-addressed, deduplicating file storage for bonafide media."""
+
+import errno
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.utils.functional import cached_property
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 64 * 1024
+# os.link() errors meaning "no hard link possible here" rather than a real failure
+LINK_UNSUPPORTED = {errno.EXDEV, errno.EPERM, errno.EMLINK, errno.ENOTSUP}
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """Filesystem storage that keeps a single blob per unique content.
+
+    Blobs live under ``<blob_dir>/<aa>/<bb>/<sha256>``. Every saved name is a
+    hard link to its blob, so the file system's link count is the reference
+    count: saving content we already hold only adds a link, and a blob is
+    removed once the last name pointing at it is deleted. Content is hashed
+    before anything is written, so a duplicate upload costs a read and a
+    link, never a write or fsync. On file systems that refuse hard links a
+    name is a private copy instead, which saves no space at all (a warning
+    is logged), and the blob is dropped as soon as no linked name remains.
+    Names, URLs and ``open()`` behave exactly as with ``FileSystemStorage``.
+    """
+
+    def __init__(self, blob_dir='.blobs', shard_depth=2, shard_width=2, shard_names=False, **kwargs):
+        super().__init__(**kwargs)
+        self.blob_dir = blob_dir
+        self.shard_depth = shard_depth
+        self.shard_width = shard_width
+        self.shard_names = shard_names
+        self.warned_copy = False
+
+    @cached_property
+    def blob_root(self):
+        return os.path.join(self.location, self.blob_dir)
+
+    def blob_path(self, digest):
+        """Absolute path of the blob holding content with the given SHA-256."""
+        shards = [
+            digest[i * self.shard_width:(i + 1) * self.shard_width]
+            for i in range(self.shard_depth)
+        ]
+        return os.path.join(self.blob_root, *shards, digest)
+
+    def _hash(self, content):
+        hasher = hashlib.sha256()
+        content.seek(0)
+        for chunk in content.chunks(HASH_CHUNK_SIZE):
+            hasher.update(chunk)
+        return hasher.hexdigest()
+
+    def _store_blob(self, content, reuse=True):
+        """Write content to the blob store atomically and return its digest."""
+        digest = getattr(content, 'sha256', None)
+        if digest is None and reuse and hasattr(content, 'seek'):
+            # Uploads are in memory or a temporary file; reading them is cheaper than a write and fsync
+            digest = self._hash(content)
+        if reuse and digest and os.path.exists(self.blob_path(digest)):
+            return digest
+
+        os.makedirs(self.blob_root, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.blob_root, prefix='.upload-')
+        try:
+            hasher = hashlib.sha256()
+            with os.fdopen(fd, 'wb') as temp_file:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks(HASH_CHUNK_SIZE):
+                    hasher.update(chunk)
+                    temp_file.write(chunk)
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+
+            digest = hasher.hexdigest()
+            blob = self.blob_path(digest)
+            if not os.path.exists(blob):
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(temp_path, self.file_permissions_mode)
+                # Atomic rename; a concurrent writer of the same blob has identical bytes
+                os.replace(temp_path, blob)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        return digest
+
+    def _link_or_copy(self, blob, full_path):
+        try:
+            os.link(blob, full_path)
+        except (FileExistsError, FileNotFoundError):
+            raise
+        except OSError as exc:
+            if exc.errno not in LINK_UNSUPPORTED:
+                raise
+            # File system without hard links (or across devices): fall back to a private copy
+            if not self.warned_copy:
+                self.warned_copy = True
+                logger.warning('Hard links unavailable under %s (%s); media is stored without deduplication',
+                               self.location, os.strerror(exc.errno))
+            shutil.copyfile(blob, full_path)
+
+    def _save(self, name, content):
+        digest = self._store_blob(content)
+
+        if self.shard_names:
+            directory, basename = os.path.split(name)
+            name = self.get_available_name(os.path.join(directory, digest[:self.shard_width], basename))
+
+        while True:
+            full_path = self.path(name)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            try:
+                self._link_or_copy(self.blob_path(digest), full_path)
+            except FileExistsError:
+                # Another upload claimed the name between get_available_name() and now
+                name = self.get_available_name(name)
+                continue
+            except FileNotFoundError:
+                # delete() removed the blob after _store_blob() found it; write it again
+                digest = self._store_blob(content, reuse=False)
+                continue
+            break
+
+        return str(name).replace('\\', '/')
+
+    def delete(self, name):
+        if not name:
+            raise ValueError('The name must be given to delete().')
+        full_path = self.path(name)
+        try:
+            blob = self.blob_path(self.content_hash(name))
+        except FileNotFoundError:
+            return
+        os.remove(full_path)
+
+        try:
+            # A private copy (see _save) shares no inode with its blob, so a
+            # blob left with only its own link is unreferenced either way
+            if os.stat(blob).st_nlink == 1:
+                os.remove(blob)
+        except FileNotFoundError:
+            pass
+
+    def content_hash(self, name):
+        """SHA-256 of a stored file."""
+        hasher = hashlib.sha256()
+        with open(self.path(name), 'rb') as stored:
+            for chunk in iter(lambda: stored.read(HASH_CHUNK_SIZE), b''):
+                hasher.update(chunk)
+        return hasher.hexdigest()
+
+
+media_storage = ContentAddressedStorage(
+    shard_depth=settings.BONAFIDE_BLOB_SHARD_DEPTH,
+    shard_names=settings.BONAFIDE_SHARD_UPLOAD_NAMES,
+)
+
+
+def get_media_storage():
+    """Storage used by BonafideRequest file fields."""
+    return media_storage
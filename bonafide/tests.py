@@ -0,0 +1,835 @@
+import errno
+import hashlib
+import io
+import os
+import tempfile
+import time
+import uuid
+import zipfile
+from datetime import date, timedelta
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import mail
+from django.core.cache import caches
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from PIL import Image
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+from accounts.models import User
+from audit.models import AuditLog, IdempotencyRecord
+from hostels.models import Hostel, Warden
+from students.models import AcademicYear, Department, Student
+from bonafide.management.commands.explain_request_filters import check_plans
+from bonafide.models import (
+    AttachmentUpload, BonafideRequest, BonafideSettings, EmailNotification, IssuanceRollup, OutboxEvent,
+    RequestCounter, RequestEvent, StudentEligibility,
+)
+from bonafide.serializers import CreateBonafideRequestSerializer
+from bonafide.attachments import optimise_attachment
+from bonafide.counters import period_of, rebuild_counters
+from bonafide.events import authenticate_stream, make_stream_ticket, stream_events
+from bonafide.handlers import write_audit_log
+from bonafide.outbox import HANDLERS, claim, dispatch, drain, publish
+from bonafide.rollups import refresh_rollups
+from bonafide.sla import run_sla_pass
+from bonafide.storage import ContentAddressedStorage
+
+
+def media_files():
+    return {os.path.join(root, name) for root, _, names in os.walk(settings.MEDIA_ROOT) for name in names}
+
+
+@override_settings(OUTBOX_AUTODISPATCH=False)
+class BonafideTestCase(TestCase):
+    """Two hostels, a dean, a warden on the first hostel and four students (two per hostel)."""
+
+    @classmethod
+    def setUpClass(cls):
+        media = tempfile.TemporaryDirectory()
+        cls.addClassCleanup(media.cleanup)
+        media_root = override_settings(MEDIA_ROOT=media.name, BONAFIDE_UPLOAD_TEMP_DIR=os.path.join(media.name, '.uploads'))
+        media_root.enable()
+        cls.addClassCleanup(media_root.disable)
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(code='CSE', name='Computer Science')
+        cls.hostel = Hostel.objects.create(name='H1', code='H1', hostel_type='boys', capacity=100)
+        cls.other_hostel = Hostel.objects.create(name='H2', code='H2', hostel_type='girls', capacity=100)
+        cls.dean = User.objects.create_user('dean', password='x', role='dean', email='dean@example.com')
+        cls.warden = User.objects.create_user('warden', password='x', role='warden', email='warden@example.com')
+        Warden.objects.create(user=cls.warden, hostel=cls.hostel, name='Warden', phone_number='1',
+                              email='warden@example.com')
+        cls.students = [cls.make_student(n, cls.hostel if n % 2 == 0 else cls.other_hostel) for n in range(4)]
+
+    @classmethod
+    def make_student(cls, n, hostel):
+        user = User.objects.create_user(f'student{n}', password='x', role='student', email=f's{n}@example.com')
+        return Student.objects.create(
+            user=user, register_number=f'R{n:04d}', name=f'Student {n}', date_of_birth=date(2004, 1, 1),
+            gender='M', department=cls.department, degree='BE', current_year=1, admission_year=2024,
+            graduation_year=2028, hostel=hostel, email=f's{n}@example.com',
+        )
+
+    def setUp(self):
+        caches['fragments'].clear()
+
+    def issue(self, student, pdf=b'%PDF-1.4 certificate', **fields):
+        """An approved request with a stored certificate file."""
+        bonafide_request = BonafideRequest.objects.create(
+            student=student, reason='visa', status='dean_approved', dean_review_date=timezone.now(),
+            certificate_issued_date=timezone.now(), **fields
+        )
+        bonafide_request.certificate_number = f'BC/{bonafide_request.pk:04d}'
+        bonafide_request.certificate_file.save(f'cert_{bonafide_request.pk}.pdf', ContentFile(pdf))
+        return bonafide_request
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+
+@skipUnless(connection.vendor in ('postgresql', 'sqlite'), 'query plans are only checked on PostgreSQL and SQLite')
+class RequestFilterPlanTests(TestCase):
+    """Every request list filter is served by an index (see explain_request_filters)."""
+
+    def test_filters_use_indexes(self):
+        for scope, name, scans in check_plans():
+            with self.subTest(scope=scope, filter=name):
+                self.assertEqual(scans, [])
+
+
+class EligibilityTests(BonafideTestCase):
+
+    def approve(self, student):
+        bonafide_request = BonafideRequest.objects.create(student=student, reason='visa', status='warden_approved')
+        return self.client_for(self.dean).post(
+            f'/api/bonafide/review/dean/{bonafide_request.request_id}/', {'action': 'approve'}, format='json'
+        )
+
+    def test_dean_approval_response_shows_new_cooldown(self):
+        student = self.students[0]
+        BonafideRequest.objects.create(student=student, reason='other', status='dean_rejected')
+        # Cache the student's fragment, as the dean sees it, at its current updated_at
+        self.client_for(self.dean).get('/api/bonafide/requests/all/')
+        response = self.approve(student)
+        self.assertEqual(response.status_code, 200)
+        eligibility = StudentEligibility.objects.get(student=student)
+        self.assertIsNotNone(eligibility.next_eligible_at)
+        self.assertEqual(response.data['student_details']['next_eligible_at'],
+                         timezone.localtime(eligibility.next_eligible_at).isoformat())
+
+    def test_cooldown_blocks_new_request(self):
+        student = self.students[0]
+        self.approve(student)
+        response = self.client_for(student.user).post(
+            '/api/bonafide/request/create/', {'reason': 'other'}, format='json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_cooldown_change_recomputes_rows(self):
+        student = self.students[0]
+        self.approve(student)
+        eligibility = StudentEligibility.objects.get(student=student)
+        bonafide_settings = BonafideSettings.get_settings()
+        bonafide_settings.cooldown_period = '1_month'
+        bonafide_settings.save()
+        eligibility.refresh_from_db()
+        self.assertEqual(eligibility.next_eligible_at - eligibility.last_approved_at, timedelta(days=30))
+        bonafide_settings.cooldown_period = 'disabled'
+        bonafide_settings.save()
+        eligibility.refresh_from_db()
+        self.assertIsNone(eligibility.next_eligible_at)
+
+    def test_deleting_last_approval_clears_row(self):
+        student = self.students[0]
+        self.approve(student)
+        BonafideRequest.objects.filter(student=student).delete()
+        self.assertFalse(StudentEligibility.objects.filter(student=student).exists())
+
+
+class ExportTests(BonafideTestCase):
+    url = '/api/bonafide/export/certificates/'
+
+    def setUp(self):
+        super().setUp()
+        for n, student in enumerate(self.students):
+            self.issue(student, pdf=b'%PDF-1.4 ' + bytes([n]) * 5000)
+
+    def export(self, query='', **headers):
+        response = self.client_for(self.dean).get(self.url + query, **headers)
+        body = b''.join(response.streaming_content) if response.streaming else response.content
+        return response, body
+
+    def test_archive_matches_content_length(self):
+        response, body = self.export()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(int(response['Content-Length']), len(body))
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(len(archive.namelist()), len(self.students) + 1)
+
+    def test_archive_is_identical_between_downloads(self):
+        first, first_body = self.export()
+        second, second_body = self.export()
+        self.assertEqual(first['ETag'], second['ETag'])
+        self.assertEqual(first_body, second_body)
+
+    def test_ranges_reassemble_the_archive(self):
+        full, body = self.export()
+        split = len(body) // 3
+        head, head_body = self.export(HTTP_RANGE=f'bytes=0-{split - 1}')
+        tail, tail_body = self.export(HTTP_RANGE=f'bytes={split}-')
+        self.assertEqual((head.status_code, tail.status_code), (206, 206))
+        self.assertEqual(tail['Content-Range'], f'bytes {split}-{len(body) - 1}/{len(body)}')
+        self.assertEqual(head_body + tail_body, body)
+        suffix, suffix_body = self.export(HTTP_RANGE='bytes=-100')
+        self.assertEqual(suffix_body, body[-100:])
+
+    def test_unsatisfiable_range(self):
+        _, body = self.export()
+        response, _ = self.export(HTTP_RANGE=f'bytes={len(body)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(body)}')
+
+    def test_stale_if_range_sends_whole_archive(self):
+        response, body = self.export(HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(int(response['Content-Length']), len(body))
+
+    def test_filters(self):
+        response, body = self.export(f'?hostel={self.hostel.pk}')
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            self.assertEqual(len(archive.namelist()), 3)  # two certificates and the manifest
+
+    def test_invalid_ids_are_rejected(self):
+        for query in ('?hostel=abc', '?department=x', '?hostel=%C2%B2', '?month=2025-13'):
+            with self.subTest(query=query):
+                response, _ = self.export(query)
+                self.assertEqual(response.status_code, 400)
+
+
+class ContentAddressedStorageTests(SimpleTestCase):
+
+    def setUp(self):
+        location = tempfile.TemporaryDirectory()
+        self.addCleanup(location.cleanup)
+        self.storage = ContentAddressedStorage(location=location.name)
+
+    def blobs(self):
+        return [name for _, _, names in os.walk(self.storage.blob_root) for name in names]
+
+    def test_duplicates_share_one_blob(self):
+        first = self.storage.save('a.pdf', ContentFile(b'same'))
+        second = self.storage.save('b.pdf', ContentFile(b'same'))
+        self.assertNotEqual(first, second)
+        self.assertEqual(len(self.blobs()), 1)
+        self.assertTrue(os.path.samefile(self.storage.path(first), self.storage.path(second)))
+        self.assertEqual(self.storage.open(second).read(), b'same')
+
+    def test_duplicate_upload_is_not_written(self):
+        self.storage.save('a.pdf', ContentFile(b'same'))
+        with mock.patch('bonafide.storage.os.fsync') as fsync, mock.patch('bonafide.storage.tempfile.mkstemp') as mkstemp:
+            self.storage.save('b.pdf', SimpleUploadedFile('b.pdf', b'same'))
+        fsync.assert_not_called()
+        mkstemp.assert_not_called()
+
+    def test_blob_removed_with_last_name(self):
+        first = self.storage.save('a.pdf', ContentFile(b'data'))
+        second = self.storage.save('b.pdf', ContentFile(b'data'))
+        self.storage.delete(first)
+        self.assertEqual(len(self.blobs()), 1)
+        self.storage.delete(second)
+        self.assertEqual(self.blobs(), [])
+        self.storage.delete(second)  # already gone
+
+    def test_copy_fallback_without_hard_links(self):
+        with mock.patch('bonafide.storage.os.link', side_effect=OSError(errno.EXDEV, 'cross-device')):
+            with self.assertLogs('bonafide.storage', 'WARNING'):
+                name = self.storage.save('a.pdf', ContentFile(b'data'))
+        self.assertEqual(self.storage.open(name).read(), b'data')
+        self.storage.delete(name)
+        self.assertEqual(self.blobs(), [])
+
+    def test_other_link_errors_are_raised(self):
+        with mock.patch('bonafide.storage.os.link', side_effect=OSError(errno.EIO, 'I/O error')):
+            with self.assertRaises(OSError):
+                self.storage.save('a.pdf', ContentFile(b'data'))
+
+    def test_blob_deleted_during_save_is_written_again(self):
+        self.storage.save('a.pdf', ContentFile(b'data'))
+        blob = self.storage.blob_path(hashlib.sha256(b'data').hexdigest())
+        link = os.link
+
+        def link_after_delete(source, target):
+            if os.path.exists(blob) and source == blob and not link_after_delete.raced:
+                link_after_delete.raced = True
+                os.remove(blob)
+            return link(source, target)
+        link_after_delete.raced = False
+        with mock.patch('bonafide.storage.os.link', side_effect=link_after_delete):
+            name = self.storage.save('b.pdf', ContentFile(b'data'))
+        self.assertEqual(self.storage.open(name).read(), b'data')
+
+
+class ChunkedUploadTests(BonafideTestCase):
+    body = b'%PDF-1.4 ' + b'x' * 2500
+
+    def setUp(self):
+        super().setUp()
+        self.student = self.students[0]
+        self.client = self.client_for(self.student.user)
+
+    def start(self, size=None):
+        response = self.client.post('/api/bonafide/uploads/', {
+            'filename': 'proof.pdf', 'content_type': 'application/pdf', 'size': size or len(self.body),
+        }, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return f"/api/bonafide/uploads/{response.data['upload_id']}/", response.data['upload_id']
+
+    def put(self, url, offset, data):
+        return self.client.generic('PUT', f'{url}?offset={offset}', data, content_type='application/octet-stream')
+
+    def upload(self, chunk=1000):
+        url, upload_id = self.start()
+        for offset in range(0, len(self.body), chunk):
+            response = self.put(url, offset, self.body[offset:offset + chunk])
+            self.assertEqual(response.status_code, 200, response.data)
+        response = self.client.post(f'{url}complete/', {'sha256': hashlib.sha256(self.body).hexdigest()}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        return upload_id
+
+    def test_chunks_resume_and_attach(self):
+        upload_id = self.upload()
+        response = self.client.post('/api/bonafide/request/create/', {'reason': 'other', 'upload_id': upload_id},
+                                    format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        bonafide_request = BonafideRequest.objects.get(student=self.student)
+        self.assertEqual(bonafide_request.attachment.read(), self.body)
+        upload = AttachmentUpload.objects.get(upload_id=upload_id)
+        self.assertEqual(upload.status, 'attached')
+        self.assertFalse(os.path.exists(upload.temp_path))
+
+    def test_wrong_offset_reports_current_one(self):
+        url, _ = self.start()
+        self.put(url, 0, self.body[:1000])
+        response = self.put(url, 500, self.body[500:1500])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['offset'], 1000)
+        self.assertEqual(self.client.get(url).data['offset'], 1000)
+
+    def test_chunk_past_declared_size(self):
+        url, _ = self.start(size=10)
+        self.assertEqual(self.put(url, 0, b'x' * 11).status_code, 413)
+
+    def test_incomplete_or_corrupt_upload_cannot_complete(self):
+        url, _ = self.start()
+        self.put(url, 0, self.body[:1000])
+        self.assertEqual(self.client.post(f'{url}complete/', {}, format='json').status_code, 409)
+        self.put(url, 1000, self.body[1000:])
+        response = self.client.post(f'{url}complete/', {'sha256': '0' * 64}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_upload_used_twice_is_rejected(self):
+        upload_id = self.upload()
+        request = SimpleNamespace(user=self.student.user)
+        serializers = [
+            CreateBonafideRequestSerializer(data={'reason': 'other', 'upload_id': upload_id},
+                                            context={'request': request})
+            for _ in range(2)
+        ]
+        # Both validate before either attaches, as two concurrent creates would
+        for serializer in serializers:
+            self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializers[0].save(student=self.student)
+        with self.assertRaises(ValidationError):
+            serializers[1].save(student=self.student)
+
+
+@override_settings(BONAFIDE_KEEP_ORIGINAL_ATTACHMENTS=False, BONAFIDE_ATTACHMENT_REVIEW_SIZE=200,
+                   BONAFIDE_ATTACHMENT_THUMBNAIL_SIZE=50)
+class AttachmentOptimisationTests(BonafideTestCase):
+
+    def with_attachment(self, name, data):
+        bonafide_request = BonafideRequest(student=self.students[0], reason='other')
+        bonafide_request.attachment.save(name, ContentFile(data), save=False)
+        bonafide_request.save()
+        return bonafide_request
+
+    def png(self, size):
+        buffer = io.BytesIO()
+        Image.effect_noise(size, 64).convert('RGB').save(buffer, 'PNG')
+        return buffer.getvalue()
+
+    def test_image_is_resized_with_thumbnail(self):
+        bonafide_request = self.with_attachment('scan.png', self.png((800, 600)))
+        updated_at = bonafide_request.updated_at
+        self.assertTrue(optimise_attachment(bonafide_request))
+        bonafide_request.refresh_from_db()
+        self.assertTrue(bonafide_request.attachment.name.endswith('.jpg'))
+        with Image.open(bonafide_request.attachment) as review, Image.open(bonafide_request.attachment_thumbnail) as thumb:
+            self.assertEqual(max(review.size), 200)
+            self.assertEqual(max(thumb.size), 50)
+        self.assertGreater(bonafide_request.updated_at, updated_at)
+        self.assertFalse(optimise_attachment(bonafide_request))  # already processed
+
+    def test_non_image_is_only_marked(self):
+        bonafide_request = self.with_attachment('proof.pdf', b'%PDF-1.4 proof')
+        self.assertFalse(optimise_attachment(bonafide_request))
+        bonafide_request.refresh_from_db()
+        self.assertIsNotNone(bonafide_request.attachment_processed_at)
+        self.assertEqual(bonafide_request.attachment.read(), b'%PDF-1.4 proof')
+
+    def test_decompression_bomb_is_only_marked(self):
+        bonafide_request = self.with_attachment('huge.png', self.png((300, 300)))
+        with mock.patch.object(Image, 'MAX_IMAGE_PIXELS', 100):
+            self.assertFalse(optimise_attachment(bonafide_request))
+        bonafide_request.refresh_from_db()
+        self.assertIsNotNone(bonafide_request.attachment_processed_at)
+        self.assertTrue(bonafide_request.attachment.name.endswith('.png'))
+
+    def test_already_processed_elsewhere_discards_new_files(self):
+        bonafide_request = self.with_attachment('scan.png', self.png((800, 600)))
+        BonafideRequest.objects.filter(pk=bonafide_request.pk).update(attachment_processed_at=timezone.now())
+        before = media_files()
+        self.assertFalse(optimise_attachment(bonafide_request))
+        self.assertEqual(media_files(), before)
+
+
+class DashboardTests(BonafideTestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Create the singletons up front; their first save bumps 'global'
+        BonafideSettings.get_settings()
+        AcademicYear.get_current()
+        caches['default'].clear()
+        caches['shared'].clear()
+
+    def total(self, user):
+        return self.client_for(user).get('/api/bonafide/dashboard/').data['requests']['total']
+
+    def add_request(self, student):
+        with self.captureOnCommitCallbacks(execute=True):
+            BonafideRequest.objects.create(student=student, reason='visa')
+
+    def test_write_invalidates_affected_dashboards(self):
+        student = self.students[0]
+        self.assertEqual((self.total(student.user), self.total(self.warden), self.total(self.dean)), (0, 0, 0))
+        self.add_request(student)
+        self.assertEqual((self.total(student.user), self.total(self.warden), self.total(self.dean)), (1, 1, 1))
+
+    def test_bump_waits_for_commit(self):
+        student = self.students[0]
+        self.total(student.user)
+        key = f'dashboard:version:user:{student.user_id}'
+        version = caches['shared'].get(key)
+        with self.captureOnCommitCallbacks(execute=True):
+            BonafideRequest.objects.create(student=student, reason='visa')
+            self.assertEqual(caches['shared'].get(key), version)
+        self.assertNotEqual(caches['shared'].get(key), version)
+
+    def test_evicted_version_is_not_reused(self):
+        student = self.students[0]
+        self.total(student.user)
+        self.add_request(student)
+        self.assertEqual(self.total(student.user), 1)
+        caches['shared'].clear()
+        self.add_request(student)
+        self.assertEqual(self.total(student.user), 2)
+
+
+@override_settings(REQUEST_EVENTS_POLL_INTERVAL=0, REQUEST_EVENTS_KEEPALIVE=0)
+class EventStreamTests(BonafideTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.bonafide_request = BonafideRequest.objects.create(student=cls.students[0], reason='visa')
+
+    def add_event(self, status):
+        return RequestEvent.objects.create(kind='created', request=self.bonafide_request,
+                                           student=self.students[0], hostel=self.hostel, status=status)
+
+    def stream_request(self, ticket, **headers):
+        return RequestFactory().get('/api/bonafide/events/', {'ticket': ticket}, headers=headers)
+
+    def test_ticket_expires_for_new_streams_only(self):
+        issued = time.time()
+        ticket = make_stream_ticket(self.warden)
+        with mock.patch('time.time', return_value=issued + settings.REQUEST_EVENTS_TICKET_TTL + 1):
+            self.assertIsNone(authenticate_stream(self.stream_request(ticket)))
+            self.assertEqual(authenticate_stream(self.stream_request(ticket, last_event_id='3')), self.warden)
+        with mock.patch('time.time', return_value=issued + settings.REQUEST_EVENTS_RECONNECT_TTL + 1):
+            self.assertIsNone(authenticate_stream(self.stream_request(ticket, last_event_id='3')))
+
+    async def test_late_commit_is_delivered_once(self):
+        # Events only become visible to the stream once their status is
+        # 'committed', standing in for a transaction that commits late
+        queryset = RequestEvent.objects.filter(status='committed')
+        stream = stream_events(queryset, 0)
+        self.assertIn('id: 0', await anext(stream))
+        late = await sync_to_async(self.add_event)('pending')
+        early = await sync_to_async(self.add_event)('committed')
+        self.assertIn(f'id: {early.pk}\n', await anext(stream))
+        await RequestEvent.objects.filter(pk=late.pk).aupdate(status='committed')
+        self.assertIn(f'id: {late.pk}\n', await anext(stream))
+        self.assertEqual(await anext(stream), ': keepalive\n\n')
+        await stream.aclose()
+
+
+@override_settings(SYNC_WATERMARK_LAG=0)
+class DeltaSyncTests(BonafideTestCase):
+
+    def sync(self, user, url, since=None):
+        response = self.client_for(user).get(url, {'since': since} if since else {})
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_student_leaving_hostel_is_dropped_by_old_warden(self):
+        student = self.students[0]
+        bonafide_request = BonafideRequest.objects.create(student=student, reason='visa')
+        requests_url, students_url = '/api/bonafide/requests/changes/', '/api/students/changes/'
+        warden_requests = self.sync(self.warden, requests_url)['watermark']
+        warden_students = self.sync(self.warden, students_url)['watermark']
+        dean_requests = self.sync(self.dean, requests_url)['watermark']
+
+        student.hostel = self.other_hostel
+        student.save()
+
+        self.assertEqual(self.sync(self.warden, requests_url, warden_requests)['deleted'], [bonafide_request.pk])
+        self.assertEqual(self.sync(self.warden, students_url, warden_students)['deleted'], [student.pk])
+        # Still in the dean's scope: updated, not deleted
+        data = self.sync(self.dean, requests_url, dean_requests)
+        self.assertEqual(data['deleted'], [])
+        self.assertEqual([row['id'] for row in data['changed']], [bonafide_request.pk])
+
+    def test_deleted_request_is_reported(self):
+        bonafide_request = BonafideRequest.objects.create(student=self.students[0], reason='visa')
+        watermark = self.sync(self.dean, '/api/bonafide/requests/changes/')['watermark']
+        pk = bonafide_request.pk
+        bonafide_request.delete()
+        data = self.sync(self.dean, '/api/bonafide/requests/changes/', watermark)
+        self.assertEqual(data['deleted'], [pk])
+
+
+class CounterTests(BonafideTestCase):
+
+    def snapshot(self):
+        return set(RequestCounter.objects.filter(count__gt=0).values_list('hostel_id', 'status', 'period', 'count'))
+
+    def assertMatchesRebuild(self):
+        counted = self.snapshot()
+        rebuild_counters()
+        self.assertEqual(counted, self.snapshot())
+
+    def review(self, user, role, bonafide_request, action='approve'):
+        response = self.client_for(user).post(
+            f'/api/bonafide/review/{role}/{bonafide_request.request_id}/', {'action': action, 'remarks': 'ok'},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def create(self, student):
+        response = self.client_for(student.user).post('/api/bonafide/request/create/', {'reason': 'visa'}, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return BonafideRequest.objects.get(student=student)
+
+    def test_review_flow_matches_rebuild(self):
+        approved = self.create(self.students[0])
+        rejected = self.create(self.students[2])
+        self.assertMatchesRebuild()
+        self.review(self.warden, 'warden', approved)
+        self.review(self.warden, 'warden', rejected, action='reject')
+        self.review(self.dean, 'dean', approved)
+        self.assertMatchesRebuild()
+
+        counters = self.client_for(self.warden).get('/api/bonafide/counters/').data
+        self.assertEqual([row['hostel_id'] for row in counters['hostels']], [self.hostel.pk])
+        current = counters['totals']['current']
+        self.assertEqual((current['dean_approved'], current['warden_rejected'], current['pending']), (1, 1, 0))
+
+    def test_move_and_delete_match_rebuild(self):
+        student = self.students[0]
+        removed = self.create(student)
+        self.review(self.warden, 'warden', removed)
+        student.hostel = self.other_hostel
+        student.save()
+        self.assertMatchesRebuild()
+        removed.refresh_from_db()
+        removed.delete()
+        self.assertMatchesRebuild()
+
+    def test_invalid_period(self):
+        response = self.client_for(self.dean).get('/api/bonafide/counters/', {'period': '2024-13'})
+        self.assertEqual(response.status_code, 400)
+
+
+@mock.patch('bonafide.rollups.WATERMARK_LAG', 0)
+class IssuanceRollupTests(BonafideTestCase):
+    url = '/api/bonafide/reports/issuance/'
+
+    def rollups(self):
+        return sorted(
+            (rollup.month, rollup.reason, rollup.hostel_id, rollup.issued, rollup.total_seconds, rollup.histogram)
+            for rollup in IssuanceRollup.objects.all()
+        )
+
+    def test_incremental_refresh_matches_full_rebuild(self):
+        self.issue(self.students[0])
+        refresh_rollups()
+        self.issue(self.students[1])
+        removed = self.issue(self.students[2])
+        self.assertEqual(refresh_rollups(), [period_of(timezone.now())])
+        removed.delete()
+        incremental = self.rollups()
+        refresh_rollups(full=True)
+        self.assertEqual(incremental, self.rollups())
+        self.assertEqual(sum(row[3] for row in incremental), 2)
+
+    def test_report_groups_and_filters(self):
+        for student in self.students[:3]:
+            self.issue(student)
+        refresh_rollups()
+        response = self.client_for(self.dean).get(self.url, {'group_by': 'hostel', 'hostel': self.hostel.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(row['hostel'], row['issued']) for row in response.data['results']], [('H1', 2)])
+
+    def test_invalid_filters(self):
+        client = self.client_for(self.dean)
+        for query in ({'hostel': 'abc'}, {'department': '1 OR 1=1'}, {'from': '2024-13'}, {'group_by': 'student'}):
+            with self.subTest(query=query):
+                self.assertEqual(client.get(self.url, query).status_code, 400)
+
+
+class OutboxTests(BonafideTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.first, self.second = (
+            BonafideRequest.objects.create(student=student, reason='visa') for student in self.students[:2]
+        )
+        self.delivered = []
+        handlers = mock.patch.dict(HANDLERS, {'request_created': [self.record]}, clear=True)
+        handlers.start()
+        self.addCleanup(handlers.stop)
+
+    def record(self, event):
+        self.delivered.append(event.pk)
+
+    def publish(self, bonafide_request):
+        return publish('request_created', bonafide_request)
+
+    def test_claim_respects_request_order_and_leases(self):
+        first, later, other = self.publish(self.first), self.publish(self.first), self.publish(self.second)
+        self.assertEqual([event.pk for event in claim(10)], [first.pk, other.pk])
+        # Leased events are not claimed again
+        self.assertEqual(claim(10), [])
+        OutboxEvent.objects.filter(pk=first.pk).update(processed_at=timezone.now())
+        self.assertEqual([event.pk for event in claim(10)], [later.pk])
+
+    def test_failure_blocks_later_events_for_the_request(self):
+        failing, later, other = self.publish(self.first), self.publish(self.first), self.publish(self.second)
+
+        def fail_first(event):
+            if event.pk == failing.pk:
+                raise RuntimeError('boom')
+            self.record(event)
+
+        HANDLERS['request_created'] = [fail_first]
+        with self.assertLogs('bonafide.outbox', 'ERROR'):
+            self.assertEqual(drain(), (1, 1))
+        self.assertEqual(self.delivered, [other.pk])
+        failing.refresh_from_db()
+        later.refresh_from_db()
+        self.assertEqual((failing.attempts, failing.last_error, failing.failed_at), (1, 'RuntimeError: boom', None))
+        self.assertGreater(failing.available_at, timezone.now())
+        self.assertIsNone(later.processed_at)
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=2)
+    def test_failing_event_is_parked(self):
+        event = self.publish(self.first)
+        HANDLERS['request_created'] = [mock.Mock(side_effect=RuntimeError('boom'))]
+        for _ in range(2):
+            with self.assertLogs('bonafide.outbox', 'ERROR'):
+                dispatch()
+            OutboxEvent.objects.filter(pk=event.pk).update(available_at=timezone.now())
+        event.refresh_from_db()
+        self.assertEqual(event.attempts, 2)
+        self.assertIsNotNone(event.failed_at)
+        self.assertEqual(claim(10), [])
+
+    def test_event_taken_over_by_another_dispatcher_is_skipped(self):
+        first, second = self.publish(self.first), self.publish(self.second)
+
+        def steal_second(event):
+            # Another dispatcher claims `second` after this batch's lease on it ran out
+            OutboxEvent.objects.filter(pk=second.pk).update(lock_token=uuid.uuid4())
+            self.record(event)
+
+        HANDLERS['request_created'] = [steal_second]
+        self.assertEqual(dispatch(), (1, 0))
+        self.assertEqual(self.delivered, [first.pk])
+        second.refresh_from_db()
+        self.assertIsNone(second.processed_at)
+
+    def test_redelivered_audit_entry_is_written_once(self):
+        event = publish('request_created', self.first, audit={
+            'user_id': self.students[0].user_id, 'action': 'CREATE_BONAFIDE_REQUEST', 'description': 'Created',
+        })
+        write_audit_log(event)
+        write_audit_log(event)
+        self.assertEqual(AuditLog.objects.filter(outbox_event_id=event.pk).count(), 1)
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend', BONAFIDE_EMAIL_COALESCE_SECONDS=0)
+class EmailNotificationTests(BonafideTestCase):
+
+    def review(self, user, role, bonafide_request):
+        response = self.client_for(user).post(
+            f'/api/bonafide/review/{role}/{bonafide_request.request_id}/', {'action': 'approve'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200, response.data)
+
+    def sent_to(self, address):
+        return [message for message in mail.outbox if message.to == [address]]
+
+    def test_workflow_emails_are_sent_and_coalesced(self):
+        student = self.students[0]
+        response = self.client_for(student.user).post(
+            '/api/bonafide/request/create/', {'reason': 'visa'}, format='json'
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        drain()
+        call_command('send_notifications', stdout=io.StringIO())
+        self.assertEqual([message.subject for message in self.sent_to(student.email)], ['Bonafide request submitted'])
+        self.assertEqual([message.subject for message in self.sent_to('warden@example.com')], ['New bonafide request'])
+
+        mail.outbox.clear()
+        bonafide_request = BonafideRequest.objects.get(student=student)
+        self.review(self.warden, 'warden', bonafide_request)
+        self.review(self.dean, 'dean', bonafide_request)
+        drain()
+        # Delivering the events again must not queue the emails twice
+        OutboxEvent.objects.update(processed_at=None)
+        drain()
+        call_command('send_notifications', stdout=io.StringIO())
+        digest, = self.sent_to(student.email)
+        self.assertRegex(digest.subject, r'^\d updates on bonafide requests$')
+        self.assertIn('approved by your warden', digest.body)
+        self.assertIn('approved by the Dean', digest.body)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_nothing_sent_while_coalescing(self):
+        BonafideRequest.objects.create(student=self.students[0], reason='visa')
+        publish('request_created', BonafideRequest.objects.get())
+        drain()
+        with override_settings(BONAFIDE_EMAIL_COALESCE_SECONDS=60):
+            call_command('send_notifications', stdout=io.StringIO())
+        self.assertEqual(mail.outbox, [])
+
+
+@mock.patch('bonafide.sla.WATERMARK_LAG', 0)
+@override_settings(BONAFIDE_SLA_WARDEN_HOURS=24, BONAFIDE_SLA_DEAN_HOURS=24)
+class SLATests(BonafideTestCase):
+
+    def make_request(self, hours_ago, **fields):
+        bonafide_request = BonafideRequest.objects.create(student=self.students[0], reason='visa', **fields)
+        BonafideRequest.objects.filter(pk=bonafide_request.pk).update(
+            created_at=timezone.now() - timedelta(hours=hours_ago)
+        )
+        bonafide_request.refresh_from_db()
+        return bonafide_request
+
+    def run_pass(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return run_sla_pass()
+
+    def test_stale_requests_are_escalated_once_per_stage(self):
+        stale = self.make_request(30)
+        self.make_request(2)
+        self.assertEqual(self.run_pass()[0], {'pending': 1})
+        stale.refresh_from_db()
+        self.assertIsNotNone(stale.escalated_at)
+        digest = EmailNotification.objects.get(kind='escalation')
+        self.assertEqual(digest.recipient, 'dean@example.com')
+        self.assertIn(self.students[0].register_number, digest.message)
+        self.assertEqual(self.run_pass()[0], {})
+
+        # Waiting on the dean is a new stage, escalated again once it is stale
+        now = timezone.now()
+        BonafideRequest.objects.filter(pk=stale.pk).update(
+            status='warden_approved', escalated_at=now - timedelta(hours=26),
+            warden_review_date=now - timedelta(hours=25)
+        )
+        self.assertEqual(self.run_pass()[0], {'warden_approved': 1})
+
+    def test_escalation_invalidates_dashboards(self):
+        self.make_request(30)
+        versions = caches['shared']
+        keys = [f'dashboard:version:{scope}' for scope in ('dean', f'user:{self.students[0].user_id}',
+                                                            f'user:{self.warden.pk}')]
+        versions.delete_many(keys)
+        self.run_pass()
+        self.assertEqual(len(versions.get_many(keys)), 3)
+
+    def test_stage_durations_are_recorded(self):
+        now = timezone.now()
+        bonafide_request = self.make_request(5, status='dean_approved', warden_review_date=now - timedelta(hours=3),
+                                             dean_review_date=now)
+        self.assertEqual(self.run_pass()[1], 1)
+        bonafide_request.refresh_from_db()
+        self.assertAlmostEqual(bonafide_request.warden_duration.total_seconds(), 2 * 3600, delta=5)
+        self.assertAlmostEqual(bonafide_request.dean_duration.total_seconds(), 3 * 3600, delta=5)
+        self.assertEqual(self.run_pass()[1], 0)
+
+        report = self.client_for(self.dean).get('/api/bonafide/reports/sla/').data
+        self.assertEqual(report['completed']['warden']['reviewed'], 1)
+        self.assertEqual(report['completed']['dean']['mean_hours'], 3.0)
+        self.assertEqual(self.client_for(self.dean).get('/api/bonafide/reports/sla/', {'days': '0'}).status_code, 400)
+
+
+class IdempotencyKeyTests(BonafideTestCase):
+    url = '/api/bonafide/request/create/'
+
+    def create(self, key, reason='visa', client=None):
+        client = client or self.client_for(self.students[0].user)
+        return client.post(self.url, {'reason': reason}, format='json', headers={'Idempotency-Key': key})
+
+    def test_retry_replays_stored_response(self):
+        first = self.create('k1')
+        retry = self.create('k1')
+        self.assertEqual((first.status_code, retry.status_code), (201, 201))
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(BonafideRequest.objects.count(), 1)
+
+    def test_key_reused_for_different_body(self):
+        self.create('k1')
+        self.assertEqual(self.create('k1', reason='other').status_code, 422)
+
+    @override_settings(IDEMPOTENCY_WAIT_SECONDS=0)
+    def test_retry_while_first_is_running(self):
+        with mock.patch('hostel_bonafide.idempotency.request_fingerprint', return_value='same'):
+            IdempotencyRecord.objects.create(user=self.students[0].user, key='k1', fingerprint='same',
+                                             expires_at=timezone.now() + timedelta(hours=1))
+            response = self.create('k1')
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('Retry-After', response)
+
+    def test_server_error_releases_key(self):
+        client = self.client_for(self.students[0].user)
+        client.raise_request_exception = False
+        with mock.patch('bonafide.views.count_change', side_effect=RuntimeError('boom')):
+            self.assertEqual(self.create('k1', client=client).status_code, 500)
+        self.assertFalse(IdempotencyRecord.objects.filter(key='k1').exists())
+        self.assertEqual(self.create('k1').status_code, 201)
@@ -0,0 +1,146 @@
+"""Chunked, resumable attachment uploads streamed straight to disk."""
+
+import hashlib
+import os
+import shutil
+import threading
+import uuid
+from django.core.files import File
+from django.db import transaction
+from .models import AttachmentUpload
+
+READ_SIZE = 64 * 1024
+
+# Running SHA-256 per upload, so finalising doesn't re-read the file. Lost on
+# restart or when chunks land on another worker; complete_upload() then
+# re-hashes the partial file instead.
+_hashers = {}
+_hashers_lock = threading.Lock()
+
+
+class UploadError(Exception):
+    """A chunk or completion request that cannot be applied."""
+
+    def __init__(self, message, status_code=400, offset=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.offset = offset
+
+
+def _check_offset(upload, offset, length):
+    if upload.status != 'uploading':
+        raise UploadError('Upload is already complete', status_code=409, offset=upload.received_size)
+    if offset != upload.received_size:
+        raise UploadError('Chunk offset does not match the uploaded size', status_code=409,
+                          offset=upload.received_size)
+    if offset + length > upload.total_size:
+        raise UploadError('Chunk exceeds the declared upload size', status_code=413, offset=offset)
+
+
+def append_chunk(upload, offset, stream, length, max_chunk_size):
+    """Append `length` bytes from `stream` at `offset`; return the new offset.
+
+    The body is read from the client into a side file first, without any
+    database lock held, since a slow client can take a long time to send
+    it. Only the offset check and the append are done under the row lock.
+    """
+    if length > max_chunk_size:
+        raise UploadError(f'Chunks may be at most {max_chunk_size} bytes', status_code=413)
+    upload.refresh_from_db(fields=['status', 'received_size', 'total_size'])
+    _check_offset(upload, offset, length)
+
+    with _hashers_lock:
+        state = _hashers.get(upload.upload_id)
+    if state and state[1] == offset:
+        hasher = state[0].copy()
+    else:
+        hasher = hashlib.sha256() if offset == 0 else None
+
+    os.makedirs(os.path.dirname(upload.temp_path), exist_ok=True)
+    chunk_path = f'{upload.temp_path}.{uuid.uuid4().hex}.chunk'
+    try:
+        with open(chunk_path, 'wb') as chunk:
+            written = 0
+            while written < length:
+                data = stream.read(min(READ_SIZE, length - written))
+                if not data:
+                    break
+                chunk.write(data)
+                if hasher:
+                    hasher.update(data)
+                written += len(data)
+        if written != length:
+            raise UploadError('Chunk body is shorter than its Content-Length', offset=offset)
+
+        with transaction.atomic():
+            upload = AttachmentUpload.objects.select_for_update().get(pk=upload.pk)
+            # Another request may have appended this offset while we were reading
+            _check_offset(upload, offset, length)
+            with open(upload.temp_path, 'ab') as partial, open(chunk_path, 'rb') as chunk:
+                # Drop bytes left behind by an interrupted chunk
+                partial.truncate(offset)
+                shutil.copyfileobj(chunk, partial, READ_SIZE)
+            upload.received_size = offset + written
+            upload.save(update_fields=['received_size', 'updated_at'])
+    finally:
+        try:
+            os.remove(chunk_path)
+        except FileNotFoundError:
+            pass
+
+    with _hashers_lock:
+        if hasher:
+            _hashers[upload.upload_id] = (hasher, upload.received_size)
+        else:
+            _hashers.pop(upload.upload_id, None)
+    return upload.received_size
+
+
+def complete_upload(upload, expected_sha256=None):
+    """Mark an upload complete after checking its size and (optional) checksum."""
+    if upload.status != 'uploading':
+        raise UploadError('Upload is already complete', status_code=409)
+    if upload.received_size != upload.total_size:
+        raise UploadError('Upload is incomplete', status_code=409, offset=upload.received_size)
+
+    with _hashers_lock:
+        state = _hashers.pop(upload.upload_id, None)
+    if state and state[1] == upload.received_size:
+        digest = state[0].hexdigest()
+    else:
+        hasher = hashlib.sha256()
+        with open(upload.temp_path, 'rb') as partial:
+            for chunk in iter(lambda: partial.read(READ_SIZE), b''):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+
+    if expected_sha256 and expected_sha256.lower() != digest:
+        raise UploadError('Checksum mismatch; restart the upload')
+
+    upload.sha256 = digest
+    upload.status = 'complete'
+    upload.save(update_fields=['sha256', 'status', 'updated_at'])
+    return upload
+
+
+def attach_upload(upload, bonafide_request):
+    """Move a completed upload into the request's attachment field."""
+    with open(upload.temp_path, 'rb') as partial:
+        content = File(partial, name=upload.filename)
+        # Lets content-addressed storage skip the copy when it already has these bytes
+        content.sha256 = upload.sha256
+        bonafide_request.attachment.save(upload.filename, content, save=True)
+
+    upload.status = 'attached'
+    upload.save(update_fields=['status', 'updated_at'])
+    discard_partial(upload)
+
+
+def discard_partial(upload):
+    """Remove an upload's partial file and cached hash state."""
+    with _hashers_lock:
+        _hashers.pop(upload.upload_id, None)
+    try:
+        os.remove(upload.temp_path)
+    except FileNotFoundError:
+        pass
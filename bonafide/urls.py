@@ -1,21 +1,39 @@
 from django.urls import path
 from .views import (
     CreateBonafideRequestView, StudentBonafideRequestListView,
+    AttachmentUploadCreateView, AttachmentUploadView, CompleteAttachmentUploadView,
     WardenPendingRequestsView, WardenReviewRequestView,
     DeanPendingRequestsView, DeanReviewRequestView,
-    DownloadBonafideView, VerifyBonafideView,
-    AllBonafideRequestsView, BonafideSettingsView
+    DownloadBonafideView, CreateDownloadLinkView, signed_download_view,
+    VerifyBonafideView,
+    AllBonafideRequestsView, BonafideRequestChangesView, ExportCertificatesView, BonafideSettingsView,
+    RequestCountersView, IssuanceReportView, SLAReportView, OutboxStatsView, DashboardView,
+    RequestEventsTicketView, request_events_view
 )
 
 urlpatterns = [
     path('request/create/', CreateBonafideRequestView.as_view(), name='create_bonafide_request'),
+    path('uploads/', AttachmentUploadCreateView.as_view(), name='create_attachment_upload'),
+    path('uploads/<uuid:upload_id>/', AttachmentUploadView.as_view(), name='attachment_upload'),
+    path('uploads/<uuid:upload_id>/complete/', CompleteAttachmentUploadView.as_view(), name='complete_attachment_upload'),
     path('requests/my/', StudentBonafideRequestListView.as_view(), name='my_bonafide_requests'),
     path('requests/all/', AllBonafideRequestsView.as_view(), name='all_bonafide_requests'),
+    path('requests/changes/', BonafideRequestChangesView.as_view(), name='bonafide_request_changes'),
     path('requests/warden/pending/', WardenPendingRequestsView.as_view(), name='warden_pending_requests'),
     path('requests/dean/pending/', DeanPendingRequestsView.as_view(), name='dean_pending_requests'),
     path('review/warden/<uuid:request_id>/', WardenReviewRequestView.as_view(), name='warden_review'),
     path('review/dean/<uuid:request_id>/', DeanReviewRequestView.as_view(), name='dean_review'),
     path('download/<uuid:request_id>/', DownloadBonafideView.as_view(), name='download_bonafide'),
+    path('download/<uuid:request_id>/link/', CreateDownloadLinkView.as_view(), name='create_download_link'),
+    path('download/signed/<str:token>/', signed_download_view, name='signed_download_bonafide'),
     path('verify/<str:verification_code>/', VerifyBonafideView.as_view(), name='verify_bonafide'),
+    path('export/certificates/', ExportCertificatesView.as_view(), name='export_certificates'),
     path('settings/', BonafideSettingsView.as_view(), name='bonafide_settings'),
+    path('counters/', RequestCountersView.as_view(), name='request_counters'),
+    path('reports/issuance/', IssuanceReportView.as_view(), name='issuance_report'),
+    path('reports/sla/', SLAReportView.as_view(), name='sla_report'),
+    path('outbox/stats/', OutboxStatsView.as_view(), name='outbox_stats'),
+    path('dashboard/', DashboardView.as_view(), name='dashboard'),
+    path('events/', request_events_view, name='request_events'),
+    path('events/ticket/', RequestEventsTicketView.as_view(), name='request_events_ticket'),
 ]
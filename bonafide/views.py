@@ -3,18 +3,47 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
-from django.core.files.base import ContentFile
-from django.http import FileResponse
-from .models import BonafideRequest, BonafideSettings
+from django.db import transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import FileResponse, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.views.decorators.http import require_GET
+from datetime import datetime, timedelta, timezone as dt_timezone
+from asgiref.sync import sync_to_async
+import re
+from collections import Counter
+from django.conf import settings as django_settings
+from .models import BonafideRequest, BonafideSettings, AttachmentUpload, IssuanceRollup
 from .serializers import (
     BonafideRequestSerializer, CreateBonafideRequestSerializer,
-    WardenReviewSerializer, DeanReviewSerializer, BonafideSettingsSerializer
+    WardenReviewSerializer, DeanReviewSerializer, BonafideSettingsSerializer,
+    AttachmentUploadSerializer
 )
-from .pdf_generator import BonafideCertificateGenerator, verify_certificate
-from audit.utils import log_activity
+from .pdf_generator import verify_certificate
+from .exports import CertificateArchive, filter_issued_certificates
+from .uploads import UploadError, append_chunk, complete_upload
+from .download_links import get_link_ttl, make_download_token, read_download_token
+from .counters import count_change, hostel_counters, period_of, request_contributions
+from .dashboard import get_dashboard
+from .outbox import outbox_stats, publish
+from .filters import RequestFilterMixin
+from .rollups import summarize
+from .sla import sla_summary
+from .eligibility import record_approval
+from .events import (
+    authenticate_stream, events_for, latest_event_id, make_stream_ticket, record_event, stream_events
+)
+from students.models import Student
+from hostels.models import Hostel
+from audit.utils import log_activity, queue_activity
+from hostel_bonafide.prefetch import AutoPrefetchMixin
+from hostel_bonafide.conditional import ConditionalGetMixin
+from hostel_bonafide.idempotency import IdempotentMixin
+from hostel_bonafide.pagination import BonafideRequestCursorPagination
+from hostel_bonafide.sync import DeltaSyncView
 
 
-class CreateBonafideRequestView(generics.CreateAPIView):
+class CreateBonafideRequestView(IdempotentMixin, generics.CreateAPIView):
     """Create a new bonafide request (Student only)."""
     serializer_class = CreateBonafideRequestSerializer
     permission_classes = [IsAuthenticated]
@@ -46,17 +75,103 @@ class CreateBonafideRequestView(generics.CreateAPIView):
 
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        bonafide_request = serializer.save(student=student)
-
-        log_activity(
-            request.user,
-            'CREATE_BONAFIDE_REQUEST',
-            f'Created bonafide request: {bonafide_request.request_id}'
-        )
+        with transaction.atomic():
+            bonafide_request = serializer.save(student=student)
+            count_change(bonafide_request, Counter())
+            record_event(bonafide_request, 'created')
+            # Attachment processing and the audit entry happen in bonafide.handlers
+            publish('request_created', bonafide_request, status=bonafide_request.status, audit={
+                'user_id': request.user.pk,
+                'action': 'CREATE_BONAFIDE_REQUEST',
+                'description': f'Created bonafide request: {bonafide_request.request_id}',
+            })
         
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
-class StudentBonafideRequestListView(generics.ListAPIView):
+
+
+class AttachmentUploadCreateView(generics.CreateAPIView):
+    """Start a chunked attachment upload (Student only)."""
+    serializer_class = AttachmentUploadSerializer
+    permission_classes = [IsAuthenticated]
+    
+    def create(self, request, *args, **kwargs):
+        if not request.user.is_student():
+            return Response(
+                {'error': 'Only students can upload attachments'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(user=request.user)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class AttachmentUploadView(APIView):
+    """Inspect an upload's progress or append a chunk to it."""
+    permission_classes = [IsAuthenticated]
+    
+    def get_upload(self, request, upload_id):
+        try:
+            return AttachmentUpload.objects.get(upload_id=upload_id, user=request.user)
+        except AttachmentUpload.DoesNotExist:
+            return None
+    
+    def get(self, request, upload_id):
+        upload = self.get_upload(request, upload_id)
+        if upload is None:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(AttachmentUploadSerializer(upload).data)
+    
+    def put(self, request, upload_id):
+        """Append the raw request body at ?offset= (or the Content-Range start)."""
+        upload = self.get_upload(request, upload_id)
+        if upload is None:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        content_range = re.match(r'bytes (\d+)-\d+/\d+', request.META.get('HTTP_CONTENT_RANGE', ''))
+        try:
+            offset = int(content_range.group(1) if content_range else request.query_params['offset'])
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except (KeyError, ValueError):
+            return Response(
+                {'error': 'Provide the chunk offset via ?offset= or a Content-Range header'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if length <= 0:
+            return Response({'error': 'Empty chunk'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            new_offset = append_chunk(
+                upload, offset, request.stream, length, django_settings.BONAFIDE_UPLOAD_CHUNK_SIZE
+            )
+        except UploadError as e:
+            return Response({'error': str(e), 'offset': e.offset}, status=e.status_code)
+        
+        return Response({'upload_id': upload.upload_id, 'offset': new_offset, 'size': upload.total_size})
+
+
+class CompleteAttachmentUploadView(APIView):
+    """Finalize a chunked upload so it can be referenced when creating a request."""
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request, upload_id):
+        try:
+            upload = AttachmentUpload.objects.get(upload_id=upload_id, user=request.user)
+        except AttachmentUpload.DoesNotExist:
+            return Response({'error': 'Upload not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        try:
+            upload = complete_upload(upload, request.data.get('sha256'))
+        except UploadError as e:
+            return Response({'error': str(e), 'offset': e.offset}, status=e.status_code)
+        
+        return Response(AttachmentUploadSerializer(upload).data)
+
+
+class StudentBonafideRequestListView(ConditionalGetMixin, RequestFilterMixin, AutoPrefetchMixin, generics.ListAPIView):
     """List all bonafide requests for logged-in student."""
     serializer_class = BonafideRequestSerializer
     permission_classes = [IsAuthenticated]
@@ -66,8 +181,12 @@ class StudentBonafideRequestListView(generics.ListAPIView):
             return BonafideRequest.objects.none()
         return BonafideRequest.objects.filter(student=self.request.user.student_profile)
 
+    def get_validator_querysets(self):
+        # Each request embeds the student's own details
+        return [self.get_queryset(), Student.objects.filter(user=self.request.user)]
 
-class WardenPendingRequestsView(generics.ListAPIView):
+
+class WardenPendingRequestsView(ConditionalGetMixin, RequestFilterMixin, AutoPrefetchMixin, generics.ListAPIView):
     """List pending bonafide requests for warden's hostel."""
     serializer_class = BonafideRequestSerializer
     permission_classes = [IsAuthenticated]
@@ -82,8 +201,14 @@ class WardenPendingRequestsView(generics.ListAPIView):
             status='pending'
         )
 
+    def get_validator_querysets(self):
+        # Each request embeds its student's details
+        if not self.request.user.is_warden():
+            return [self.get_queryset()]
+        return [self.get_queryset(), Student.objects.filter(hostel_id=self.request.user.warden_profile.hostel_id)]
 
-class WardenReviewRequestView(APIView):
+
+class WardenReviewRequestView(IdempotentMixin, APIView):
     """Warden approves or rejects bonafide request."""
     permission_classes = [IsAuthenticated]
     
@@ -94,8 +219,13 @@ class WardenReviewRequestView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        with transaction.atomic():
+            return self.review(request, request_id)
+
+    def review(self, request, request_id):
         try:
-            bonafide_request = BonafideRequest.objects.get(request_id=request_id)
+            # Locked so concurrent reviews can't both act on the same status
+            bonafide_request = BonafideRequest.objects.select_for_update().get(request_id=request_id)
         except BonafideRequest.DoesNotExist:
             return Response(
                 {'error': 'Request not found'},
@@ -121,6 +251,7 @@ class WardenReviewRequestView(APIView):
         
         action = serializer.validated_data['action']
         remarks = serializer.validated_data.get('remarks', '')
+        counted = request_contributions(bonafide_request)
         
         if action == 'approve':
             bonafide_request.status = 'warden_approved'
@@ -131,12 +262,13 @@ class WardenReviewRequestView(APIView):
         bonafide_request.warden_review_date = timezone.now()
         bonafide_request.warden_remarks = remarks
         bonafide_request.save()
-        
-        log_activity(
-            request.user,
-            f'WARDEN_{action.upper()}',
-            f'{action.title()} bonafide request: {bonafide_request.request_id}'
-        )
+        count_change(bonafide_request, counted)
+        record_event(bonafide_request, bonafide_request.status)
+        publish('warden_reviewed', bonafide_request, status=bonafide_request.status, audit={
+            'user_id': request.user.pk,
+            'action': f'WARDEN_{action.upper()}',
+            'description': f'{action.title()} bonafide request: {bonafide_request.request_id}',
+        })
         
         return Response(
             BonafideRequestSerializer(bonafide_request).data,
@@ -144,10 +276,11 @@ class WardenReviewRequestView(APIView):
         )
 
 
-class DeanPendingRequestsView(generics.ListAPIView):
+class DeanPendingRequestsView(RequestFilterMixin, AutoPrefetchMixin, generics.ListAPIView):
     """List requests pending dean approval."""
     serializer_class = BonafideRequestSerializer
     permission_classes = [IsAuthenticated]
+    allow_hostel_filter = True
     
     def get_queryset(self):
         if not self.request.user.is_dean() and not self.request.user.is_superuser:
@@ -156,7 +289,7 @@ class DeanPendingRequestsView(generics.ListAPIView):
         return BonafideRequest.objects.filter(status='warden_approved')
 
 
-class DeanReviewRequestView(APIView):
+class DeanReviewRequestView(IdempotentMixin, APIView):
     """Dean approves or rejects bonafide request."""
     permission_classes = [IsAuthenticated]
     
@@ -167,8 +300,12 @@ class DeanReviewRequestView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        with transaction.atomic():
+            return self.review(request, request_id)
+
+    def review(self, request, request_id):
         try:
-            bonafide_request = BonafideRequest.objects.get(request_id=request_id)
+            bonafide_request = BonafideRequest.objects.select_for_update().get(request_id=request_id)
         except BonafideRequest.DoesNotExist:
             return Response(
                 {'error': 'Request not found'},
@@ -186,24 +323,14 @@ class DeanReviewRequestView(APIView):
         
         action = serializer.validated_data['action']
         remarks = serializer.validated_data.get('remarks', '')
+        counted = request_contributions(bonafide_request)
         
         if action == 'approve':
             bonafide_request.status = 'dean_approved'
             bonafide_request.certificate_number = bonafide_request.generate_certificate_number()
             bonafide_request.verification_code = bonafide_request.generate_verification_code()
             bonafide_request.certificate_issued_date = timezone.now()
-            
-            # Generate PDF
-            pdf_generator = BonafideCertificateGenerator(bonafide_request)
-            pdf_buffer = pdf_generator.generate_pdf()
-            
-            # Save PDF to file field
-            pdf_filename = f"bonafide_{bonafide_request.certificate_number.replace('/', '_')}.pdf"
-            bonafide_request.certificate_file.save(
-                pdf_filename,
-                ContentFile(pdf_buffer.read()),
-                save=False
-            )
+            # The PDF is rendered by bonafide.handlers once this commits
         else:
             bonafide_request.status = 'dean_rejected'
         
@@ -211,12 +338,17 @@ class DeanReviewRequestView(APIView):
         bonafide_request.dean_review_date = timezone.now()
         bonafide_request.dean_remarks = remarks
         bonafide_request.save()
-        
-        log_activity(
-            request.user,
-            f'DEAN_{action.upper()}',
-            f'{action.title()} bonafide request: {bonafide_request.request_id}'
-        )
+        if action == 'approve':
+            record_approval(bonafide_request)
+            # Picks up the new updated_at and drops the cached eligibility for the response
+            bonafide_request.student.refresh_from_db()
+        count_change(bonafide_request, counted)
+        record_event(bonafide_request, bonafide_request.status)
+        publish('dean_reviewed', bonafide_request, status=bonafide_request.status, audit={
+            'user_id': request.user.pk,
+            'action': f'DEAN_{action.upper()}',
+            'description': f'{action.title()} bonafide request: {bonafide_request.request_id}',
+        })
         
         return Response(
             BonafideRequestSerializer(bonafide_request).data,
@@ -224,6 +356,28 @@ class DeanReviewRequestView(APIView):
         )
 
 
+def check_download_access(user, bonafide_request):
+    """Return an error response if the user may not download this certificate."""
+    if user.is_student():
+        if bonafide_request.student.user != user:
+            return Response(
+                {'error': 'You can only download your own certificates'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+    elif not (user.is_warden() or user.is_dean() or user.is_superuser):
+        return Response(
+            {'error': 'Permission denied'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    
+    if bonafide_request.status != 'dean_approved' or not bonafide_request.certificate_file:
+        return Response(
+            {'error': 'Certificate not yet generated'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    return None
+
+
 class DownloadBonafideView(APIView):
     """Download bonafide certificate PDF."""
     permission_classes = [IsAuthenticated]
@@ -238,23 +392,9 @@ class DownloadBonafideView(APIView):
             )
         
         # Check permissions
-        if request.user.is_student():
-            if bonafide_request.student.user != request.user:
-                return Response(
-                    {'error': 'You can only download your own certificates'},
-                    status=status.HTTP_403_FORBIDDEN
-                )
-        elif not (request.user.is_warden() or request.user.is_dean() or request.user.is_superuser):
-            return Response(
-                {'error': 'Permission denied'},
-                status=status.HTTP_403_FORBIDDEN
-            )
-        
-        if bonafide_request.status != 'dean_approved' or not bonafide_request.certificate_file:
-            return Response(
-                {'error': 'Certificate not yet generated'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
+        denied = check_download_access(request.user, bonafide_request)
+        if denied:
+            return denied
         
         log_activity(
             request.user,
@@ -269,6 +409,116 @@ class DownloadBonafideView(APIView):
         )
 
 
+class CreateDownloadLinkView(APIView):
+    """Issue a short-lived signed download URL for a certificate."""
+    permission_classes = [IsAuthenticated]
+    
+    def post(self, request, request_id):
+        try:
+            bonafide_request = BonafideRequest.objects.get(request_id=request_id)
+        except BonafideRequest.DoesNotExist:
+            return Response(
+                {'error': 'Request not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        denied = check_download_access(request.user, bonafide_request)
+        if denied:
+            return denied
+        
+        ttl = get_link_ttl(request.data.get('ttl'))
+        token, expires = make_download_token(bonafide_request, request.user, ttl)
+        
+        log_activity(
+            request.user,
+            'CREATE_DOWNLOAD_LINK',
+            f'Created {ttl}s download link for certificate: {bonafide_request.certificate_number}'
+        )
+        
+        return Response({
+            'url': request.build_absolute_uri(reverse('signed_download_bonafide', args=[token])),
+            'expires_at': datetime.fromtimestamp(expires, tz=dt_timezone.utc),
+            'expires_in': ttl,
+        }, status=status.HTTP_201_CREATED)
+
+
+@require_GET
+def signed_download_view(request, token):
+    """Serve a certificate from a signed link; checks only signature and expiry."""
+    payload = read_download_token(token)
+    if payload is None:
+        return JsonResponse({'error': 'Download link is invalid or has expired'}, status=403)
+    
+    storage = BonafideRequest._meta.get_field('certificate_file').storage
+    try:
+        certificate = storage.open(payload['f'], 'rb')
+    except FileNotFoundError:
+        return JsonResponse({'error': 'Certificate file not found'}, status=404)
+    
+    queue_activity(
+        payload['u'],
+        'DOWNLOAD_BONAFIDE',
+        f"Downloaded bonafide certificate via signed link: {payload['c']}",
+        request
+    )
+    
+    response = FileResponse(certificate, as_attachment=True, filename=payload['n'])
+    response['Cache-Control'] = 'private, no-store'
+    return response
+
+
+class RequestEventsTicketView(APIView):
+    """Issue a short-lived ticket for opening the event stream with EventSource."""
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        ticket = make_stream_ticket(request.user)
+        return Response({
+            'ticket': ticket,
+            'url': f"{request.build_absolute_uri(reverse('request_events'))}?ticket={ticket}",
+            'expires_in': django_settings.REQUEST_EVENTS_TICKET_TTL,
+        }, status=status.HTTP_201_CREATED)
+
+
+@require_GET
+async def request_events_view(request):
+    """Stream review queue events (SSE) for the user's requests, hostel or role.
+
+    Pass the JWT as a Bearer header, or a ?ticket= from events/ticket/
+    (EventSource can't send headers; its automatic reconnects keep
+    working with the same ticket, fetch a new one once they get a 401).
+    Send Last-Event-ID (or ?last_event_id=) to resume; otherwise only new
+    events are streamed. Only served through asgi.py, by the procfile's
+    `events` process: WSGI buffers the whole stream.
+    """
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse(
+            {'error': 'The event stream needs the ASGI server (hostel_bonafide.asgi)'},
+            status=status.HTTP_501_NOT_IMPLEMENTED
+        )
+
+    user = await sync_to_async(authenticate_stream)(request)
+    if user is None:
+        return JsonResponse(
+            {'error': 'Valid authentication credentials were not provided'},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+
+    queryset = await sync_to_async(events_for)(user)
+    try:
+        last_id = int(request.headers.get('Last-Event-ID') or request.GET['last_event_id'])
+        resume = True
+    except (KeyError, ValueError):
+        last_id = await sync_to_async(latest_event_id)(queryset)
+        resume = False
+
+    response = StreamingHttpResponse(stream_events(queryset, last_id, resume), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
 class VerifyBonafideView(APIView):
     """Verify bonafide certificate authenticity."""
     permission_classes = []
@@ -278,10 +528,13 @@ class VerifyBonafideView(APIView):
         return Response(result)
 
 
-class AllBonafideRequestsView(generics.ListAPIView):
+class AllBonafideRequestsView(RequestFilterMixin, AutoPrefetchMixin, generics.ListAPIView):
     """List all bonafide requests (Dean and Warden)."""
     serializer_class = BonafideRequestSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = BonafideRequestCursorPagination
+    # Wardens are already limited to their own hostel
+    allow_hostel_filter = True
     
     def get_queryset(self):
         user = self.request.user
@@ -295,9 +548,105 @@ class AllBonafideRequestsView(generics.ListAPIView):
             return BonafideRequest.objects.none()
 
 
-class BonafideSettingsView(APIView):
+class BonafideRequestChangesView(DeltaSyncView):
+    """Requests created, updated or deleted since ?since= (see DeltaSyncView)."""
+    serializer_class = BonafideRequestSerializer
+
+    def get_queryset(self):
+        user = self.request.user
+
+        if user.is_dean() or user.is_superuser:
+            return BonafideRequest.objects.all()
+        elif user.is_warden():
+            return BonafideRequest.objects.filter(student__hostel_id=user.warden_profile.hostel_id)
+        elif user.is_student():
+            return BonafideRequest.objects.filter(student=user.student_profile)
+        return BonafideRequest.objects.none()
+
+    def get_tombstones(self):
+        user = self.request.user
+        tombstones = self.tombstones_for(BonafideRequest)
+
+        if user.is_dean() or user.is_superuser:
+            return tombstones
+        elif user.is_warden():
+            return tombstones.filter(hostel_id=user.warden_profile.hostel_id)
+        elif user.is_student():
+            return tombstones.filter(student_id=user.student_profile.pk)
+        return tombstones.none()
+
+
+class ExportCertificatesView(APIView):
+    """Stream a ZIP of issued certificates with a CSV manifest (Dean only)."""
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        if not request.user.is_dean() and not request.user.is_superuser:
+            return Response(
+                {'error': 'Only dean can export certificates'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        month = request.query_params.get('month')
+        if month and not re.fullmatch(r'\d{4}-(0[1-9]|1[0-2])', month):
+            return Response(
+                {'error': 'month must be in YYYY-MM format'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        for name in ('hostel', 'department'):
+            value = request.query_params.get(name)
+            if value and not value.isdecimal():
+                return Response(
+                    {'error': f'{name} must be an id'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        archive = CertificateArchive(filter_issued_certificates(
+            hostel=request.query_params.get('hostel'),
+            department=request.query_params.get('department'),
+            month=month
+        ))
+        
+        start, end = 0, archive.size - 1
+        byte_range = request.META.get('HTTP_RANGE')
+        if_range = request.META.get('HTTP_IF_RANGE')
+        if byte_range and (not if_range or if_range == archive.etag):
+            match = re.fullmatch(r'bytes=(\d*)-(\d*)', byte_range.strip())
+            if match and any(match.groups()):
+                first, last = match.groups()
+                if first:
+                    start, end = int(first), min(int(last), end) if last else end
+                else:
+                    start = max(archive.size - int(last), 0)
+            if not match or start > end:
+                response = HttpResponse(status=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE)
+                response['Content-Range'] = f'bytes */{archive.size}'
+                return response
+        
+        if start == 0 and end == archive.size - 1:
+            log_activity(
+                request.user,
+                'EXPORT_CERTIFICATES',
+                f'Exported {len(archive.entries)} certificates ({request.query_params.urlencode() or "all"})'
+            )
+        
+        response = StreamingHttpResponse(archive.iter_bytes(start, end), content_type='application/zip')
+        if (start, end) != (0, archive.size - 1):
+            response.status_code = status.HTTP_206_PARTIAL_CONTENT
+            response['Content-Range'] = f'bytes {start}-{end}/{archive.size}'
+        response['Content-Length'] = str(end - start + 1)
+        response['Accept-Ranges'] = 'bytes'
+        response['ETag'] = archive.etag
+        response['Content-Disposition'] = f'attachment; filename="bonafide_certificates_{month or "all"}.zip"'
+        return response
+
+
+class BonafideSettingsView(ConditionalGetMixin, APIView):
     """Get and update bonafide settings (Dean only)."""
     permission_classes = [IsAuthenticated]
+
+    def get_validator_querysets(self):
+        return [BonafideSettings.objects.all()]
     
     def get(self, request):
         """Get current settings."""
@@ -327,3 +676,142 @@ class BonafideSettingsView(APIView):
             
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class RequestCountersView(APIView):
+    """Request counts per hostel and status, read from the counter table."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+        if user.is_warden():
+            hostels = Hostel.objects.filter(pk=user.warden_profile.hostel_id)
+        elif user.is_dean() or user.is_superuser:
+            hostels = Hostel.objects.all()
+        else:
+            return Response(
+                {'error': 'Only wardens and dean can view request counters'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        period = request.query_params.get('period') or period_of(timezone.now())
+        if not re.fullmatch(r'\d{4}-(0[1-9]|1[0-2])', period):
+            return Response(
+                {'error': 'period must be YYYY-MM'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        names = dict(hostels.order_by('name').values_list('id', 'name'))
+        counters = hostel_counters(names.keys(), period)
+        empty = dict.fromkeys((choice for choice, _ in BonafideRequest.STATUS_CHOICES), 0)
+        rows = []
+        totals = {'current': dict(empty), 'this_period': dict(empty)}
+        for hostel_id, name in names.items():
+            counts = counters.get(hostel_id, {'current': dict(empty), 'this_period': dict(empty)})
+            rows.append({'hostel_id': hostel_id, 'hostel_name': name, **counts})
+            for kind in totals:
+                for key, value in counts[kind].items():
+                    totals[kind][key] += value
+
+        return Response({'period': period, 'hostels': rows, 'totals': totals})
+
+
+class IssuanceReportView(APIView):
+    """Certificates issued and turnaround, from the issuance rollups (Dean only).
+
+    ?from= and ?to= take YYYY-MM; ?group_by= is a comma list of month,
+    reason, department and hostel; ?reason=, ?department= and ?hostel=
+    filter by value (department and hostel by id).
+    """
+    permission_classes = [IsAuthenticated]
+    GROUP_FIELDS = {
+        'month': 'month',
+        'reason': 'reason',
+        'department': 'department__code',
+        'hostel': 'hostel__name',
+    }
+
+    def get(self, request):
+        if not request.user.is_dean() and not request.user.is_superuser:
+            return Response(
+                {'error': 'Only dean can view issuance reports'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        params = request.query_params
+        rollups = IssuanceRollup.objects.all()
+        for bound, lookup in (('from', 'month__gte'), ('to', 'month__lte')):
+            month = params.get(bound)
+            if month:
+                if not re.fullmatch(r'\d{4}-(0[1-9]|1[0-2])', month):
+                    return Response(
+                        {'error': f'{bound} must be in YYYY-MM format'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                rollups = rollups.filter(**{lookup: month})
+        for name in ('reason', 'department', 'hostel'):
+            value = params.get(name)
+            if not value:
+                continue
+            if name != 'reason' and not value.isdecimal():
+                return Response(
+                    {'error': f'{name} must be an id'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            rollups = rollups.filter(**{name: value})
+
+        names = [name.strip() for name in params.get('group_by', 'month').split(',') if name.strip()]
+        unknown = [name for name in names if name not in self.GROUP_FIELDS]
+        if unknown:
+            return Response(
+                {'error': f'group_by accepts {", ".join(self.GROUP_FIELDS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        group_by = {name: self.GROUP_FIELDS[name] for name in names}
+
+        rows = rollups.values(
+            *group_by.values(), 'issued', 'warden_seconds', 'dean_seconds', 'total_seconds', 'histogram'
+        )
+        return Response({'group_by': names, 'results': summarize(rows, group_by)})
+
+
+class OutboxStatsView(APIView):
+    """Outbox backlog and dispatcher lag (Dean only)."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not request.user.is_dean() and not request.user.is_superuser:
+            return Response(
+                {'error': 'Only dean can view outbox status'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        return Response(outbox_stats())
+
+
+class SLAReportView(APIView):
+    """Requests waiting past their SLA and review times over the last ?days= (default 30) (Dean only)."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        if not request.user.is_dean() and not request.user.is_superuser:
+            return Response(
+                {'error': 'Only dean can view SLA reports'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        days = request.query_params.get('days', '30')
+        if not days.isdigit() or not 0 < int(days) <= 366:
+            return Response(
+                {'error': 'days must be between 1 and 366'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        since = timezone.now() - timedelta(days=int(days))
+        return Response({'days': int(days), **sla_summary(since)})
+
+
+class DashboardView(APIView):
+    """Everything a role's landing page needs, in one cached response."""
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(get_dashboard(request.user))
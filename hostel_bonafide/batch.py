@@ -0,0 +1,131 @@
+"""Run several read-only API calls in one HTTP round trip."""
+
+import copy
+import json
+from contextvars import copy_context
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import connection, connections
+from django.http import Http404
+from django.urls import Resolver404, resolve
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from .request_cache import shared_cache
+
+BATCH_PATH = '/api/batch/'
+# Sub-request headers a client may set, e.g. to revalidate with ETags
+FORWARDED_HEADERS = ('If-None-Match', 'If-Modified-Since', 'Accept-Language')
+RETURNED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control')
+
+
+class BatchView(APIView):
+    """Run a list of GET sub-requests and return all their responses.
+
+    POST ``{"requests": [{"id": "me", "path": "/api/auth/me/"}, ...]}``.
+    The caller is authenticated once and the same user object is handed to
+    every sub-request, so JWT validation and the user lookup are not
+    repeated, and singleton lookups (see hostel_bonafide.request_cache) are
+    made once for the whole batch. Sub-requests are read-only, so they run
+    concurrently when the database connection allows it.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        items = request.data.get('requests') if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response(
+                {'error': 'Provide a non-empty "requests" list'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(items) > settings.API_BATCH_MAX_REQUESTS:
+            return Response(
+                {'error': f'At most {settings.API_BATCH_MAX_REQUESTS} requests per batch'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        calls = []
+        for index, item in enumerate(items):
+            if isinstance(item, str):
+                item = {'path': item}
+            path = item.get('path') if isinstance(item, dict) else None
+            if not isinstance(path, str) or not path.startswith('/api/') or path.startswith(BATCH_PATH):
+                return Response(
+                    {'error': f'Request {index}: "path" must be an API URL other than {BATCH_PATH}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            headers = item.get('headers')
+            calls.append((item.get('id', index), path, headers if isinstance(headers, dict) else {}))
+
+        # Other threads get their own connections and can't see an open transaction
+        workers = 1 if connection.in_atomic_block else settings.API_BATCH_MAX_WORKERS
+        with shared_cache():
+            if workers > 1 and len(calls) > 1:
+                with ThreadPoolExecutor(max_workers=min(workers, len(calls))) as executor:
+                    # Each worker runs in a copy of this context, so it sees the shared cache
+                    futures = [executor.submit(copy_context().run, self.run_threaded, request, *call) for call in calls]
+                    results = [future.result() for future in futures]
+            else:
+                results = [self.run(request, *call) for call in calls]
+        return Response({'responses': results})
+
+    def run_threaded(self, request, call_id, path, headers):
+        try:
+            return self.run(request, call_id, path, headers)
+        finally:
+            connections.close_all()
+
+    def build_request(self, request, path, headers):
+        """A GET HttpRequest for `path` that reuses the caller's authentication."""
+        url = urlsplit(path)
+        sub_request = copy.copy(request._request)
+        sub_request.method = 'GET'
+        sub_request.path = sub_request.path_info = url.path
+        sub_request.META = {
+            key: value for key, value in request.META.items()
+            if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH') and not key.startswith('HTTP_IF_')
+        }
+        sub_request.META.update(REQUEST_METHOD='GET', PATH_INFO=url.path, QUERY_STRING=url.query)
+        sub_request.environ = sub_request.META
+        for name in FORWARDED_HEADERS:
+            if name in headers:
+                sub_request.META['HTTP_' + name.upper().replace('-', '_')] = headers[name]
+        for attr in ('GET', '_body', '_stream', '_files', '_post'):
+            sub_request.__dict__.pop(attr, None)
+        sub_request.user = request.user
+        # DRF authenticates requests carrying these without running authenticators again
+        sub_request._force_auth_user = request.user
+        sub_request._force_auth_token = request.auth
+        return sub_request
+
+    def run(self, request, call_id, path, headers):
+        try:
+            match = resolve(urlsplit(path).path)
+            if iscoroutinefunction(match.func):
+                # Async views (e.g. event streams) can't run inside a sync batch
+                return {
+                    'id': call_id, 'status': status.HTTP_400_BAD_REQUEST, 'headers': {},
+                    'body': {'detail': 'This endpoint cannot be batched.'},
+                }
+            response = match.func(self.build_request(request, path, headers), *match.args, **match.kwargs)
+        except (Resolver404, Http404):
+            return {'id': call_id, 'status': status.HTTP_404_NOT_FOUND, 'headers': {}, 'body': {'detail': 'Not found.'}}
+
+        if hasattr(response, 'data'):
+            body = response.data
+        elif response.status_code == status.HTTP_304_NOT_MODIFIED:
+            body = None
+        elif not response.streaming and response.get('Content-Type', '').startswith('application/json'):
+            body = json.loads(response.content)
+        else:
+            body = {'detail': 'Only JSON responses can be batched.'}
+        response.close()
+        return {
+            'id': call_id,
+            'status': response.status_code,
+            'headers': {name: response[name] for name in RETURNED_HEADERS if response.has_header(name)},
+            'body': body,
+        }
@@ -0,0 +1,78 @@
+"""Conditional GET (ETag / Last-Modified) for read endpoints."""
+
+import hashlib
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+
+class NotModified(Exception):
+    """Raised from initial() to short-circuit a request with a 304."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """Answer If-None-Match / If-Modified-Since before any real work is done.
+
+    The validator is ``MAX(updated_at)`` and ``COUNT(*)`` of each queryset from
+    get_validator_querysets() (by default the view's own, already role-scoped
+    queryset), combined with the user and the full query string so every page,
+    filter and field selection gets its own ETag. Inserts, edits and deletes
+    all change at least one of the two aggregates. Validation runs in
+    initial(), i.e. after authentication and permission checks but before
+    the handler builds and serializes the response.
+    """
+    validator_field = 'updated_at'
+
+    def get_validator_querysets(self):
+        return [self.get_queryset()]
+
+    def get_validators(self):
+        """Return (etag, last_modified timestamp or None)."""
+        request = self.request
+        digest = hashlib.sha256(
+            f'{type(self).__name__}|{request.user.pk}|{request.get_full_path()}'.encode()
+        )
+        last_modified = None
+        for queryset in self.get_validator_querysets():
+            aggregates = queryset.order_by().aggregate(
+                last_modified=Max(self.validator_field), count=Count('pk')
+            )
+            digest.update(f"|{aggregates['last_modified']}:{aggregates['count']}".encode())
+            if aggregates['last_modified'] and (
+                    last_modified is None or aggregates['last_modified'] > last_modified):
+                last_modified = aggregates['last_modified']
+
+        etag = f'"{digest.hexdigest()[:32]}"'
+        return etag, int(last_modified.timestamp()) if last_modified else None
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.validators = None
+        if request.method not in ('GET', 'HEAD'):
+            return
+        self.validators = self.get_validators()
+        etag, last_modified = self.validators
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            raise NotModified(response)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, NotModified):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, 'validators', None)
+        if validators and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response['ETag'] = etag
+            if last_modified:
+                response['Last-Modified'] = http_date(last_modified)
+            # Let clients keep the body but always revalidate it
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
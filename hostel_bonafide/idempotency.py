@@ -0,0 +1,152 @@
+"""Idempotency-Key support for POST endpoints that must not run twice.
+
+A client sends a unique ``Idempotency-Key`` header with a POST. The first
+request with that key runs normally, and its response is stored
+(compressed) under the key for IDEMPOTENCY_KEY_TTL_HOURS. A retry with the
+same key gets the stored response back, marked ``Idempotent-Replayed:
+true``. Validation, rendering and audit logging do not run again.
+
+Keys are scoped to the user and tied to the request they were first used
+for (method, path and body); reusing a key for a different request gets a
+422. A retry that arrives while the first request is still running waits
+up to IDEMPOTENCY_WAIT_SECONDS for it and then gets a 409. Server errors
+are not stored, so the client can retry them. Expired records are ignored
+and can be removed with ``manage.py prune_idempotency_keys``.
+"""
+
+import hashlib
+import json
+import time
+import zlib
+from datetime import timedelta
+from django.conf import settings
+from django.core.files.uploadedfile import UploadedFile
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+from audit.models import IdempotencyRecord
+from .renderers import FastJSONRenderer
+
+HEADER = 'Idempotency-Key'
+# A first request that hasn't finished after this long is assumed dead
+IN_PROGRESS_TIMEOUT = 120  # seconds
+POLL_INTERVAL = 0.2  # seconds
+
+
+class IdempotentResponse(Exception):
+    """Raised from initial() to answer with a stored (or error) response."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+def _encode(value):
+    if isinstance(value, UploadedFile):
+        digest = hashlib.sha256()
+        for chunk in value.chunks():
+            digest.update(chunk)
+        value.seek(0)
+        return f'file:{value.name}:{digest.hexdigest()}'
+    return str(value)
+
+
+def request_fingerprint(request):
+    """Hash of the method, path and parsed body; uploaded files are hashed by content."""
+    data = request.data
+    if hasattr(data, 'lists'):
+        data = dict(data.lists())
+    body = json.dumps(data, sort_keys=True, default=_encode)
+    return hashlib.sha256(f'{request.method}|{request.path}|{body}'.encode()).hexdigest()
+
+
+def replay(record):
+    data = json.loads(zlib.decompress(bytes(record.response))) if record.response else None
+    return Response(data, status=record.status_code, headers={'Idempotent-Replayed': 'true'})
+
+
+class IdempotentMixin:
+    """Honour Idempotency-Key on POST. Stored responses are looked up in
+    initial(), after authentication, so a replay skips the handler
+    entirely."""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.idempotency_record = None
+        key = request.headers.get(HEADER)
+        if request.method != 'POST' or key is None:
+            return
+        if not key or len(key) > 255:
+            raise IdempotentResponse(Response(
+                {'error': f'{HEADER} must be 1-255 characters'},
+                status=status.HTTP_400_BAD_REQUEST
+            ))
+        self.idempotency_record = self.claim_key(request.user, key, request_fingerprint(request))
+
+    def claim_key(self, user, key, fingerprint):
+        """Create the in-progress record for `key`, or raise with the response owed."""
+        deadline = time.monotonic() + settings.IDEMPOTENCY_WAIT_SECONDS
+        while True:
+            now = timezone.now()
+            try:
+                with transaction.atomic():
+                    return IdempotencyRecord.objects.create(
+                        user=user, key=key, fingerprint=fingerprint,
+                        expires_at=now + timedelta(hours=settings.IDEMPOTENCY_KEY_TTL_HOURS),
+                    )
+            except IntegrityError:
+                pass
+
+            record = IdempotencyRecord.objects.filter(user=user, key=key).first()
+            if record is None:
+                continue  # the first request failed and released the key
+            stale = record.status_code is None and record.created_at < now - timedelta(seconds=IN_PROGRESS_TIMEOUT)
+            if record.expires_at <= now or stale:
+                IdempotencyRecord.objects.filter(pk=record.pk).delete()
+                continue
+            if record.fingerprint != fingerprint:
+                raise IdempotentResponse(Response(
+                    {'error': f'{HEADER} was already used for a different request'},
+                    status=status.HTTP_422_UNPROCESSABLE_ENTITY
+                ))
+            if record.status_code is not None:
+                raise IdempotentResponse(replay(record))
+            if time.monotonic() >= deadline:
+                raise IdempotentResponse(Response(
+                    {'error': f'A request with this {HEADER} is still being processed'},
+                    status=status.HTTP_409_CONFLICT,
+                    headers={'Retry-After': str(max(settings.IDEMPOTENCY_WAIT_SECONDS, 1))}
+                ))
+            time.sleep(POLL_INTERVAL)
+
+    def release_key(self):
+        record, self.idempotency_record = getattr(self, 'idempotency_record', None), None
+        if record is not None:
+            record.delete()
+
+    def handle_exception(self, exc):
+        if isinstance(exc, IdempotentResponse):
+            return exc.response
+        try:
+            return super().handle_exception(exc)
+        except Exception:
+            # Unhandled errors aren't stored; let the client retry
+            self.release_key()
+            raise
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        record = getattr(self, 'idempotency_record', None)
+        if record is None:
+            return response
+        if response.status_code >= 500 or not hasattr(response, 'data'):
+            self.release_key()
+            return response
+
+        self.idempotency_record = None
+        record.status_code = response.status_code
+        if response.data is not None:
+            record.response = zlib.compress(FastJSONRenderer().render(response.data))
+        record.save(update_fields=['status_code', 'response'])
+        return response
@@ -0,0 +1,138 @@
+"""Brotli/gzip compression for API responses."""
+
+import gzip
+import re
+import zlib
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+# Only text-like payloads; PDFs, images and ZIP archives are already compressed
+COMPRESSIBLE_TYPES = (
+    'application/json', 'application/javascript', 'application/xml',
+    'text/html', 'text/plain', 'text/csv', 'text/css', 'text/javascript',
+)
+ACCEPT_ENCODING_RE = re.compile(r'\s*([^\s;,]+)\s*(?:;\s*q\s*=\s*([0-9.]+))?')
+
+
+def choose_encoding(accept_encoding):
+    """Pick 'br' or 'gzip' from an Accept-Encoding header, or None."""
+    weights = {}
+    for part in accept_encoding.lower().split(','):
+        match = ACCEPT_ENCODING_RE.match(part)
+        if not match:
+            continue
+        try:
+            weights[match.group(1)] = float(match.group(2)) if match.group(2) else 1.0
+        except ValueError:
+            continue
+
+    default = weights.get('*', 0)
+    candidates = ['br', 'gzip'] if brotli is not None else ['gzip']
+    best = None
+    for encoding in candidates:
+        weight = weights.get(encoding, default)
+        if weight > 0 and (best is None or weight > weights.get(best, default)):
+            best = encoding
+    return best
+
+
+class _StreamCompressor:
+    """Incremental br/gzip encoder; every chunk is flushed so streams stay live."""
+
+    def __init__(self, encoding):
+        if encoding == 'br':
+            self.compressor = brotli.Compressor(quality=settings.API_COMPRESSION_BROTLI_QUALITY)
+        else:
+            # wbits=31: gzip container
+            self.compressor = zlib.compressobj(settings.API_COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 31)
+        self.encoding = encoding
+
+    def compress(self, chunk):
+        if self.encoding == 'br':
+            return self.compressor.process(chunk) + self.compressor.flush()
+        return self.compressor.compress(chunk) + self.compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        if self.encoding == 'br':
+            return self.compressor.finish()
+        return self.compressor.flush()
+
+
+def compress_bytes(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=settings.API_COMPRESSION_BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=settings.API_COMPRESSION_GZIP_LEVEL, mtime=0)
+
+
+def compress_stream(chunks, encoding):
+    compressor = _StreamCompressor(encoding)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def compress_async_stream(chunks, encoding):
+    compressor = _StreamCompressor(encoding)
+    async for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+class APICompressionMiddleware(MiddlewareMixin):
+    """Compress API responses with Brotli or gzip, as negotiated.
+
+    Like Django's GZipMiddleware, but limited to API_COMPRESSION_PATHS and
+    to text-like content types, with Brotli preferred when the client accepts
+    it. Bodies below API_COMPRESSION_MIN_SIZE are left alone; streaming
+    responses are compressed chunk by chunk. Partial (206) and already
+    encoded responses, and file attachments, pass through untouched.
+    """
+
+    def process_response(self, request, response):
+        if not request.path.startswith(tuple(settings.API_COMPRESSION_PATHS)):
+            return response
+        if response.status_code == 206 or response.has_header('Content-Encoding'):
+            return response
+        content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type not in COMPRESSIBLE_TYPES:
+            return response
+        if 'attachment' in response.get('Content-Disposition', ''):
+            return response
+
+        # The response differs by Accept-Encoding whether or not we compress it
+        patch_vary_headers(response, ('Accept-Encoding',))
+        encoding = choose_encoding(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = compress_async_stream(response.streaming_content, encoding)
+            else:
+                response.streaming_content = compress_stream(response.streaming_content, encoding)
+            del response['Content-Length']
+        else:
+            if len(response.content) < settings.API_COMPRESSION_MIN_SIZE:
+                return response
+            compressed = compress_bytes(response.content, encoding)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response['Content-Length'] = str(len(compressed))
+
+        # The bytes changed, so a strong validator would be wrong (RFC 9110 8.8.3)
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+        response['Content-Encoding'] = encoding
+        return response
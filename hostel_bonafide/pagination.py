@@ -0,0 +1,131 @@
+"""Pagination classes shared by the API apps."""
+
+import hashlib
+from functools import partial
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+EXACT_COUNT_PARAM = 'exact_count'
+
+
+def _is_true(value):
+    return (value or '').lower() in ('1', 'true', 'yes')
+
+
+def count_cache_key(queryset):
+    """Cache key for the row count of a queryset's exact WHERE clause."""
+    sql, params = queryset.order_by().query.sql_with_params()
+    digest = hashlib.sha256(f'{sql}|{params!r}'.encode()).hexdigest()
+    return f'count:{queryset.model._meta.label_lower}:{digest}'
+
+
+def cached_count(queryset, exact=False):
+    """Return (count, approximate) for a queryset.
+
+    Counts are cached for PAGINATION_COUNT_CACHE_TTL seconds per filter. A
+    cached value may be that many seconds stale, so it is flagged approximate;
+    exact=True always runs COUNT(*) and refreshes the cache.
+    """
+    try:
+        key = count_cache_key(queryset)
+    except EmptyResultSet:
+        # none() or e.g. pk__in=[]: nothing to count
+        return 0, False
+    if not exact:
+        count = cache.get(key)
+        if count is not None:
+            return count, True
+    count = queryset.count()
+    cache.set(key, count, settings.PAGINATION_COUNT_CACHE_TTL)
+    return count, False
+
+
+class CachedCountPaginator(Paginator):
+    """Django paginator whose count comes from cached_count()."""
+
+    def __init__(self, *args, exact_count=False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.exact_count = exact_count
+        self.approximate = False
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, 'query'):
+            return super().count
+        count, self.approximate = cached_count(self.object_list, self.exact_count)
+        return count
+
+
+class CachedCountPagination(PageNumberPagination):
+    """Page-number pagination without a COUNT(*) on every page.
+
+    ``count`` is served from a short-lived cache and ``approximate`` says
+    whether it was; pass ``?exact_count=true`` for a fresh count.
+    """
+    django_paginator_class = CachedCountPaginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        exact = _is_true(request.query_params.get(EXACT_COUNT_PARAM))
+        self.django_paginator_class = partial(CachedCountPaginator, exact_count=exact)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        response.data['approximate'] = self.page.paginator.approximate
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        schema = super().get_paginated_response_schema(schema)
+        schema['properties']['approximate'] = {'type': 'boolean'}
+        return schema
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor (keyset) pagination for large, append-heavy lists.
+
+    Pages are fetched with ``WHERE <first ordering field> < cursor`` against an
+    index instead of ``COUNT(*)`` + ``OFFSET``, so deep pages cost the same as
+    the first and results stay stable while rows are being inserted. Cursors
+    are opaque; the trailing ``id`` in each ordering only breaks ties between
+    identical timestamps. Pass ``?include_total=true`` to also get ``count``
+    (cached, see CachedCountPagination; add ``?exact_count=true`` to force it).
+    """
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    total_query_param = 'include_total'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.total = None
+        if _is_true(request.query_params.get(self.total_query_param)):
+            self.total, self.approximate = cached_count(
+                queryset, _is_true(request.query_params.get(EXACT_COUNT_PARAM))
+            )
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = {
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        }
+        if self.total is not None:
+            response['count'] = self.total
+            response['approximate'] = self.approximate
+        return Response(response)
+
+
+class BonafideRequestCursorPagination(KeysetPagination):
+    ordering = ('-created_at', '-id')
+
+
+class StudentCursorPagination(KeysetPagination):
+    ordering = ('register_number',)
+
+
+class AuditLogCursorPagination(KeysetPagination):
+    ordering = ('-timestamp', '-id')
@@ -0,0 +1,151 @@
+"""Derive select_related / prefetch_related from what a serializer will read."""
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.relations import ManyRelatedField, RelatedField
+
+
+def _walk_relations(model, parts):
+    """Follow dotted source parts through model relations.
+
+    Returns (related model, relation parts consumed, whether a to-many hop was crossed).
+    """
+    consumed = []
+    to_many = False
+    for part in parts:
+        try:
+            field = model._meta.get_field(part)
+        except FieldDoesNotExist:
+            break
+        if not field.is_relation or field.related_model is None:
+            break
+        consumed.append(part)
+        to_many = to_many or field.one_to_many or field.many_to_many
+        model = field.related_model
+    return model, consumed, to_many
+
+
+def collect_related_lookups(serializer, model, prefix='', in_prefetch=False, select=None, prefetch=None):
+    """Return the (select_related, prefetch_related) lookups a serializer needs."""
+    select = set() if select is None else select
+    prefetch = set() if prefetch is None else prefetch
+
+    def add(path, to_many):
+        lookup = '__'.join(filter(None, [prefix, path]))
+        if not lookup:
+            return
+        (prefetch if (to_many or in_prefetch) else select).add(lookup)
+
+    method_sources = getattr(getattr(serializer, 'Meta', None), 'method_sources', {})
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.SerializerMethodField):
+            for source in method_sources.get(name, ()):
+                _, consumed, to_many = _walk_relations(model, source.split('.'))
+                if consumed:
+                    add('__'.join(consumed), to_many)
+            continue
+        if field.source == '*':
+            continue
+        parts = field.source.split('.')
+
+        if isinstance(field, (serializers.ListSerializer, ManyRelatedField)):
+            child = field.child if isinstance(field, serializers.ListSerializer) else field.child_relation
+            related_model, consumed, _ = _walk_relations(model, parts)
+            if consumed:
+                add('__'.join(consumed), True)
+                if isinstance(child, serializers.Serializer):
+                    collect_related_lookups(
+                        child, related_model, '__'.join(filter(None, [prefix, *consumed])),
+                        True, select, prefetch
+                    )
+        elif isinstance(field, serializers.Serializer):
+            related_model, consumed, to_many = _walk_relations(model, parts)
+            if consumed:
+                add('__'.join(consumed), to_many)
+                collect_related_lookups(
+                    field, related_model, '__'.join(filter(None, [prefix, *consumed])),
+                    in_prefetch or to_many, select, prefetch
+                )
+        else:
+            # 'department.code' needs department; a plain PK field reads only the FK column
+            if isinstance(field, RelatedField) and field.use_pk_only_optimization() and len(parts) == 1:
+                continue
+            relation_parts = parts if isinstance(field, RelatedField) else parts[:-1]
+            _, consumed, to_many = _walk_relations(model, relation_parts)
+            if consumed:
+                add('__'.join(consumed), to_many)
+
+    return select, prefetch
+
+
+def collect_only_fields(serializer, model):
+    """Model columns a serializer reads, or None if that can't be determined."""
+    method_sources = getattr(getattr(serializer, 'Meta', None), 'method_sources', {})
+    concrete = {field.name for field in model._meta.concrete_fields}
+    relations = {field.name for field in model._meta.get_fields() if field.is_relation}
+    only = {model._meta.pk.name}
+
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.SerializerMethodField):
+            if name not in method_sources:
+                return None
+            sources = method_sources[name]
+        elif field.source == '*':
+            return None
+        else:
+            sources = [field.source]
+
+        for source in sources:
+            head = source.split('.')[0]
+            if head.startswith('get_') and head.endswith('_display'):
+                head = head[len('get_'):-len('_display')]
+            if head in concrete:
+                # Forward foreign keys are concrete too; only() keeps their column
+                only.add(head)
+            elif head not in relations:
+                # A property or method whose inputs we can't see
+                return None
+    return only
+
+
+def optimize_queryset(queryset, serializer, ordering=()):
+    """Apply the joins and prefetches `serializer` needs to `queryset`.
+
+    For sparse serializers (see SparseFieldsMixin) the selected columns are
+    narrowed with only() as well, keeping any `ordering` fields a paginator
+    will read back from the rows.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    select, prefetch = collect_related_lookups(serializer, queryset.model)
+    if select:
+        queryset = queryset.select_related(*sorted(select))
+    if prefetch:
+        queryset = queryset.prefetch_related(*sorted(prefetch))
+    if getattr(serializer, 'sparse_fields', False):
+        only = collect_only_fields(serializer, queryset.model)
+        if only is not None:
+            concrete = {field.name for field in queryset.model._meta.concrete_fields}
+            only.update(name.lstrip('-') for name in ordering if name.lstrip('-') in concrete)
+            queryset = queryset.only(*only)
+    return queryset
+
+
+class AutoPrefetchMixin:
+    """Generic view mixin that optimizes the queryset for its serializer.
+
+    Hooks filter_queryset() so views keep their own role-scoped
+    get_queryset(); both list() and get_object() go through it.
+    """
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        ordering = getattr(self.paginator, 'ordering', None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return optimize_queryset(queryset, self.get_serializer(), ordering)
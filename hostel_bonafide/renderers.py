@@ -0,0 +1,57 @@
+"""JSON renderer and parser backed by orjson when it is installed.
+
+orjson is an optional dependency. Without it both classes behave exactly like
+DRF's JSONRenderer / JSONParser (the standard library's json module).
+"""
+
+from django.conf import settings
+from rest_framework import renderers, parsers
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# orjson writes these raw; DRF escapes them so output stays a JavaScript subset
+LINE_SEPARATOR = '\u2028'.encode()
+PARAGRAPH_SEPARATOR = '\u2029'.encode()
+
+# UUID, datetime, date and time are native to orjson ('Z' for UTC, as DRF does);
+# Decimal, lazy strings, timedelta, querysets etc. go through DRF's encoder.
+_encode_default = JSONEncoder().default
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """Drop-in JSONRenderer that uses orjson for compact output."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        # orjson only writes compact UTF-8
+        if orjson is None or data is None or indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(
+            data, default=_encode_default,
+            option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        )
+        if LINE_SEPARATOR in ret or PARAGRAPH_SEPARATOR in ret:
+            ret = ret.replace(LINE_SEPARATOR, b'\\u2028').replace(PARAGRAPH_SEPARATOR, b'\\u2029')
+        return ret
+
+
+class FastJSONParser(parsers.JSONParser):
+    """Drop-in JSONParser that uses orjson for UTF-8 request bodies."""
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace('-', '') != 'utf8':
+            return super().parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,31 @@
+"""Lookups shared by the sub-requests of one /api/batch/ call.
+
+Singleton rows such as BonafideSettings and AcademicYear are read by many
+endpoints. Inside shared_cache() (opened by BatchView), cached_lookup()
+loads each of them once and hands the same object to every sub-request;
+outside a batch it simply calls the loader.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_cache = ContextVar('request_cache', default=None)
+
+
+@contextmanager
+def shared_cache():
+    token = _cache.set({})
+    try:
+        yield
+    finally:
+        _cache.reset(token)
+
+
+def cached_lookup(key, load):
+    """`load()`, memoised for the rest of the batch when called inside one."""
+    cache = _cache.get()
+    if cache is None:
+        return load()
+    if key not in cache:
+        cache[key] = load()
+    return cache[key]
@@ -0,0 +1,176 @@
+"""Serializer mixins shared by the API apps."""
+
+import hashlib
+from django.core.cache import caches
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import models
+from rest_framework import serializers
+
+
+def _split(value):
+    return [name.strip() for name in (value or '').split(',') if name.strip()]
+
+
+def parse_field_selection(names):
+    """['a', 'b.c', 'b.d'] -> {'a': None, 'b': {'c': None, 'd': None}} (None = whole field)."""
+    selection = {}
+    for name in names:
+        head, _, rest = name.partition('.')
+        if not rest:
+            selection[head] = None
+        elif head not in selection or selection[head] is not None:
+            selection.setdefault(head, {})
+            selection[head] = {**selection[head], **parse_field_selection([rest])}
+    return selection
+
+
+def apply_field_selection(serializer, selection):
+    """Drop every field of `serializer` (recursively) that is not selected."""
+    for name in list(serializer.fields):
+        if name not in selection:
+            serializer.fields.pop(name)
+            continue
+        nested = serializer.fields[name]
+        if isinstance(nested, serializers.ListSerializer):
+            nested = nested.child
+        if selection[name] and isinstance(nested, serializers.Serializer):
+            apply_field_selection(nested, selection[name])
+
+
+class SparseFieldsMixin:
+    """Let GET clients choose response fields with ``?fields=`` and ``?expand=``.
+
+    Without ``?fields=`` the full representation is returned. With it, only
+    the listed fields are serialized; nested objects (e.g. ``student_details``)
+    are left out unless named in ``?expand=`` or in ``fields`` itself, and
+    ``student_details.name`` selects inside a nested object. Fields that are
+    dropped are never computed, and AutoPrefetchMixin narrows the queryset's
+    joins and columns to match.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.sparse_fields = False
+
+        # Only the serializer a view builds gets the request in its own context;
+        # declared nested serializers are filtered through their parent.
+        request = self._context.get('request')
+        if request is None or request.method != 'GET':
+            return
+        fields = _split(request.query_params.get('fields'))
+        if not fields:
+            return
+
+        selection = parse_field_selection(fields + _split(request.query_params.get('expand')))
+        apply_field_selection(self, selection)
+        self.sparse_fields = True
+
+
+def fragment_cache():
+    return caches['fragments']
+
+
+def _field_signature(serializer):
+    """'a,b,user(id,name)': the (possibly pruned) shape a serializer renders."""
+    parts = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, serializers.ListSerializer):
+            field = field.child
+        if isinstance(field, serializers.Serializer):
+            parts.append(f'{name}({_field_signature(field)})')
+        else:
+            parts.append(name)
+    return ','.join(parts)
+
+
+class FragmentCacheMixin:
+    """Cache each object's serialized dict in the 'fragments' cache.
+
+    Keys are ``(serializer, pk, updated_at, rendered fields)``, so a save moves
+    the object to a new key and stale entries simply age out. Anything the
+    representation borrows from related rows must bump this object's
+    updated_at when it changes (see students.signals). Lists should use
+    FragmentListSerializer to fetch a whole page's fragments in one round trip.
+    """
+    fragment_version_field = 'updated_at'
+
+    def fragment_key(self, instance):
+        version = getattr(instance, self.fragment_version_field, None)
+        if instance.pk is None or version is None:
+            return None
+        if not hasattr(self, '_fragment_signature'):
+            self._fragment_signature = hashlib.sha256(_field_signature(self).encode()).hexdigest()[:16]
+        return f'fragment:{type(self).__name__}:{instance.pk}:{version.isoformat()}:{self._fragment_signature}'
+
+    def to_representation(self, instance):
+        key = self.fragment_key(instance)
+        if key is None:
+            return super().to_representation(instance)
+
+        preloaded = getattr(self, '_preloaded_fragments', None)
+        if preloaded is not None and key in self._fragment_keys:
+            data = preloaded.get(key)
+        else:
+            data = fragment_cache().get(key)
+        if data is None:
+            data = super().to_representation(instance)
+            if preloaded is not None:
+                # Written back in one set_many() by FragmentListSerializer
+                self._fragment_writes[key] = data
+            else:
+                fragment_cache().set(key, data)
+        return data
+
+
+def preload_fragments(serializer, instances):
+    """Fetch cached fragments for `instances` and their nested cached objects at once.
+
+    Returns the serializers that were primed, for flush_fragments().
+    """
+    targets = []
+    if isinstance(serializer, FragmentCacheMixin):
+        targets.append((serializer, instances))
+    for field in serializer.fields.values():
+        if not isinstance(field, FragmentCacheMixin) or field.write_only:
+            continue
+        related = []
+        for instance in instances:
+            try:
+                obj = field.get_attribute(instance)
+            except (AttributeError, KeyError, ObjectDoesNotExist):
+                continue
+            if obj is not None:
+                related.append(obj)
+        targets.append((field, related))
+
+    for target, objs in targets:
+        target._fragment_keys = {key for key in map(target.fragment_key, objs) if key}
+    found = fragment_cache().get_many(set().union(*(target._fragment_keys for target, _ in targets)))
+    for target, _ in targets:
+        target._preloaded_fragments = found
+        target._fragment_writes = {}
+    return [target for target, _ in targets]
+
+
+def flush_fragments(primed):
+    """Store fragments rendered during a preloaded pass and reset the serializers."""
+    writes = {}
+    for serializer in primed:
+        writes.update(serializer._fragment_writes)
+        del serializer._preloaded_fragments, serializer._fragment_keys, serializer._fragment_writes
+    if writes:
+        fragment_cache().set_many(writes)
+
+
+class FragmentListSerializer(serializers.ListSerializer):
+    """List serializer that batches fragment cache reads and writes for a page."""
+
+    def to_representation(self, data):
+        items = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        primed = preload_fragments(self.child, items)
+        try:
+            return super().to_representation(items)
+        finally:
+            flush_fragments(primed)
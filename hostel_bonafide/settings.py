@@ -6,6 +6,7 @@ from pathlib import Path
 from datetime import timedelta
 import os
 import environ
+from corsheaders.defaults import default_headers
 
 # Build paths inside the project
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -37,6 +38,9 @@ CORS_ALLOWED_ORIGINS = env.list("CORS_ALLOWED_ORIGINS", default=[])
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Browsers may send Idempotency-Key on create/review POSTs (hostel_bonafide.idempotency)
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+
 # ============================
 # APPLICATIONS
 # ============================
@@ -67,6 +71,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
+    'hostel_bonafide.middleware.APICompressionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -106,6 +111,9 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Background writers (outbox dispatch) share the file with requests:
+        # take the write lock up front and wait for it instead of failing
+        'OPTIONS': {'transaction_mode': 'IMMEDIATE', 'timeout': 20},
     }
 }
 
@@ -155,6 +163,40 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Bonafide attachments and certificates are deduplicated by SHA-256 into
+# MEDIA_ROOT/.blobs, sharded this many directory levels deep
+BONAFIDE_BLOB_SHARD_DEPTH = 2
+# Also shard upload names (bonafide_attachments/<aa>/<name>) for very large volumes
+BONAFIDE_SHARD_UPLOAD_NAMES = env.bool('BONAFIDE_SHARD_UPLOAD_NAMES', default=False)
+
+# ============================
+# CACHE SETTINGS
+# ============================
+# Serialized per-object fragments (see hostel_bonafide.serializers.FragmentCacheMixin).
+# Any cache URL works, e.g. redis://localhost:6379/1; the local-memory default
+# evicts least recently used entries beyond FRAGMENT_CACHE_MAX_ENTRIES.
+FRAGMENT_CACHE = env.cache('FRAGMENT_CACHE_URL', default='locmemcache://fragments')
+FRAGMENT_CACHE.setdefault('TIMEOUT', 24 * 60 * 60)
+if FRAGMENT_CACHE['BACKEND'].endswith('LocMemCache'):
+    FRAGMENT_CACHE.setdefault('OPTIONS', {})['MAX_ENTRIES'] = env.int('FRAGMENT_CACHE_MAX_ENTRIES', default=5000)
+
+# State every worker process must agree on, such as the dashboard version
+# keys (bonafide.dashboard). Defaults to the database cache table, created by
+# ``manage.py createcachetable``; point SHARED_CACHE_URL at Redis if available.
+SHARED_CACHE = env.cache('SHARED_CACHE_URL', default='dbcache://django_cache')
+SHARED_CACHE.setdefault('TIMEOUT', None)
+if SHARED_CACHE['BACKEND'].endswith('DatabaseCache'):
+    # Culling would reset versions; there is one key per user
+    SHARED_CACHE.setdefault('OPTIONS', {})['MAX_ENTRIES'] = env.int('SHARED_CACHE_MAX_ENTRIES', default=1000000)
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'fragments': FRAGMENT_CACHE,
+    'shared': SHARED_CACHE,
+}
+
 # ============================
 # REST FRAMEWORK
 # ============================
@@ -165,7 +207,17 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    # orjson-backed when installed, otherwise identical to DRF's JSON classes
+    'DEFAULT_RENDERER_CLASSES': (
+        'hostel_bonafide.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'hostel_bonafide.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
+    'DEFAULT_PAGINATION_CLASS': 'hostel_bonafide.pagination.CachedCountPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_THROTTLE_CLASSES': [
         'rest_framework.throttling.AnonRateThrottle',
@@ -176,6 +228,31 @@ REST_FRAMEWORK = {
         'user': '1000/hour'
     }
 }
+# Seconds a paginated list's total count is reused before COUNT(*) runs again
+PAGINATION_COUNT_CACHE_TTL = env.int('PAGINATION_COUNT_CACHE_TTL', default=60)
+
+# /api/batch/: sub-requests per call and how many run at once
+API_BATCH_MAX_REQUESTS = env.int('API_BATCH_MAX_REQUESTS', default=10)
+API_BATCH_MAX_WORKERS = env.int('API_BATCH_MAX_WORKERS', default=4)
+
+# Brotli/gzip compression of API responses (hostel_bonafide.middleware)
+API_COMPRESSION_PATHS = ('/api/',)
+API_COMPRESSION_MIN_SIZE = env.int('API_COMPRESSION_MIN_SIZE', default=1024)  # bytes
+API_COMPRESSION_GZIP_LEVEL = env.int('API_COMPRESSION_GZIP_LEVEL', default=6)  # 1-9
+API_COMPRESSION_BROTLI_QUALITY = env.int('API_COMPRESSION_BROTLI_QUALITY', default=5)  # 0-11
+
+# Delta sync (?since=) endpoints, see hostel_bonafide.sync
+SYNC_PAGE_SIZE = env.int('SYNC_PAGE_SIZE', default=500)
+# Seconds re-read each sync, for transactions still committing. A write to a
+# synced row that takes longer than this to commit can be missed by clients.
+SYNC_WATERMARK_LAG = 5
+SYNC_TOMBSTONE_RETENTION_DAYS = env.int('SYNC_TOMBSTONE_RETENTION_DAYS', default=30)
+
+# Idempotency-Key support on POSTs (hostel_bonafide.idempotency): hours a
+# stored response is replayed, and seconds a retry waits for the first
+# request with the same key to finish before getting a 409
+IDEMPOTENCY_KEY_TTL_HOURS = env.int('IDEMPOTENCY_KEY_TTL_HOURS', default=24)
+IDEMPOTENCY_WAIT_SECONDS = 10
 
 # ============================
 # JWT SETTINGS
@@ -206,6 +283,18 @@ if not DEBUG:
     SECURE_HSTS_INCLUDE_SUBDOMAINS = True
     SECURE_HSTS_PRELOAD = True
 
+# ============================
+# EMAIL SETTINGS
+# ============================
+EMAIL_BACKEND = env('EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = env('EMAIL_HOST', default='localhost')
+EMAIL_PORT = env.int('EMAIL_PORT', default=25)
+EMAIL_HOST_USER = env('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = env.bool('EMAIL_USE_TLS', default=False)
+EMAIL_TIMEOUT = 30
+DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='noreply@localhost')
+
 # ============================
 # BONAFIDE SETTINGS
 # ============================
@@ -213,9 +302,69 @@ BONAFIDE_SIGNATURE_KEY = env(
     'BONAFIDE_SIGNATURE_KEY',
     default='change-this-to-strong-signature-key'
 )
+# Chunked attachment uploads
+BONAFIDE_UPLOAD_MAX_SIZE = env.int('BONAFIDE_UPLOAD_MAX_SIZE', default=10 * 1024 * 1024)
+BONAFIDE_UPLOAD_CHUNK_SIZE = env.int('BONAFIDE_UPLOAD_CHUNK_SIZE', default=1024 * 1024)
+BONAFIDE_UPLOAD_TEMP_DIR = os.path.join(MEDIA_ROOT, '.uploads')
+BONAFIDE_UPLOAD_EXPIRY_HOURS = 24
+
+# Image attachments are downscaled and thumbnailed in the background
+BONAFIDE_ATTACHMENT_REVIEW_SIZE = 1600  # px, longest side
+BONAFIDE_ATTACHMENT_THUMBNAIL_SIZE = 320  # px, longest side
+BONAFIDE_ATTACHMENT_JPEG_QUALITY = 80
+BONAFIDE_KEEP_ORIGINAL_ATTACHMENTS = env.bool('BONAFIDE_KEEP_ORIGINAL_ATTACHMENTS', default=False)
+
+# Signed certificate download links (seconds)
+BONAFIDE_DOWNLOAD_LINK_TTL = env.int('BONAFIDE_DOWNLOAD_LINK_TTL', default=300)
+BONAFIDE_DOWNLOAD_LINK_MAX_TTL = env.int('BONAFIDE_DOWNLOAD_LINK_MAX_TTL', default=900)
+# Review queue event stream (seconds). It is served over ASGI by the
+# procfile's `events` process; route /api/bonafide/events/ to it.
+REQUEST_EVENTS_POLL_INTERVAL = 2
+REQUEST_EVENTS_KEEPALIVE = 15
+REQUEST_EVENTS_MAX_DURATION = env.int('REQUEST_EVENTS_MAX_DURATION', default=300)
+REQUEST_EVENTS_RETENTION_DAYS = env.int('REQUEST_EVENTS_RETENTION_DAYS', default=7)
+REQUEST_EVENTS_COMMIT_LAG = 5  # seconds re-read each poll, for transactions still committing
+# How long a stream ticket (POST events/ticket/) can be used to open the stream
+REQUEST_EVENTS_TICKET_TTL = env.int('REQUEST_EVENTS_TICKET_TTL', default=60)
+# ...and to reconnect with Last-Event-ID after a stream ends; no longer than a JWT lives
+REQUEST_EVENTS_RECONNECT_TTL = env.int(
+    'REQUEST_EVENTS_RECONNECT_TTL', default=int(SIMPLE_JWT['ACCESS_TOKEN_LIFETIME'].total_seconds())
+)
+
+# Workflow outbox (bonafide.outbox). With autodispatch the web process
+# delivers events after commit; set it off when running dispatch_outbox.
+OUTBOX_AUTODISPATCH = env.bool('OUTBOX_AUTODISPATCH', default=True)
+OUTBOX_BATCH_SIZE = env.int('OUTBOX_BATCH_SIZE', default=100)
+OUTBOX_LEASE_SECONDS = env.int('OUTBOX_LEASE_SECONDS', default=60)
+OUTBOX_MAX_ATTEMPTS = env.int('OUTBOX_MAX_ATTEMPTS', default=8)
+OUTBOX_POLL_INTERVAL = 1  # seconds, dispatch_outbox --loop
+OUTBOX_RETENTION_DAYS = env.int('OUTBOX_RETENTION_DAYS', default=7)
+
+# Status emails (bonafide.notifications), sent by `manage.py send_notifications`
+# (the procfile's worker).
+# Messages wait BONAFIDE_EMAIL_COALESCE_SECONDS so bursts go out as one digest.
+BONAFIDE_EMAIL_NOTIFICATIONS = env.bool('BONAFIDE_EMAIL_NOTIFICATIONS', default=True)
+BONAFIDE_EMAIL_COALESCE_SECONDS = env.int('BONAFIDE_EMAIL_COALESCE_SECONDS', default=60)
+BONAFIDE_EMAIL_BATCH_SIZE = env.int('BONAFIDE_EMAIL_BATCH_SIZE', default=200)
+BONAFIDE_EMAIL_MAX_ATTEMPTS = env.int('BONAFIDE_EMAIL_MAX_ATTEMPTS', default=5)
+
+# Hours a request may wait with the warden / the dean before
+# `manage.py escalate_stale_requests` escalates it to the dean
+BONAFIDE_SLA_WARDEN_HOURS = env.int('BONAFIDE_SLA_WARDEN_HOURS', default=72)
+BONAFIDE_SLA_DEAN_HOURS = env.int('BONAFIDE_SLA_DEAN_HOURS', default=72)
+
+# Per-user dashboard cache (seconds); writes invalidate it sooner
+DASHBOARD_CACHE_TTL = env.int('DASHBOARD_CACHE_TTL', default=300)
 UNIVERSITY_NAME = 'Anna University Regional Campus'
 UNIVERSITY_LOCATION = 'Coimbatore'
 
+# ============================
+# AUDIT SETTINGS
+# ============================
+# Entries queued with audit.utils.queue_activity are written in batches
+AUDIT_BATCH_SIZE = env.int('AUDIT_BATCH_SIZE', default=50)
+AUDIT_BATCH_INTERVAL = env.int('AUDIT_BATCH_INTERVAL', default=30)  # seconds
+
 # ============================
 # SESSION SETTINGS
 # ============================
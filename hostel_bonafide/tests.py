@@ -0,0 +1,143 @@
+from datetime import date
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from rest_framework.test import APIClient
+from accounts.models import User
+from audit.models import AuditLog
+from bonafide.models import BonafideRequest, BonafideSettings
+from hostels.models import BankAccount, Hostel, Warden
+from students.models import AcademicYear, Department, Student
+
+
+class ListQueryCountTests(TestCase):
+    """List endpoints run the same number of queries however many rows a page holds."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(code='CSE', name='Computer Science')
+        cls.hostel = Hostel.objects.create(name='H1', code='H1', hostel_type='boys', capacity=100)
+        cls.dean = User.objects.create_user('dean', password='x', role='dean', email='dean@example.com')
+        cls.warden = User.objects.create_user('warden', password='x', role='warden', email='warden@example.com')
+        Warden.objects.create(user=cls.warden, hostel=cls.hostel, name='Warden', phone_number='1',
+                              email='warden@example.com')
+        cls.students = 0
+        cls.add_students(12)
+
+    @classmethod
+    def add_students(cls, count):
+        for _ in range(count):
+            cls.students += 1
+            n = cls.students
+            user = User.objects.create_user(f'student{n}', password='x', role='student', email=f's{n}@example.com')
+            student = Student.objects.create(
+                user=user, register_number=f'R{n:04d}', name=f'Student {n}', date_of_birth=date(2004, 1, 1),
+                gender='M', department=cls.department, degree='BE', current_year=1, admission_year=2024,
+                graduation_year=2028, hostel=cls.hostel, email=f's{n}@example.com',
+            )
+            BonafideRequest.objects.create(student=student, reason='bank_loan')
+            AuditLog.objects.create(user=user, action='CREATE_BONAFIDE_REQUEST', description='Created')
+
+    def get(self, user, url):
+        cache.clear()  # counts and serialized fragments are cached between requests
+        client = APIClient()
+        client.force_authenticate(user)
+        response = client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data
+
+    def assertConstantQueries(self, user, small_url, large_url, grow=None):
+        with CaptureQueriesContext(connection) as small:
+            small_page = self.get(user, small_url)
+        if grow:
+            grow()
+        with self.assertNumQueries(len(small)):
+            large_page = self.get(user, large_url)
+        self.assertGreater(len(large_page['results']), len(small_page['results']))
+
+    def test_all_requests(self):
+        url = '/api/bonafide/requests/all/?page_size='
+        self.assertConstantQueries(self.dean, url + '2', url + '10')
+
+    def test_warden_pending(self):
+        url = '/api/bonafide/requests/warden/pending/'
+        BonafideRequest.objects.filter(pk__in=BonafideRequest.objects.order_by('pk')[2:]).update(status='warden_approved')
+        grow = lambda: BonafideRequest.objects.update(status='pending')
+        self.assertConstantQueries(self.warden, url, url, grow=grow)
+
+    def test_dean_pending(self):
+        url = '/api/bonafide/requests/dean/pending/'
+        BonafideRequest.objects.filter(pk__in=BonafideRequest.objects.order_by('pk')[:2]).update(status='warden_approved')
+        grow = lambda: BonafideRequest.objects.update(status='warden_approved')
+        self.assertConstantQueries(self.dean, url, url, grow=grow)
+
+    def test_wardens(self):
+        def grow():
+            for n in range(2, 8):
+                user = User.objects.create_user(f'warden{n}', password='x', role='warden', email=f'w{n}@example.com')
+                Warden.objects.create(user=user, hostel=self.hostel, name=f'Warden {n}', phone_number=str(n),
+                                      email=f'w{n}@example.com')
+        self.assertConstantQueries(self.dean, '/api/hostels/wardens/', '/api/hostels/wardens/', grow=grow)
+
+    def test_bank_accounts(self):
+        def add_account(n):
+            hostel = Hostel.objects.create(name=f'B{n}', code=f'B{n}', hostel_type='girls', capacity=100)
+            BankAccount.objects.create(hostel=hostel, account_type='mess', bank_name='Bank', branch_name='Main',
+                                       ifsc_code='BANK0000001', account_number=str(n), account_name='Hostel')
+        add_account(1)
+        url = '/api/hostels/bank-accounts/'
+        self.assertConstantQueries(self.dean, url, url, grow=lambda: [add_account(n) for n in range(2, 8)])
+
+    def test_student_list(self):
+        url = '/api/students/list/?page_size='
+        self.assertConstantQueries(self.dean, url + '2', url + '10')
+
+    def test_audit_logs(self):
+        url = '/api/audit/logs/?page_size='
+        self.assertConstantQueries(self.dean, url + '2', url + '10')
+
+    def test_hostels(self):
+        def grow():
+            for n in range(2, 8):
+                hostel = Hostel.objects.create(name=f'H{n}', code=f'H{n}', hostel_type='girls', capacity=100)
+                BankAccount.objects.create(hostel=hostel, account_type='mess', bank_name='Bank', branch_name='Main',
+                                           ifsc_code='BANK0000001', account_number=str(n), account_name='Hostel')
+        self.assertConstantQueries(self.dean, '/api/hostels/', '/api/hostels/', grow=grow)
+
+
+class BatchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dean = User.objects.create_user('dean', password='x', role='dean', email='dean@example.com')
+
+    def batch(self, *paths):
+        client = APIClient()
+        client.force_authenticate(self.dean)
+        response = client.post('/api/batch/', {'requests': list(paths)}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        return [(item['status'], item['body']) for item in response.data['responses']]
+
+    def test_singleton_lookups_are_shared(self):
+        cache.clear()
+        with mock.patch.object(BonafideSettings.objects, 'get_or_create', wraps=BonafideSettings.objects.get_or_create) as settings_lookup, \
+                mock.patch.object(AcademicYear.objects, 'get_or_create', wraps=AcademicYear.objects.get_or_create) as year_lookup:
+            results = self.batch('/api/bonafide/settings/', '/api/students/academic-year/', '/api/bonafide/dashboard/')
+            self.assertEqual([status for status, _ in results], [200, 200, 200])
+            self.assertEqual(settings_lookup.call_count, 1)
+            self.assertEqual(year_lookup.call_count, 1)
+            # Outside a batch each call looks the row up again
+            BonafideSettings.get_settings()
+            self.assertEqual(settings_lookup.call_count, 2)
+
+    def test_async_and_unknown_paths_fail_alone(self):
+        results = self.batch('/api/bonafide/events/', '/api/nothing-here/', '/api/hostels/')
+        self.assertEqual([status for status, _ in results], [400, 404, 200])
+
+    def test_nested_batch_is_rejected(self):
+        client = APIClient()
+        client.force_authenticate(self.dean)
+        response = client.post('/api/batch/', {'requests': ['/api/batch/']}, format='json')
+        self.assertEqual(response.status_code, 400)
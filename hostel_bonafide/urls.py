@@ -5,6 +5,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from .batch import BatchView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
@@ -13,6 +14,7 @@ urlpatterns = [
     path('api/bonafide/', include('bonafide.urls')),
     path('api/hostels/', include('hostels.urls')),
     path('api/audit/', include('audit.urls')),
+    path('api/batch/', BatchView.as_view(), name='batch'),
 ]
 
 if settings.DEBUG:
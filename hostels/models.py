@@ -31,6 +31,9 @@ class Hostel(models.Model):
     
     def get_current_occupancy(self):
         """Get current number of residents."""
+        # List views annotate resident_count to avoid a COUNT per hostel
+        if hasattr(self, 'resident_count'):
+            return self.resident_count
         return self.residents.count()
 
     def get_available_capacity(self):
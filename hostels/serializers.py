@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from .models import Hostel, Warden, BankAccount
 from accounts.serializers import UserSerializer
+from hostel_bonafide.serializers import SparseFieldsMixin
 
 
-class BankAccountSerializer(serializers.ModelSerializer):
+class BankAccountSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for BankAccount model."""
     account_type_display = serializers.CharField(source='get_account_type_display', read_only=True)
     hostel_name = serializers.CharField(source='hostel.name', read_only=True)
@@ -15,7 +16,7 @@ class BankAccountSerializer(serializers.ModelSerializer):
 
 
 
-class HostelSerializer(serializers.ModelSerializer):
+class HostelSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Hostel model."""
     current_occupancy = serializers.SerializerMethodField()
     available_capacity = serializers.SerializerMethodField()
@@ -24,6 +25,8 @@ class HostelSerializer(serializers.ModelSerializer):
     class Meta:
         model = Hostel
         fields = '__all__'
+        # Occupancy comes from the list view's resident_count annotation
+        method_sources = {'current_occupancy': (), 'available_capacity': ('capacity',)}
 
     def get_current_occupancy(self, obj):
         return obj.get_current_occupancy()
@@ -32,7 +35,7 @@ class HostelSerializer(serializers.ModelSerializer):
         return obj.get_available_capacity()
 
 
-class WardenSerializer(serializers.ModelSerializer):
+class WardenSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Warden model."""
     user = UserSerializer(read_only=True)
     hostel_name = serializers.CharField(source='hostel.name', read_only=True)
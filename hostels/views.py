@@ -7,15 +7,23 @@ from .serializers import (
     HostelSerializer, WardenSerializer, CreateWardenProfileSerializer,
     BankAccountSerializer
 )
+from django.db.models import Count
 from audit.utils import log_activity
+from hostel_bonafide.prefetch import AutoPrefetchMixin
+from hostel_bonafide.conditional import ConditionalGetMixin
+from students.models import Student
 
 
-class HostelListView(generics.ListAPIView):
+class HostelListView(ConditionalGetMixin, AutoPrefetchMixin, generics.ListAPIView):
     """List all hostels."""
-    queryset = Hostel.objects.all()
+    queryset = Hostel.objects.annotate(resident_count=Count('residents')).order_by('name')
     serializer_class = HostelSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_validator_querysets(self):
+        # Occupancy and bank accounts are part of each hostel's representation
+        return [Hostel.objects.all(), BankAccount.objects.all(), Student.objects.exclude(hostel=None)]
+
 
 class HostelDetailView(generics.RetrieveUpdateAPIView):
     """Get and update hostel details (Dean only)."""
@@ -101,7 +109,7 @@ class CreateWardenProfileView(generics.CreateAPIView):
                 {'error': str(e), 'details': serializer.errors if 'serializer' in locals() else {}},
                 status=status.HTTP_400_BAD_REQUEST
             )
-class WardenListView(generics.ListAPIView):
+class WardenListView(AutoPrefetchMixin, generics.ListAPIView):
     """List all wardens (Dean only)."""
     queryset = Warden.objects.all()
     serializer_class = WardenSerializer
@@ -113,7 +121,7 @@ class WardenListView(generics.ListAPIView):
         return Warden.objects.all()
 
 
-class WardenDetailView(generics.RetrieveUpdateDestroyAPIView):
+class WardenDetailView(AutoPrefetchMixin, generics.RetrieveUpdateDestroyAPIView):
     """Retrieve, update or delete warden profile (Dean only)."""
     queryset = Warden.objects.all()
     serializer_class = WardenSerializer
@@ -153,7 +161,7 @@ class WardenDetailView(generics.RetrieveUpdateDestroyAPIView):
 
 
 # Bank Account Management Views
-class BankAccountListCreateView(generics.ListCreateAPIView):
+class BankAccountListCreateView(AutoPrefetchMixin, generics.ListCreateAPIView):
     """List and create bank accounts (Dean only)."""
     serializer_class = BankAccountSerializer
     permission_classes = [IsAuthenticated]
@@ -1,6 +1,7 @@
 from django.db import models
 from django.conf import settings
 from datetime import datetime
+from hostel_bonafide.request_cache import cached_lookup
 
 
 class AcademicYear(models.Model):
@@ -20,11 +21,10 @@ class AcademicYear(models.Model):
     @classmethod
     def get_current(cls):
         """Get or create the current academic year."""
-        obj, created = cls.objects.get_or_create(
+        return cached_lookup('academic_year', lambda: cls.objects.get_or_create(
             id=1,
             defaults={'current_year': datetime.now().year}
-        )
-        return obj
+        )[0])
 
 
 class Department(models.Model):
@@ -76,6 +76,9 @@ class Student(models.Model):
     class Meta:
         db_table = 'students'
         ordering = ['register_number']
+        indexes = [
+            models.Index(fields=['updated_at', 'id']),
+        ]
     
     def __str__(self):
         return f"{self.register_number} - {self.name}"
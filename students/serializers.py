@@ -2,11 +2,12 @@ from rest_framework import serializers
 from .models import Student, Department
 from accounts.models import User
 from accounts.serializers import UserSerializer
+from hostel_bonafide.serializers import FragmentCacheMixin, FragmentListSerializer, SparseFieldsMixin
 from django.contrib.auth.hashers import make_password
 from datetime import datetime
 
 
-class DepartmentSerializer(serializers.ModelSerializer):
+class DepartmentSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Department model."""
     
     class Meta:
@@ -14,17 +15,23 @@ class DepartmentSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class StudentSerializer(serializers.ModelSerializer):
+class StudentSerializer(SparseFieldsMixin, FragmentCacheMixin, serializers.ModelSerializer):
     """Serializer for Student model."""
     user = UserSerializer(read_only=True)
     department_code = serializers.CharField(source='department.code', read_only=True)
     department_name = serializers.CharField(source='department.name', read_only=True)
     hostel_name = serializers.CharField(source='hostel.name', read_only=True)
     year_display = serializers.SerializerMethodField()
+    # Earliest a new bonafide request is accepted; null if never approved or no cooldown
+    next_eligible_at = serializers.DateTimeField(
+        source='eligibility.next_eligible_at', read_only=True, default=None
+    )
     
     class Meta:
         model = Student
         fields = '__all__'
+        method_sources = {'year_display': ('current_year',)}
+        list_serializer_class = FragmentListSerializer
     
     def get_year_display(self, obj):
         return obj.get_year_display_text()
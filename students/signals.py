@@ -0,0 +1,79 @@
+"""Keep Student.updated_at in step with the related rows its API representation shows.
+
+StudentSerializer output is cached per (pk, updated_at), so renaming a
+department or hostel, or editing the linked user, must move the affected
+students to new cache keys. Deleted students leave a tombstone for delta
+sync clients (see hostel_bonafide.sync), and so do students moving out of
+a hostel, so the old hostel's warden drops them.
+"""
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+from audit.models import Tombstone
+from hostels.models import Hostel
+from .models import Department, Student
+
+# User fields rendered inside StudentSerializer (via UserSerializer)
+USER_FIELDS = {'username', 'email', 'first_name', 'last_name', 'role', 'must_change_password'}
+
+
+def touch_students(**filters):
+    Student.objects.filter(**filters).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Department)
+def department_saved(sender, instance, created, **kwargs):
+    if not created:
+        touch_students(department=instance)
+
+
+@receiver(post_save, sender=Hostel)
+def hostel_saved(sender, instance, created, **kwargs):
+    if not created:
+        touch_students(hostel=instance)
+
+
+@receiver(pre_delete, sender=Hostel)
+def hostel_deleted(sender, instance, **kwargs):
+    # Residents are detached with a plain UPDATE that leaves updated_at alone
+    touch_students(hostel=instance)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def user_saved(sender, instance, created, update_fields=None, **kwargs):
+    # Logins only save last_login; skip those
+    if created or (update_fields is not None and not USER_FIELDS & set(update_fields)):
+        return
+    touch_students(user=instance)
+
+
+@receiver(post_delete, sender=Student)
+def student_deleted(sender, instance, **kwargs):
+    Tombstone.objects.create(
+        model=Student._meta.label_lower,
+        object_id=instance.pk,
+        student_id=instance.pk,
+        hostel_id=instance.hostel_id,
+    )
+
+
+@receiver(pre_save, sender=Student)
+def remember_student_hostel(sender, instance, **kwargs):
+    instance._previous_hostel_id = (
+        Student.objects.filter(pk=instance.pk).values_list('hostel_id', flat=True).first()
+        if instance.pk else None
+    )
+
+
+@receiver(post_save, sender=Student)
+def student_moved(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_previous_hostel_id', None)
+    if not created and previous is not None and previous != instance.hostel_id:
+        Tombstone.objects.create(
+            model=Student._meta.label_lower,
+            object_id=instance.pk,
+            student_id=instance.pk,
+            hostel_id=previous,
+        )
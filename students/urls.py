@@ -1,7 +1,7 @@
 from django.urls import path
 from .views import (
     StudentProfileView, DepartmentListView,
-    BulkStudentUploadView, StudentListView,
+    BulkStudentUploadView, StudentListView, StudentChangesView,
     StudentDetailView, StudentCreateView,
     DepartmentManageView, DepartmentDetailView,
     AcademicYearView
@@ -15,6 +15,7 @@ urlpatterns = [
     path('academic-year/', AcademicYearView.as_view(), name='academic_year'),
     path('bulk-upload/', BulkStudentUploadView.as_view(), name='bulk_upload'),
     path('list/', StudentListView.as_view(), name='student_list'),
+    path('changes/', StudentChangesView.as_view(), name='student_changes'),
     path('create/', StudentCreateView.as_view(), name='student_create'),
     path('<int:pk>/', StudentDetailView.as_view(), name='student_detail'),
 ]
@@ -7,6 +7,10 @@ from openpyxl import load_workbook
 from .models import Student, Department, AcademicYear
 from .serializers import StudentSerializer, DepartmentSerializer, BulkStudentUploadSerializer
 from audit.utils import log_activity
+from hostel_bonafide.prefetch import AutoPrefetchMixin
+from hostel_bonafide.conditional import ConditionalGetMixin
+from hostel_bonafide.pagination import StudentCursorPagination
+from hostel_bonafide.sync import DeltaSyncView
 import io
 
 
@@ -19,7 +23,7 @@ class StudentProfileView(generics.RetrieveUpdateAPIView):
         return self.request.user.student_profile
 
 
-class DepartmentListView(generics.ListAPIView):
+class DepartmentListView(ConditionalGetMixin, generics.ListAPIView):
     """List all departments."""
     queryset = Department.objects.all()
     serializer_class = DepartmentSerializer
@@ -156,10 +160,11 @@ class BulkStudentUploadView(APIView):
             )
 
 
-class StudentListView(generics.ListAPIView):
+class StudentListView(AutoPrefetchMixin, generics.ListAPIView):
     """List all students (Dean and Warden only)."""
     serializer_class = StudentSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = StudentCursorPagination
 
     def get_queryset(self):
         user = self.request.user
@@ -177,7 +182,35 @@ class StudentListView(generics.ListAPIView):
             return Student.objects.none()
 
 
-class StudentDetailView(generics.RetrieveUpdateDestroyAPIView):
+class StudentChangesView(DeltaSyncView):
+    """Students created, updated or deleted since ?since= (see DeltaSyncView)."""
+    serializer_class = StudentSerializer
+
+    def get_queryset(self):
+        user = self.request.user
+
+        if user.is_dean() or user.is_superuser:
+            return Student.objects.all()
+        elif user.is_warden():
+            return Student.objects.filter(hostel_id=user.warden_profile.hostel_id)
+        elif user.is_student():
+            return Student.objects.filter(user=user)
+        return Student.objects.none()
+
+    def get_tombstones(self):
+        user = self.request.user
+        tombstones = self.tombstones_for(Student)
+
+        if user.is_dean() or user.is_superuser:
+            return tombstones
+        elif user.is_warden():
+            return tombstones.filter(hostel_id=user.warden_profile.hostel_id)
+        elif user.is_student():
+            return tombstones.filter(student_id=user.student_profile.pk)
+        return tombstones.none()
+
+
+class StudentDetailView(AutoPrefetchMixin, generics.RetrieveUpdateDestroyAPIView):
     """Get, update, or delete a student (Dean only)."""
     queryset = Student.objects.all()
     serializer_class = StudentSerializer